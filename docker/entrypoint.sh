@@ -44,6 +44,16 @@ case "${RUN_MODE:-cron}" in
 
     exec /usr/local/bin/supercronic -passthrough-logs /tmp/crontab
     ;;
+"daemon")
+    # 启动 Web 服务器（如果配置了）
+    if [ "${ENABLE_WEBSERVER:-false}" = "true" ]; then
+        echo "🌐 启动 Web 服务器..."
+        /usr/local/bin/python manage.py start_webserver
+    fi
+
+    echo "♻️ 常驻模式（执行周期见 config.yaml 的 advanced.daemon）"
+    exec /usr/local/bin/python -m trendradar --daemon
+    ;;
 *)
     exec "$@"
     ;;
@@ -335,6 +335,7 @@ async def get_rss_feeds_status() -> str:
         - total_dates: 总日期数
         - today_feeds: 今日各 RSS 源的数据统计
             - {feed_id}: { name, item_count }
+        - mirror_stats: RSSHub 镜像健康统计（状态、平均延迟、成功率、熔断剩余时间）
         - generated_at: 生成时间
 
     Examples:
@@ -9,6 +9,8 @@ from collections import Counter
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 
+from trendradar.storage.connection import get_connection_manager
+
 from .cache_service import get_cache
 from .parser_service import ParserService
 from ..utils.errors import DataNotFoundError
@@ -230,37 +232,36 @@ class DataService:
         results = []
         platform_distribution = Counter()
 
-        # 遍历日期范围
+        # 遍历日期范围（每天通过全文索引只读取包含关键词的标题）
         current_date = start_date
         while current_date <= end_date:
             try:
-                all_titles, id_to_name, _ = self.parser.read_all_titles_for_date(
+                matches, id_to_name = self.parser.search_titles_for_date(
+                    keyword,
                     date=current_date,
                     platform_ids=platforms
                 )
 
-                # 搜索包含关键词的标题
-                for platform_id, titles in all_titles.items():
+                for platform_id, titles in matches.items():
                     platform_name = id_to_name.get(platform_id, platform_id)
 
                     for title, info in titles.items():
-                        if keyword.lower() in title.lower():
-                            # 计算平均排名
-                            avg_rank = sum(info["ranks"]) / len(info["ranks"]) if info["ranks"] else 0
-
-                            results.append({
-                                "title": title,
-                                "platform": platform_id,
-                                "platform_name": platform_name,
-                                "ranks": info["ranks"],
-                                "count": len(info["ranks"]),
-                                "avg_rank": round(avg_rank, 2),
-                                "url": info.get("url", ""),
-                                "mobileUrl": info.get("mobileUrl", ""),
-                                "date": current_date.strftime("%Y-%m-%d")
-                            })
-
-                            platform_distribution[platform_id] += 1
+                        # 计算平均排名
+                        avg_rank = sum(info["ranks"]) / len(info["ranks"]) if info["ranks"] else 0
+
+                        results.append({
+                            "title": title,
+                            "platform": platform_id,
+                            "platform_name": platform_name,
+                            "ranks": info["ranks"],
+                            "count": len(info["ranks"]),
+                            "avg_rank": round(avg_rank, 2),
+                            "url": info.get("url", ""),
+                            "mobileUrl": info.get("mobileUrl", ""),
+                            "date": current_date.strftime("%Y-%m-%d")
+                        })
+
+                        platform_distribution[platform_id] += 1
 
             except DataNotFoundError:
                 # 该日期没有数据,继续下一天
@@ -378,33 +379,27 @@ class DataService:
         word_frequency = Counter()
         keyword_to_news = {}
 
-        # 遍历要处理的标题
-        for platform_id, titles in titles_to_process.items():
-            for title in titles.keys():
-                if extract_mode == "keywords":
-                    # 基于预设关键词统计（支持正则匹配）
-                    from trendradar.core.frequency import _word_matches
-
-                    word_groups = self.parser.parse_frequency_words()
-                    title_lower = title.lower()
-
-                    for group in word_groups:
-                        all_words = group.get("required", []) + group.get("normal", [])
-                        # 检查是否匹配词组中的任意一个词
-                        matched = any(_word_matches(word_config, title_lower) for word_config in all_words)
-
-                        if matched:
-                            # 使用组的 display_name（组别名或行别名拼接）
-                            display_key = group.get("display_name") or group.get("group_key", "")
-
-                            word_frequency[display_key] += 1
-                            if display_key not in keyword_to_news:
-                                keyword_to_news[display_key] = []
-                            keyword_to_news[display_key].append(title)
-                            break  # 每个标题只计入第一个匹配的词组
-
-                elif extract_mode == "auto_extract":
-                    # 自动提取关键词
+        if extract_mode == "keywords":
+            # 基于预设关键词统计：规则只加载一次，所有标题批量匹配（与爬虫相同的匹配规则）
+            rules = self.parser.load_keyword_rules()
+            if rules is not None and rules.word_groups:
+                all_titles_list = [
+                    title
+                    for titles in titles_to_process.values()
+                    for title in titles.keys()
+                ]
+                # 每个标题只计入第一个匹配的词组
+                for group_index, matched_titles in rules.match_titles(all_titles_list, first_only=True).items():
+                    group = rules.word_groups[group_index]
+                    # 使用组的 display_name（组别名或行别名拼接）
+                    display_key = group.get("display_name") or group.get("group_key", "")
+
+                    word_frequency[display_key] += len(matched_titles)
+                    keyword_to_news.setdefault(display_key, []).extend(matched_titles)
+        elif extract_mode == "auto_extract":
+            # 遍历要处理的标题，自动提取关键词
+            for platform_id, titles in titles_to_process.items():
+                for title in titles.keys():
                     extracted_words = self._extract_words_from_title(title)
                     for word in extracted_words:
                         word_frequency[word] += 1
@@ -666,6 +661,7 @@ class DataService:
                 "latest_record": latest_record.strftime("%Y-%m-%d") if latest_record else None,
             },
             "cache": self.cache.get_stats(),
+            "sqlite": get_connection_manager().get_stats(),
             "health": "healthy"
         }
 
@@ -798,13 +794,15 @@ class DataService:
             target_date = today - timedelta(days=i)
 
             try:
-                all_items, id_to_name, _ = self.parser.read_all_titles_for_date(
+                # 通过全文索引只读取标题或摘要包含关键词的条目
+                matches, id_to_name = self.parser.search_titles_for_date(
+                    keyword,
                     date=target_date,
                     platform_ids=feeds,
                     db_type="rss"
                 )
 
-                for feed_id, items in all_items.items():
+                for feed_id, items in matches.items():
                     feed_name = id_to_name.get(feed_id, feed_id)
 
                     for title, info in items.items():
@@ -815,23 +813,20 @@ class DataService:
                         if url:
                             seen_urls.add(url)
 
-                        # 关键词匹配（标题或摘要）
-                        summary = info.get("summary", "")
-                        if keyword.lower() in title.lower() or keyword.lower() in summary.lower():
-                            rss_item = {
-                                "title": title,
-                                "feed_id": feed_id,
-                                "feed_name": feed_name,
-                                "url": url,
-                                "published_at": info.get("published_at", ""),
-                                "author": info.get("author", ""),
-                                "date": target_date.strftime("%Y-%m-%d")
-                            }
+                        rss_item = {
+                            "title": title,
+                            "feed_id": feed_id,
+                            "feed_name": feed_name,
+                            "url": url,
+                            "published_at": info.get("published_at", ""),
+                            "author": info.get("author", ""),
+                            "date": target_date.strftime("%Y-%m-%d")
+                        }
 
-                            if include_summary:
-                                rss_item["summary"] = summary
+                        if include_summary:
+                            rss_item["summary"] = info.get("summary", "")
 
-                            results.append(rss_item)
+                        results.append(rss_item)
 
             except DataNotFoundError:
                 continue
@@ -847,6 +842,20 @@ class DataService:
 
         return result
 
+    def _get_rss_mirror_stats(self) -> List[Dict]:
+        """读取 RSSHub 镜像健康统计（由爬虫写入 output/rss/feed_cache.db）"""
+        db_path = self.parser.project_root / "output" / "rss" / "feed_cache.db"
+        if not db_path.exists():
+            return []
+
+        from trendradar.crawler.rss.mirrors import MirrorHealthTracker
+
+        tracker = MirrorHealthTracker(str(db_path))
+        try:
+            return tracker.get_stats()
+        finally:
+            tracker.close()
+
     def get_rss_feeds_status(self) -> Dict:
         """
         获取 RSS 源状态
@@ -884,6 +893,7 @@ class DataService:
             "available_dates": available_dates[:10],  # 最近 10 天
             "total_dates": len(available_dates),
             "today_feeds": today_stats,
+            "mirror_stats": self._get_rss_mirror_stats(),
             "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
 
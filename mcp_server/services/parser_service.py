@@ -6,13 +6,19 @@ v2.0.0: 仅支持 SQLite 数据库，移除 TXT 文件支持
 """
 
 import re
-import sqlite3
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import yaml
 
+from trendradar.core.frequency import load_keyword_rules
+from trendradar.core.matcher import WordGroupMatcher
+from trendradar.storage.archive import ARCHIVE_FILENAME, NewsArchive
+from trendradar.storage.connection import get_connection_manager
+from trendradar.storage.fts import build_match_query, ensure_fts_index, has_fts_index
+from trendradar.utils import fast_json
+
 from ..utils.errors import FileParseError, DataNotFoundError
 from .cache_service import get_cache
 
@@ -34,6 +40,7 @@ class ParserService:
             self.project_root = Path(project_root)
 
         self.cache = get_cache()
+        self.archive = NewsArchive(self.project_root / "output" / "news" / ARCHIVE_FILENAME)
 
     @staticmethod
     def clean_title(title: str) -> str:
@@ -84,6 +91,8 @@ class ParserService:
         """
         从 SQLite 数据库读取数据
 
+        使用连接管理器缓存的只读连接（WAL 模式下不阻塞爬虫写入）
+
         Args:
             date: 日期对象，默认为今天
             platform_ids: 平台ID列表，None表示所有平台
@@ -100,9 +109,9 @@ class ParserService:
         id_to_name = {}
         all_timestamps = {}
 
+        cursor = None
         try:
-            conn = sqlite3.connect(str(db_path))
-            conn.row_factory = sqlite3.Row
+            conn = get_connection_manager().get_reader(db_path)
             cursor = conn.cursor()
 
             if db_type == "news":
@@ -112,10 +121,12 @@ class ParserService:
 
         except Exception as e:
             print(f"Warning: 从 SQLite 读取数据失败: {e}")
+            # 连接可能已失效（文件被替换等），下次重新打开
+            get_connection_manager().close_readers(db_path)
             return None
         finally:
-            if 'conn' in locals():
-                conn.close()
+            if cursor is not None:
+                cursor.close()
 
     def _read_news_from_sqlite(
         self,
@@ -134,50 +145,36 @@ class ParserService:
         if not cursor.fetchone():
             return None
 
-        # 构建查询
+        # 构建查询：news_items 与 rank_history 一次有序关联，逐行累积排名，
+        # 无需 IN (...) 参数列表
+        platform_filter = ""
+        params: List = []
         if platform_ids:
             placeholders = ','.join(['?' for _ in platform_ids])
-            query = f"""
-                SELECT n.id, n.platform_id, p.name as platform_name, n.title,
-                       n.rank, n.url, n.mobile_url,
-                       n.first_crawl_time, n.last_crawl_time, n.crawl_count
-                FROM news_items n
-                LEFT JOIN platforms p ON n.platform_id = p.id
-                WHERE n.platform_id IN ({placeholders})
-            """
-            cursor.execute(query, platform_ids)
-        else:
-            cursor.execute("""
-                SELECT n.id, n.platform_id, p.name as platform_name, n.title,
-                       n.rank, n.url, n.mobile_url,
-                       n.first_crawl_time, n.last_crawl_time, n.crawl_count
-                FROM news_items n
-                LEFT JOIN platforms p ON n.platform_id = p.id
-            """)
-
-        rows = cursor.fetchall()
-
-        # 收集所有 news_item_id 用于查询历史排名
-        news_ids = [row['id'] for row in rows]
-        rank_history_map = {}
-
-        if news_ids:
-            placeholders = ",".join("?" * len(news_ids))
-            cursor.execute(f"""
-                SELECT news_item_id, rank FROM rank_history
-                WHERE news_item_id IN ({placeholders})
-                ORDER BY news_item_id, crawl_time
-            """, news_ids)
-
-            for rh_row in cursor.fetchall():
-                news_id = rh_row['news_item_id']
-                rank = rh_row['rank']
-                if news_id not in rank_history_map:
-                    rank_history_map[news_id] = []
-                rank_history_map[news_id].append(rank)
-
-        for row in rows:
+            platform_filter = f"WHERE n.platform_id IN ({placeholders})"
+            params = list(platform_ids)
+
+        cursor.execute(f"""
+            SELECT n.id, n.platform_id, p.name as platform_name, n.title,
+                   n.rank, n.url, n.mobile_url,
+                   n.first_crawl_time, n.last_crawl_time, n.crawl_count,
+                   rh.rank AS history_rank
+            FROM news_items n
+            LEFT JOIN platforms p ON n.platform_id = p.id
+            LEFT JOIN rank_history rh ON rh.news_item_id = n.id
+            {platform_filter}
+            ORDER BY n.id, rh.crawl_time
+        """, params)
+
+        current_id = None
+        ranks: List[int] = []
+        for row in cursor:
             news_id = row['id']
+            if news_id == current_id:
+                ranks.append(row['history_rank'])
+                continue
+
+            current_id = news_id
             platform_id = row['platform_id']
             platform_name = row['platform_name'] or platform_id
             title = row['title']
@@ -188,7 +185,9 @@ class ParserService:
             if platform_id not in all_titles:
                 all_titles[platform_id] = {}
 
-            ranks = rank_history_map.get(news_id, [row['rank']])
+            # 没有排名历史时使用当前排名
+            history_rank = row['history_rank']
+            ranks = [history_rank] if history_rank is not None else [row['rank']]
 
             all_titles[platform_id][title] = {
                 "ranks": ranks,
@@ -206,12 +205,7 @@ class ParserService:
         """)
         for row in cursor.fetchall():
             crawl_time = row['crawl_time']
-            created_at = row['created_at']
-            try:
-                ts = datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S").timestamp()
-            except (ValueError, TypeError):
-                ts = datetime.now().timestamp()
-            all_timestamps[f"{crawl_time}.db"] = ts
+            all_timestamps[f"{crawl_time}.db"] = self._parse_timestamp(row['created_at'])
 
         if not all_titles:
             return None
@@ -288,18 +282,104 @@ class ParserService:
         """)
         for row in cursor.fetchall():
             crawl_time = row['crawl_time']
-            created_at = row['created_at']
-            try:
-                ts = datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S").timestamp()
-            except (ValueError, TypeError):
-                ts = datetime.now().timestamp()
-            all_timestamps[f"{crawl_time}.db"] = ts
+            all_timestamps[f"{crawl_time}.db"] = self._parse_timestamp(row['created_at'])
 
         if not all_items:
             return None
 
         return (all_items, id_to_name, all_timestamps)
 
+    @staticmethod
+    def _read_all_cache_key(date_str: str, platform_ids: Optional[List[str]], db_type: str) -> str:
+        platform_key = ','.join(sorted(platform_ids)) if platform_ids else 'all'
+        return f"read_all:{db_type}:{date_str}:{platform_key}"
+
+    @staticmethod
+    def _parse_timestamp(created_at) -> float:
+        try:
+            return datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S").timestamp()
+        except (ValueError, TypeError):
+            return datetime.now().timestamp()
+
+    def prefetch_news_range(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        platform_ids: Optional[List[str]] = None,
+    ) -> int:
+        """
+        预读日期范围内的热榜数据（多天查询的查询规划）
+
+        - 已结束的日期：先将缺失或已变化的日库补入归档库，再用一次查询读出全部日期
+        - 当天及无法归档的日期：保持逐日读取日库
+
+        读出的结果写入 read_all_titles_for_date 的缓存，调用方的逐日循环无需修改。
+
+        Args:
+            start_date: 开始日期
+            end_date: 结束日期
+            platform_ids: 平台ID列表，None表示所有平台
+
+        Returns:
+            从归档库读取的日期数
+        """
+        today = datetime.now().strftime("%Y-%m-%d")
+        dates = []
+        current = start_date
+        while current <= end_date:
+            date_str = self.get_date_folder_name(current)
+            cache_key = self._read_all_cache_key(date_str, platform_ids, "news")
+            if date_str < today and not self.cache.get(cache_key, ttl=900):
+                dates.append(date_str)
+            current += timedelta(days=1)
+        # 单日查询直接读日库更快
+        if len(dates) < 2:
+            return 0
+
+        news_dir = self.project_root / "output" / "news"
+        try:
+            self.archive.sync(news_dir, before_date=today, dates=dates)
+            fresh_dates = self.archive.get_fresh_dates(news_dir, dates)
+            if not fresh_dates:
+                return 0
+
+            results: Dict[str, Tuple[Dict, Dict, Dict]] = {}
+            for row in self.archive.iter_items(fresh_dates, platform_ids):
+                date_str = row['date']
+                if date_str not in results:
+                    results[date_str] = ({}, {}, {})
+                all_titles, id_to_name, _ = results[date_str]
+
+                platform_id = row['platform_id']
+                if platform_id not in id_to_name:
+                    id_to_name[platform_id] = row['platform_name'] or platform_id
+                if platform_id not in all_titles:
+                    all_titles[platform_id] = {}
+
+                # 没有排名历史时使用当前排名
+                ranks = fast_json.loads(row['ranks']) if row['ranks'] else []
+                all_titles[platform_id][row['title']] = {
+                    "ranks": ranks or [row['rank']],
+                    "url": row['url'] or "",
+                    "mobileUrl": row['mobile_url'] or "",
+                    "first_time": row['first_crawl_time'] or "",
+                    "last_time": row['last_crawl_time'] or "",
+                    "count": row['crawl_count'] or 1,
+                }
+
+            for date_str, crawl_rows in self.archive.get_crawl_times(list(results)).items():
+                all_timestamps = results[date_str][2]
+                for crawl_row in crawl_rows:
+                    all_timestamps[f"{crawl_row['crawl_time']}.db"] = self._parse_timestamp(crawl_row['created_at'])
+        except Exception as e:
+            print(f"Warning: 读取归档数据失败，改为逐日读取: {e}")
+            get_connection_manager().close_readers(self.archive.archive_path)
+            return 0
+
+        for date_str, result in results.items():
+            self.cache.set(self._read_all_cache_key(date_str, platform_ids, "news"), result)
+        return len(results)
+
     def read_all_titles_for_date(
         self,
         date: datetime = None,
@@ -321,8 +401,7 @@ class ParserService:
             DataNotFoundError: 数据不存在
         """
         date_str = self.get_date_folder_name(date)
-        platform_key = ','.join(sorted(platform_ids)) if platform_ids else 'all'
-        cache_key = f"read_all:{db_type}:{date_str}:{platform_key}"
+        cache_key = self._read_all_cache_key(date_str, platform_ids, db_type)
 
         is_today = (date is None) or (date.date() == datetime.now().date())
         ttl = 900 if is_today else 900
@@ -341,6 +420,205 @@ class ParserService:
             suggestion="请先运行爬虫或检查日期是否正确"
         )
 
+    def _ensure_fts_index(self, db_path: Path, db_type: str) -> bool:
+        """为尚未建立全文索引的日库补建索引（旧版本爬虫写入的数据）"""
+        conn = get_connection_manager().connect(db_path)
+        try:
+            get_connection_manager().begin_write(conn, "[全文索引]")
+            available = ensure_fts_index(conn, db_type)
+            conn.commit()
+            return available
+        finally:
+            conn.close()
+
+    def search_titles_for_date(
+        self,
+        keyword: str,
+        date: datetime = None,
+        platform_ids: Optional[List[str]] = None,
+        db_type: str = "news"
+    ) -> Tuple[Dict, Dict]:
+        """
+        按关键词搜索指定日期的标题（热榜）或标题/摘要（RSS）
+
+        优先使用日库内的全文索引（见 trendradar/storage/fts.py）只读取候选条目，
+        每个结果附带 bm25 相关度 "score"；索引不可用或关键词无法使用索引时，
+        退回读取全部数据逐条匹配（score 为 0）。匹配规则与逐条扫描一致（忽略大小写的包含）。
+
+        Args:
+            keyword: 搜索关键词
+            date: 日期对象，默认为今天
+            platform_ids: 平台/Feed ID列表，None表示所有
+            db_type: 数据库类型 ("news" 或 "rss")
+
+        Returns:
+            (matches, id_to_name) 元组，matches 结构与 read_all_titles_for_date 的 all_titles 相同
+
+        Raises:
+            DataNotFoundError: 数据不存在
+        """
+        db_path = self._get_db_path(date, db_type)
+        if db_path is None:
+            raise DataNotFoundError(
+                f"未找到 {self.get_date_folder_name(date)} 的 {db_type} 数据",
+                suggestion="请先运行爬虫或检查日期是否正确"
+            )
+
+        keyword_lower = keyword.lower()
+        query = build_match_query(keyword)
+        if query is not None:
+            try:
+                conn = get_connection_manager().get_reader(db_path)
+                if has_fts_index(conn, db_type) or self._ensure_fts_index(db_path, db_type):
+                    if db_type == "news":
+                        return self._search_news_fts(conn, query, keyword_lower, platform_ids)
+                    return self._search_rss_fts(conn, query, keyword_lower, platform_ids)
+            except Exception as e:
+                print(f"Warning: 全文索引查询失败，改为逐条匹配: {e}")
+                get_connection_manager().close_readers(db_path)
+
+        all_titles, id_to_name, _ = self.read_all_titles_for_date(date, platform_ids, db_type)
+        matches: Dict = {}
+        for platform_id, titles in all_titles.items():
+            for title, info in titles.items():
+                summary = info.get("summary", "") if db_type == "rss" else ""
+                if keyword_lower in title.lower() or (summary and keyword_lower in summary.lower()):
+                    matches.setdefault(platform_id, {})[title] = {**info, "score": 0.0}
+        return matches, id_to_name
+
+    def _search_news_fts(
+        self,
+        conn,
+        query: str,
+        keyword_lower: str,
+        platform_ids: Optional[List[str]]
+    ) -> Tuple[Dict, Dict]:
+        """
+        用全文索引查询热榜候选条目，附带排名历史
+
+        结果顺序与 read_all_titles_for_date 一致：平台按其在当天首次出现的顺序，平台内按条目 ID。
+        """
+        platform_filter = ""
+        params: List = [query]
+        if platform_ids:
+            platform_filter = "WHERE n.platform_id IN (SELECT value FROM json_each(?))"
+            params.append(fast_json.dumps(list(platform_ids)))
+
+        cursor = conn.execute(f"""
+            WITH platform_order AS (
+                SELECT platform_id, MIN(id) AS first_id
+                FROM news_items
+                GROUP BY platform_id
+            )
+            SELECT n.id, n.platform_id, p.name as platform_name, n.title,
+                   n.rank, n.url, n.mobile_url,
+                   n.first_crawl_time, n.last_crawl_time, n.crawl_count,
+                   f.score, rh.rank AS history_rank
+            FROM (
+                SELECT rowid AS id, -bm25(news_fts) AS score
+                FROM news_fts WHERE news_fts MATCH ?
+            ) f
+            JOIN news_items n ON n.id = f.id
+            JOIN platform_order po ON po.platform_id = n.platform_id
+            LEFT JOIN platforms p ON n.platform_id = p.id
+            LEFT JOIN rank_history rh ON rh.news_item_id = n.id
+            {platform_filter}
+            ORDER BY po.first_id, n.id, rh.crawl_time
+        """, params)
+
+        matches: Dict = {}
+        id_to_name: Dict = {}
+        current_id = None
+        ranks: List[int] = []
+        for row in cursor:
+            if row['id'] == current_id:
+                ranks.append(row['history_rank'])
+                continue
+            current_id = row['id']
+            # 索引按二元组匹配，这里校验原文确实包含关键词
+            if keyword_lower not in row['title'].lower():
+                ranks = []
+                continue
+
+            platform_id = row['platform_id']
+            if platform_id not in id_to_name:
+                id_to_name[platform_id] = row['platform_name'] or platform_id
+
+            history_rank = row['history_rank']
+            ranks = [history_rank] if history_rank is not None else [row['rank']]
+            matches.setdefault(platform_id, {})[row['title']] = {
+                "ranks": ranks,
+                "url": row['url'] or "",
+                "mobileUrl": row['mobile_url'] or "",
+                "first_time": row['first_crawl_time'] or "",
+                "last_time": row['last_crawl_time'] or "",
+                "count": row['crawl_count'] or 1,
+                "score": row['score'],
+            }
+        return matches, id_to_name
+
+    def _search_rss_fts(
+        self,
+        conn,
+        query: str,
+        keyword_lower: str,
+        feed_ids: Optional[List[str]]
+    ) -> Tuple[Dict, Dict]:
+        """
+        用全文索引查询 RSS 候选条目（标题或摘要）
+
+        结果顺序与 read_all_titles_for_date 一致：Feed 按其最新发布时间，Feed 内按发布时间倒序。
+        """
+        feed_filter = ""
+        params: List = [query]
+        if feed_ids:
+            feed_filter = "WHERE i.feed_id IN (SELECT value FROM json_each(?))"
+            params.append(fast_json.dumps(list(feed_ids)))
+
+        cursor = conn.execute(f"""
+            WITH feed_order AS (
+                SELECT feed_id, MAX(published_at) AS latest
+                FROM rss_items
+                GROUP BY feed_id
+            )
+            SELECT i.id, i.feed_id, f.name as feed_name, i.title,
+                   i.url, i.published_at, i.summary, i.author,
+                   i.first_crawl_time, i.last_crawl_time, i.crawl_count,
+                   s.score
+            FROM (
+                SELECT rowid AS id, -bm25(rss_fts) AS score
+                FROM rss_fts WHERE rss_fts MATCH ?
+            ) s
+            JOIN rss_items i ON i.id = s.id
+            JOIN feed_order fo ON fo.feed_id = i.feed_id
+            LEFT JOIN rss_feeds f ON i.feed_id = f.id
+            {feed_filter}
+            ORDER BY fo.latest DESC, i.feed_id, i.published_at DESC
+        """, params)
+
+        matches: Dict = {}
+        id_to_name: Dict = {}
+        for row in cursor:
+            title = row['title']
+            summary = row['summary'] or ""
+            if keyword_lower not in title.lower() and keyword_lower not in summary.lower():
+                continue
+
+            feed_id = row['feed_id']
+            if feed_id not in id_to_name:
+                id_to_name[feed_id] = row['feed_name'] or feed_id
+            matches.setdefault(feed_id, {})[title] = {
+                "url": row['url'] or "",
+                "published_at": row['published_at'] or "",
+                "summary": summary,
+                "author": row['author'] or "",
+                "first_time": row['first_crawl_time'] or "",
+                "last_time": row['last_crawl_time'] or "",
+                "count": row['crawl_count'] or 1,
+                "score": row['score'],
+            }
+        return matches, id_to_name
+
     def parse_yaml_config(self, config_path: str = None) -> dict:
         """
         解析YAML配置文件
@@ -393,18 +671,31 @@ class ParserService:
         Raises:
             FileParseError: 文件解析错误
         """
-        from trendradar.core.frequency import load_frequency_words
+        rules = self.load_keyword_rules(words_file)
+        return rules.word_groups if rules else []
+
+    def load_keyword_rules(self, words_file: str = None) -> Optional[WordGroupMatcher]:
+        """
+        加载关键词规则并编译为匹配器（与爬虫共用进程内缓存，文件内容未变化时不重新解析）
 
+        Args:
+            words_file: 关键词文件路径，默认为 config/frequency_words.txt
+
+        Returns:
+            WordGroupMatcher 实例，文件不存在时返回 None
+
+        Raises:
+            FileParseError: 文件解析错误
+        """
         if words_file is None:
             words_file = str(self.project_root / "config" / "frequency_words.txt")
         else:
             words_file = str(words_file)
 
         try:
-            word_groups, filter_words, global_filters = load_frequency_words(words_file)
-            return word_groups
+            return load_keyword_rules(words_file)
         except FileNotFoundError:
-            return []
+            return None
         except Exception as e:
             raise FileParseError(words_file, str(e))
 
@@ -13,7 +13,10 @@ from difflib import SequenceMatcher
 
 import yaml
 
-from trendradar.core.analyzer import calculate_news_weight as _calculate_news_weight
+from trendradar.core.analyzer import (
+    calculate_news_weight as _calculate_news_weight,
+    calculate_news_weights as _calculate_news_weights,
+)
 
 from ..services.data_service import DataService
 from ..utils.validators import (
@@ -75,6 +78,38 @@ def calculate_news_weight(news_data: Dict, rank_threshold: int = 5) -> float:
     return _calculate_news_weight(news_data, rank_threshold, _get_weight_config())
 
 
+def calculate_news_weights(news_list: List[Dict], rank_threshold: int = 5) -> List[float]:
+    """
+    批量计算新闻权重（权重配置只读取一次，条目多时向量化计算）
+
+    Args:
+        news_list: 新闻数据字典列表
+        rank_threshold: 高排名阈值，默认5
+
+    Returns:
+        与输入顺序对应的权重列表
+    """
+    if not news_list:
+        return []
+    return _calculate_news_weights(news_list, rank_threshold, _get_weight_config())
+
+
+def sort_news_by_weight(news_list: List[Dict], rank_threshold: int = 5) -> List[Dict]:
+    """
+    按权重降序排序（稳定排序，权重相同时保持原顺序）
+
+    Args:
+        news_list: 新闻数据字典列表
+        rank_threshold: 高排名阈值，默认5
+
+    Returns:
+        排序后的新列表
+    """
+    weights = calculate_news_weights(news_list, rank_threshold)
+    order = sorted(range(len(news_list)), key=weights.__getitem__, reverse=True)
+    return [news_list[i] for i in order]
+
+
 class AnalyticsTools:
     """高级数据分析工具类"""
 
@@ -307,7 +342,8 @@ class AnalyticsTools:
                 end_date = datetime.now()
                 start_date = end_date - timedelta(days=6)
 
-            # 收集趋势数据
+            # 收集趋势数据（已结束的日期从归档库一次读出）
+            self.data_service.parser.prefetch_news_range(start_date, end_date)
             trend_data = []
             current_date = start_date
 
@@ -760,10 +796,7 @@ class AnalyticsTools:
 
             # 按权重排序（如果启用）
             if sort_by_weight:
-                deduplicated_news.sort(
-                    key=lambda x: calculate_news_weight(x),
-                    reverse=True
-                )
+                deduplicated_news = sort_news_by_weight(deduplicated_news)
 
             # 限制返回数量
             selected_news = deduplicated_news[:limit]
@@ -1117,10 +1150,7 @@ class AnalyticsTools:
 
             # 按权重排序（如果启用）
             if sort_by_weight:
-                related_news.sort(
-                    key=lambda x: calculate_news_weight(x),
-                    reverse=True
-                )
+                related_news = sort_news_by_weight(related_news)
             else:
                 # 按排名排序
                 related_news.sort(key=lambda x: x["rank"])
@@ -2081,8 +2111,6 @@ class AnalyticsTools:
                                 news_item["url"] = info.get("url", "")
                                 news_item["mobileUrl"] = info.get("mobileUrl", "")
 
-                            # 计算权重
-                            news_item["weight"] = calculate_news_weight(news_item)
                             all_news.append(news_item)
 
                 except DataNotFoundError:
@@ -2090,6 +2118,10 @@ class AnalyticsTools:
 
                 current_date += timedelta(days=1)
 
+            # 批量计算权重
+            for news_item, weight in zip(all_news, calculate_news_weights(all_news)):
+                news_item["weight"] = weight
+
             if not all_news:
                 return {
                     "success": True,
@@ -2427,6 +2459,9 @@ class AnalyticsTools:
         all_keywords = Counter()
         platform_stats = Counter()
 
+        # 已结束的日期从归档库一次读出
+        self.data_service.parser.prefetch_news_range(start_date, end_date, platforms)
+
         current_date = start_date
         while current_date <= end_date:
             try:
@@ -2451,7 +2486,6 @@ class AnalyticsTools:
                             "ranks": info.get("ranks", []),
                             "rank": info["ranks"][0] if info["ranks"] else 999
                         }
-                        news_item["weight"] = calculate_news_weight(news_item)
                         all_news.append(news_item)
 
                         # 统计平台
@@ -2466,6 +2500,10 @@ class AnalyticsTools:
 
             current_date += timedelta(days=1)
 
+        # 批量计算权重
+        for news_item, weight in zip(all_news, calculate_news_weights(all_news)):
+            news_item["weight"] = weight
+
         return {
             "news": all_news,
             "news_count": len(all_news),
@@ -11,6 +11,8 @@ from typing import Dict, List
 
 import requests
 
+from trendradar.crawler.http_client import get_http_client
+
 from ..utils.errors import MCPError, InvalidParameterError
 
 
@@ -79,7 +81,7 @@ class ArticleReaderTools:
 
             self._throttle()
 
-            response = requests.get(
+            response = get_http_client().get(
                 f"{JINA_READER_BASE}/{url}",
                 headers=self._build_headers(),
                 timeout=timeout
@@ -118,15 +118,25 @@ class SearchTools:
                 start_date = end_date = latest
 
             # 收集所有匹配的新闻
+            # 关键词/实体模式通过全文索引只读取候选标题；模糊模式需要全部标题（已结束的日期从归档库一次读出）
+            if search_mode == "fuzzy":
+                self.data_service.parser.prefetch_news_range(start_date, end_date, platforms)
             all_matches = []
             current_date = start_date
 
             while current_date <= end_date:
                 try:
-                    all_titles, id_to_name, timestamps = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date,
-                        platform_ids=platforms
-                    )
+                    if search_mode == "fuzzy":
+                        all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date(
+                            date=current_date,
+                            platform_ids=platforms
+                        )
+                    else:
+                        all_titles, id_to_name = self.data_service.parser.search_titles_for_date(
+                            query,
+                            date=current_date,
+                            platform_ids=platforms
+                        )
 
                     # 根据搜索模式执行不同的搜索逻辑
                     if search_mode == "keyword":
@@ -182,10 +192,14 @@ class SearchTools:
 
             # 统一排序逻辑
             if sort_by == "relevance":
-                all_matches.sort(key=lambda x: x.get("similarity_score", 1.0), reverse=True)
+                # 关键词模式按 relevance_score（bm25 结合新闻权重），其余模式按相似度
+                all_matches.sort(
+                    key=lambda x: x.get("relevance_score", x.get("similarity_score", 1.0)),
+                    reverse=True
+                )
             elif sort_by == "weight":
-                from .analytics import calculate_news_weight
-                all_matches.sort(key=lambda x: calculate_news_weight(x), reverse=True)
+                from .analytics import sort_news_by_weight
+                all_matches = sort_news_by_weight(all_matches)
             elif sort_by == "date":
                 all_matches.sort(key=lambda x: x.get("date", ""), reverse=True)
 
@@ -272,7 +286,10 @@ class SearchTools:
         Returns:
             匹配的新闻列表
         """
+        from .analytics import calculate_news_weights
+
         matches = []
+        scores = []
         query_lower = query.lower()
 
         for platform_id, titles in all_titles.items():
@@ -291,13 +308,17 @@ class SearchTools:
                         "count": len(info.get("ranks", [])),
                         "rank": info["ranks"][0] if info["ranks"] else 999
                     }
-
                     # 条件性添加 URL 字段
                     if include_url:
                         news_item["url"] = info.get("url", "")
                         news_item["mobileUrl"] = info.get("mobileUrl", "")
 
                     matches.append(news_item)
+                    scores.append(info.get("score", 0.0))
+
+        # 相关度：全文索引的 bm25 分数结合新闻权重（权重 0-100），权重批量计算
+        for news_item, score, weight in zip(matches, scores, calculate_news_weights(matches)):
+            news_item["relevance_score"] = round((1.0 + score) * (1.0 + weight / 100), 4)
 
         return matches
 
@@ -607,7 +628,8 @@ class SearchTools:
                     suggestion="请提供更详细的文本内容"
                 )
 
-            # 收集所有相关新闻
+            # 收集所有相关新闻（已结束的日期从归档库一次读出）
+            self.data_service.parser.prefetch_news_range(search_start, search_end)
             all_related_news = []
             current_date = search_start
 
@@ -813,7 +835,8 @@ class SearchTools:
             # 提取参考标题的关键词
             reference_keywords = self._extract_keywords(reference_title)
 
-            # 收集所有相关新闻
+            # 收集所有相关新闻（已结束的日期从归档库一次读出）
+            self.data_service.parser.prefetch_news_range(min(search_dates), max(search_dates))
             all_related_news = []
             
             for search_date in search_dates:
@@ -921,8 +944,9 @@ class SearchTools:
 
         while current_date <= end_date:
             try:
-                # 读取该日期的 RSS 数据
-                all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date(
+                # 通过全文索引读取该日期标题或摘要包含关键词的 RSS 条目
+                all_titles, id_to_name = self.data_service.parser.search_titles_for_date(
+                    query,
                     date=current_date,
                     platform_ids=None,
                     db_type="rss"
@@ -64,6 +64,10 @@ class StorageSyncTools:
             "access_key_id": remote_config.get("access_key_id") or os.environ.get("S3_ACCESS_KEY_ID", ""),
             "secret_access_key": remote_config.get("secret_access_key") or os.environ.get("S3_SECRET_ACCESS_KEY", ""),
             "region": remote_config.get("region") or os.environ.get("S3_REGION", ""),
+            "delta_sync": remote_config.get("delta_sync", True),
+            "part_size_mb": remote_config.get("part_size_mb", 8),
+            "cache_dir": remote_config.get("cache_dir", ".cache/remote"),
+            "cache_max_mb": remote_config.get("cache_max_mb", 512),
         }
 
     def _has_remote_config(self) -> bool:
@@ -91,6 +95,11 @@ class StorageSyncTools:
             config = self._load_config()
             timezone = config.get("app", {}).get("timezone", "Asia/Shanghai")
 
+            # 与爬虫共用本地缓存（相对路径以项目根目录为基准）
+            cache_dir = remote_config.get("cache_dir")
+            if cache_dir:
+                cache_dir = str(self.project_root / cache_dir)
+
             self._remote_backend = RemoteStorageBackend(
                 bucket_name=remote_config["bucket_name"],
                 access_key_id=remote_config["access_key_id"],
@@ -98,6 +107,10 @@ class StorageSyncTools:
                 endpoint_url=remote_config["endpoint_url"],
                 region=remote_config.get("region", ""),
                 timezone=timezone,
+                delta_sync=remote_config["delta_sync"],
+                part_size_mb=remote_config["part_size_mb"],
+                cache_dir=cache_dir or None,
+                cache_max_mb=remote_config["cache_max_mb"],
             )
             return self._remote_backend
         except ImportError:
@@ -248,59 +261,40 @@ class StorageSyncTools:
             local_dir = self._get_local_data_dir()
             local_dir.mkdir(parents=True, exist_ok=True)
 
-            # 获取远程可用日期
-            remote_dates = remote_backend.list_remote_dates()
-
-            # 获取本地已有日期
-            local_dates = set(self._get_local_dates())
-
             # 计算需要拉取的日期（最近 N 天）
             from trendradar.utils.time import get_configured_time
             config = self._load_config()
             timezone = config.get("app", {}).get("timezone", "Asia/Shanghai")
             now = get_configured_time(timezone)
+            target_dates = [(now - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
+
+            # 并发拉取热榜和 RSS 数据库（每类只列举一次远程对象，经过本地缓存，支持续传）
+            result = remote_backend.pull_dates(target_dates, str(local_dir))
 
-            target_dates = []
-            for i in range(days):
-                date = now - timedelta(days=i)
-                date_str = date.strftime("%Y-%m-%d")
-                if date_str in remote_dates:
-                    target_dates.append(date_str)
+            # 按日期汇总：有失败记为失败，有下载记为已同步，否则本地已存在记为跳过
+            pulled = {entry["date"] for entry in result["pulled"]}
+            skipped = {entry["date"] for entry in result["skipped"]}
+            failed = {}
+            for entry in result["failed"]:
+                failed.setdefault(entry["date"], entry["error"])
 
-            # 执行拉取
             synced_dates = []
             skipped_dates = []
             failed_dates = []
-
             for date_str in target_dates:
-                # 检查本地是否已存在
-                if date_str in local_dates:
-                    skipped_dates.append(date_str)
-                    continue
-
-                # 拉取单个日期
-                try:
-                    local_date_dir = local_dir / date_str
-                    local_db_path = local_date_dir / "news.db"
-                    remote_key = f"news/{date_str}.db"
-
-                    local_date_dir.mkdir(parents=True, exist_ok=True)
-                    remote_backend.s3_client.download_file(
-                        remote_backend.bucket_name,
-                        remote_key,
-                        str(local_db_path)
-                    )
+                if date_str in failed:
+                    failed_dates.append({"date": date_str, "error": failed[date_str]})
+                elif date_str in pulled:
                     synced_dates.append(date_str)
                     print(f"[存储同步] 已拉取: {date_str}")
-                except Exception as e:
-                    failed_dates.append({"date": date_str, "error": str(e)})
-                    print(f"[存储同步] 拉取失败 ({date_str}): {e}")
+                elif date_str in skipped:
+                    skipped_dates.append(date_str)
 
             return {
                 "success": True,
                 "summary": {
                     "description": "远程存储同步结果",
-                    "synced_files": len(synced_dates),
+                    "synced_files": len(result["pulled"]),
                     "skipped_count": len(skipped_dates),
                     "failed_count": len(failed_dates)
                 },
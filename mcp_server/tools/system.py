@@ -155,7 +155,13 @@ class SystemManagementTools:
             if crawler_config.get("use_proxy"):
                 proxy_url = crawler_config.get("default_proxy")
             
-            fetcher = DataFetcher(proxy_url=proxy_url)
+            fetcher = DataFetcher(
+                proxy_url=proxy_url,
+                max_workers=crawler_config.get("max_workers", 1),
+                per_host_concurrency=crawler_config.get("per_host_concurrency", 4),
+                rate_limit=crawler_config.get("rate_limit", 0),
+                crawl_deadline=crawler_config.get("crawl_deadline", 0),
+            )
             request_interval = crawler_config.get("request_interval", 100)
 
             # 执行爬取
@@ -9,6 +9,9 @@ TrendRadar 主程序
 import argparse
 import os
 import re
+import signal
+import threading
+import time
 import webbrowser
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
@@ -19,8 +22,14 @@ from trendradar.context import AppContext
 from trendradar import __version__
 from trendradar.core import load_config
 from trendradar.core.analyzer import convert_keyword_stats_to_platform_stats
-from trendradar.crawler import DataFetcher
-from trendradar.storage import convert_crawl_results_to_news_data
+from trendradar.crawler import (
+    AdaptiveScheduler,
+    DataFetcher,
+    LatencyTracker,
+    PayloadCache,
+    close_http_clients,
+)
+from trendradar.storage import TitleRecord, convert_crawl_results_to_news_data
 from trendradar.utils.time import DEFAULT_TIMEZONE, is_within_days, calculate_days_old
 from trendradar.ai import AIAnalyzer, AIAnalysisResult
 
@@ -227,10 +236,40 @@ class NewsAnalyzer:
         self.update_info = None
         self.proxy_url = None
         self._setup_proxy()
-        self.data_fetcher = DataFetcher(self.proxy_url)
 
         # 初始化存储管理器（使用 AppContext）
         self._init_storage_manager()
+
+        # 平台延迟跟踪（延迟预算与对冲请求）和响应去重缓存
+        state_dir = self._get_crawler_state_dir()
+        latency_tracker = None
+        if self.ctx.config.get("HEDGE_REQUESTS", False):
+            latency_tracker = LatencyTracker(str(state_dir / "crawl_latency.db"))
+        payload_cache = None
+        if self.ctx.config.get("PAYLOAD_DEDUP", False):
+            payload_cache = PayloadCache(str(state_dir / "crawl_cache.db"))
+
+        self.data_fetcher = DataFetcher(
+            self.proxy_url,
+            max_workers=self.ctx.config.get("MAX_WORKERS", 1),
+            per_host_concurrency=self.ctx.config.get("PER_HOST_CONCURRENCY", 4),
+            rate_limit=self.ctx.config.get("RATE_LIMIT", 0),
+            crawl_deadline=self.ctx.config.get("CRAWL_DEADLINE", 0),
+            latency_tracker=latency_tracker,
+            hedge_requests=self.ctx.config.get("HEDGE_REQUESTS", False),
+            payload_cache=payload_cache,
+        )
+
+        # 自适应调度（按来源变化频率决定本次是否抓取）
+        self.scheduler = None
+        scheduler_config = self.ctx.config.get("SCHEDULER", {})
+        if scheduler_config.get("ENABLED", False):
+            self.scheduler = AdaptiveScheduler(
+                self.storage_manager,
+                min_interval=scheduler_config.get("MIN_INTERVAL", 30),
+                max_interval=scheduler_config.get("MAX_INTERVAL", 240),
+                min_samples=scheduler_config.get("MIN_SAMPLES", 4),
+            )
         # 注意：update_info 由 main() 函数设置，避免重复请求远程版本
 
     def _init_storage_manager(self) -> None:
@@ -248,6 +287,23 @@ class NewsAnalyzer:
         if retention_days > 0:
             print(f"数据保留天数: {retention_days} 天")
 
+    def _get_crawler_state_dir(self) -> Path:
+        """
+        获取爬虫状态（平台延迟历史、响应去重缓存）的存放目录
+
+        本地后端与热榜日库放在同一目录（output/news）。
+        远程后端（如 GitHub Actions）的本地输出目录不会跨次保留，
+        改放在远程缓存目录（storage.remote.cache_dir）下，随 actions/cache 一并恢复；
+        未配置缓存目录时退回本地输出目录（此时延迟预算和响应去重只在单次运行内生效）。
+        """
+        storage_config = self.ctx.config.get("STORAGE", {})
+        news_dir = Path(storage_config.get("LOCAL", {}).get("DATA_DIR", "output")) / "news"
+        if self.storage_manager.backend_name == "remote":
+            cache_dir = storage_config.get("REMOTE", {}).get("CACHE_DIR", "")
+            if cache_dir:
+                return Path(cache_dir) / "crawler"
+        return news_dir
+
     def _detect_docker_environment(self) -> bool:
         """检测是否运行在 Docker 容器中"""
         try:
@@ -587,8 +643,13 @@ class NewsAnalyzer:
             if not quiet:
                 print(f"当前监控平台: {current_platform_ids}")
 
+            # rank_timeline 只在 AI 分析需要排名时间线时读取
+            ai_config = self.ctx.config.get("AI_ANALYSIS", {})
+            include_timeline = bool(
+                ai_config.get("ENABLED", False) and ai_config.get("INCLUDE_RANK_TIMELINE", False)
+            )
             all_results, id_to_name, title_info = self.ctx.read_today_titles(
-                current_platform_ids, quiet=quiet
+                current_platform_ids, quiet=quiet, include_timeline=include_timeline
             )
 
             if not all_results:
@@ -619,20 +680,16 @@ class NewsAnalyzer:
         """从当前抓取结果构建标题信息"""
         title_info = {}
         for source_id, titles_data in results.items():
-            title_info[source_id] = {}
-            for title, title_data in titles_data.items():
-                ranks = title_data.get("ranks", [])
-                url = title_data.get("url", "")
-                mobile_url = title_data.get("mobileUrl", "")
-
-                title_info[source_id][title] = {
-                    "first_time": time_info,
-                    "last_time": time_info,
-                    "count": 1,
-                    "ranks": ranks,
-                    "url": url,
-                    "mobileUrl": mobile_url,
-                }
+            title_info[source_id] = {
+                title: TitleRecord(
+                    ranks=title_data.get("ranks", []),
+                    url=title_data.get("url", ""),
+                    mobile_url=title_data.get("mobileUrl", ""),
+                    first_time=time_info,
+                    last_time=time_info,
+                )
+                for title, title_data in titles_data.items()
+            }
         return title_info
 
     def _prepare_standalone_data(
@@ -673,15 +730,14 @@ class NewsAnalyzer:
             "rss_feeds": [],
         }
 
-        # 找出最新批次时间（类似 current 模式的过滤逻辑）
-        latest_time = None
+        # 找出各平台最新批次时间（类似 current 模式的过滤逻辑）
+        latest_times = {}
         if title_info:
-            for source_titles in title_info.values():
+            for source_id, source_titles in title_info.items():
                 for title_data in source_titles.values():
                     last_time = title_data.get("last_time", "")
-                    if last_time:
-                        if latest_time is None or last_time > latest_time:
-                            latest_time = last_time
+                    if last_time and last_time > latest_times.get(source_id, ""):
+                        latest_times[source_id] = last_time
 
         # 提取热榜平台数据
         for platform_id in platform_ids:
@@ -698,7 +754,8 @@ class NewsAnalyzer:
                 if title_info and platform_id in title_info and title in title_info[platform_id]:
                     meta = title_info[platform_id][title]
 
-                # 只保留当前在榜的话题（last_time 等于最新时间）
+                # 只保留当前在榜的话题（last_time 等于该平台最新时间）
+                latest_time = latest_times.get(platform_id)
                 if latest_time and meta:
                     if meta.get("last_time") != latest_time:
                         continue
@@ -1004,7 +1061,9 @@ class NewsAnalyzer:
     def _crawl_data(self) -> Tuple[Dict, Dict, List]:
         """执行数据爬取"""
         ids = []
+        id_to_name = {}
         for platform in self.ctx.platforms:
+            id_to_name[platform["id"]] = platform.get("name", platform["id"])
             if "name" in platform:
                 ids.append((platform["id"], platform["name"]))
             else:
@@ -1013,18 +1072,53 @@ class NewsAnalyzer:
         print(
             f"配置的监控平台: {[p.get('name', p['id']) for p in self.ctx.platforms]}"
         )
-        print(f"开始爬取数据，请求间隔 {self.request_interval} 毫秒")
+        crawl_time = self.ctx.format_time()
+        crawl_date = self.ctx.format_date()
+
+        # 自适应调度：只抓取已到期的平台（未到期平台沿用当天最近一次的榜单）
+        if self.scheduler:
+            due_ids, intervals = self.scheduler.select_due(
+                list(id_to_name.keys()), crawl_time, db_type="news"
+            )
+            skipped = [pid for pid in id_to_name if pid not in due_ids]
+            ids = [
+                id_info for id_info in ids
+                if (id_info[0] if isinstance(id_info, tuple) else id_info) in due_ids
+            ]
+            print(f"[调度] 本次抓取 {len(ids)}/{len(id_to_name)} 个平台")
+            if skipped:
+                print(
+                    f"[调度] 未到期跳过: "
+                    f"{', '.join(f'{pid}({intervals[pid]}分钟)' for pid in skipped)}"
+                )
+        if self.data_fetcher.max_workers > 1:
+            print(f"开始并发爬取数据，并发数 {self.data_fetcher.max_workers}")
+        else:
+            print(f"开始爬取数据，请求间隔 {self.request_interval} 毫秒")
         Path("output").mkdir(parents=True, exist_ok=True)
 
-        results, id_to_name, failed_ids = self.data_fetcher.crawl_websites(
-            ids, self.request_interval
-        )
+        if ids:
+            results, crawled_id_to_name, failed_ids = self.data_fetcher.crawl_websites(
+                ids, self.request_interval
+            )
+            id_to_name.update(crawled_id_to_name)
+            http_stats = self.data_fetcher.http.get_stats()
+            print(
+                f"[HTTP] 请求 {http_stats['requests']} 次，新建连接 {http_stats['handshakes']} 个，"
+                f"复用连接 {http_stats['pool_hits']} 次"
+            )
+            if self.data_fetcher.hedge_requests:
+                hedge_stats = self.data_fetcher.hedge_stats
+                print(f"[对冲] 发送对冲请求 {hedge_stats['sent']} 次，对冲胜出 {hedge_stats['won']} 次")
+            unchanged_ids = list(self.data_fetcher.unchanged_ids)
+        else:
+            # 没有到期平台时仍记录本次抓取批次，避免重复判定上一批次的新增
+            results, failed_ids, unchanged_ids = {}, [], []
 
         # 转换为 NewsData 格式并保存到存储后端
-        crawl_time = self.ctx.format_time()
-        crawl_date = self.ctx.format_date()
         news_data = convert_crawl_results_to_news_data(
-            results, id_to_name, failed_ids, crawl_time, crawl_date
+            results, id_to_name, failed_ids, crawl_time, crawl_date,
+            unchanged_ids=unchanged_ids,
         )
 
         # 保存到存储后端（SQLite）
@@ -1063,7 +1157,9 @@ class NewsAnalyzer:
             return None, None, None
 
         try:
-            from trendradar.crawler.rss import RSSFetcher, RSSFeedConfig
+            from trendradar.crawler.rss import (
+                RSSFetcher, RSSFeedConfig, RSSValidatorStore, MirrorHealthTracker,
+            )
 
             # 构建 RSS 源配置
             feeds = []
@@ -1098,6 +1194,20 @@ class NewsAnalyzer:
                 print("[RSS] 没有启用的 RSS 源")
                 return None, None, None
 
+            # 自适应调度：只抓取已到期的源（未到期的源沿用当天最近一次的条目）
+            if self.scheduler:
+                due_ids, intervals = self.scheduler.select_due(
+                    [feed.id for feed in feeds], self.ctx.get_time().strftime("%H:%M"), db_type="rss"
+                )
+                skipped = [feed.id for feed in feeds if feed.id not in due_ids]
+                print(f"[调度] 本次抓取 {len(feeds) - len(skipped)}/{len(feeds)} 个 RSS 源")
+                if skipped:
+                    print(
+                        f"[调度] 未到期跳过: "
+                        f"{', '.join(f'{fid}({intervals[fid]}分钟)' for fid in skipped)}"
+                    )
+                feeds = [feed for feed in feeds if feed.id in due_ids]
+
             # 创建抓取器
             rss_config = self.ctx.rss_config
             # RSS 代理：优先使用 RSS 专属代理，否则使用爬虫默认代理
@@ -1109,6 +1219,16 @@ class NewsAnalyzer:
             freshness_enabled = freshness_config.get("ENABLED", True)
             default_max_age_days = freshness_config.get("MAX_AGE_DAYS", 3)
 
+            # 条件请求缓存（ETag / Last-Modified）与镜像健康度，与 RSS 日库放在同一目录
+            data_dir = self.ctx.config.get("STORAGE", {}).get("LOCAL", {}).get("DATA_DIR", "output")
+            feed_cache_path = str(Path(data_dir) / "rss" / "feed_cache.db")
+            validator_store = None
+            if rss_config.get("CONDITIONAL_GET", True):
+                validator_store = RSSValidatorStore(feed_cache_path)
+            mirror_tracker = None
+            if rss_config.get("MIRROR_HEALTH", True):
+                mirror_tracker = MirrorHealthTracker(feed_cache_path)
+
             fetcher = RSSFetcher(
                 feeds=feeds,
                 request_interval=rss_config.get("REQUEST_INTERVAL", 2000),
@@ -1124,10 +1244,20 @@ class NewsAnalyzer:
                     "https://rsshub.12306.workers.dev/",
                     "https://rsshub.pseudoyu.com/",
                 ],
+                max_workers=rss_config.get("MAX_WORKERS", 8),
+                validator_store=validator_store,
+                mirror_tracker=mirror_tracker,
+                streaming=rss_config.get("STREAMING", True),
             )
 
             # 抓取数据
-            rss_data = fetcher.fetch_all()
+            try:
+                rss_data = fetcher.fetch_all()
+            finally:
+                if validator_store:
+                    validator_store.close()
+                if mirror_tracker:
+                    mirror_tracker.close()
 
             # 保存到存储后端
             if self.storage_manager.save_rss_data(rss_data):
@@ -1627,8 +1757,13 @@ class NewsAnalyzer:
 
         return html_file
 
-    def run(self) -> None:
-        """执行分析流程"""
+    def run(self, keep_alive: bool = False) -> None:
+        """
+        执行分析流程
+
+        Args:
+            keep_alive: 常驻模式，结束后保持存储连接以便下一轮复用
+        """
         try:
             self._initialize_and_check_config()
 
@@ -1653,7 +1788,7 @@ class NewsAnalyzer:
                 raise
         finally:
             # 清理资源（包括过期数据清理和数据库连接关闭）
-            self.ctx.cleanup()
+            self.ctx.cleanup(close_storage=not keep_alive)
 
 
 def main():
@@ -1670,11 +1805,15 @@ def main():
   --reset-ai-state       重置今日 AI 分析状态
   --force-push           忽略 once_per_day 限制，强制推送
 
+维护命令:
+  --compact-db           将本地热榜数据库的排名历史迁移为紧凑编码
+
 示例:
   python -m trendradar                    # 正常运行
   python -m trendradar --show-push-status # 查看推送状态
   python -m trendradar --reset-push-state # 重置推送状态后再运行
   python -m trendradar --force-push       # 强制推送（忽略今日已推送限制）
+  python -m trendradar --daemon           # 常驻运行，按 advanced.daemon.interval 周期执行
 """
     )
     parser.add_argument(
@@ -1708,6 +1847,23 @@ def main():
         help="忽略 once_per_day 限制，强制 AI 分析"
     )
 
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="常驻模式：进程内按固定周期执行，保持配置、连接池和数据库连接"
+    )
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=None,
+        help="常驻模式执行周期（分钟），默认使用 advanced.daemon.interval"
+    )
+    parser.add_argument(
+        "--compact-db",
+        action="store_true",
+        help="将本地热榜数据库（output/news/*.db）的排名历史迁移为紧凑编码"
+    )
+
     args = parser.parse_args()
 
     debug_mode = False
@@ -1720,6 +1876,10 @@ def main():
             _handle_status_commands(config, args)
             return
 
+        if args.compact_db:
+            _compact_news_databases(config)
+            return
+
         # 设置强制推送标志
         if args.force_push:
             config["_FORCE_PUSH"] = True
@@ -1738,6 +1898,10 @@ def main():
         # if version_url:
         #     need_update, remote_version = check_all_versions(version_url, configs_version_url)
 
+        if args.daemon:
+            _run_daemon(config, args.interval)
+            return
+
         # 复用已加载的配置，避免重复加载
         analyzer = NewsAnalyzer(config=config)
 
@@ -1750,7 +1914,10 @@ def main():
 
         # 获取 debug 配置
         debug_mode = analyzer.ctx.config.get("DEBUG", False)
-        analyzer.run()
+        try:
+            analyzer.run()
+        finally:
+            analyzer.data_fetcher.close()
     except FileNotFoundError as e:
         print(f"❌ 配置文件错误: {e}")
         print("\n请确保以下文件存在:")
@@ -1763,6 +1930,150 @@ def main():
             raise
 
 
+class _FileWatcher:
+    """按修改时间检测文件变化"""
+
+    def __init__(self, paths: List[str]):
+        self.paths = paths
+        self._mtimes = self._snapshot()
+
+    def _snapshot(self) -> Dict[str, Optional[float]]:
+        mtimes = {}
+        for path in self.paths:
+            try:
+                mtimes[path] = os.path.getmtime(path)
+            except OSError:
+                mtimes[path] = None
+        return mtimes
+
+    def changed(self) -> List[str]:
+        """返回自上次检查以来发生变化的文件"""
+        current = self._snapshot()
+        changed = [path for path in self.paths if current[path] != self._mtimes[path]]
+        self._mtimes = current
+        return changed
+
+
+def _seconds_until_next_run(interval_minutes: int, timezone: str) -> float:
+    """计算距离下一个执行时刻的秒数（按当天零点对齐，与 */N 的 cron 表达式一致）"""
+    from trendradar.utils.time import get_configured_time
+
+    now = get_configured_time(timezone)
+    period = interval_minutes * 60
+    elapsed = now.hour * 3600 + now.minute * 60 + now.second + now.microsecond / 1e6
+    return period - (elapsed % period)
+
+
+def _run_daemon(config: Dict, interval: Optional[int] = None) -> None:
+    """
+    常驻模式
+
+    在同一进程内周期执行分析流程，轮次之间保持：
+    - 已导入的依赖（litellm / boto3 / feedparser 等）
+    - 应用上下文与存储连接（跨天时关闭旧连接）
+    - 已解析的频率词与编译好的正则（文件修改后自动重新加载）
+    - 共享 HTTP 连接池
+
+    config.yaml 修改后在下一轮开始前重新加载配置。
+    收到 SIGTERM / SIGINT 后等待当前轮次结束再退出。
+
+    Args:
+        config: 已加载的配置
+        interval: 执行周期（分钟），默认使用 advanced.daemon.interval
+    """
+    daemon_config = config.get("DAEMON", {})
+    interval = max(1, int(interval or daemon_config.get("INTERVAL", 30)))
+    run_on_start = daemon_config.get("RUN_ON_START", True)
+
+    config_path = os.environ.get("CONFIG_PATH", "config/config.yaml")
+    watcher = _FileWatcher([config_path])
+
+    stop_event = threading.Event()
+
+    def _handle_stop(signum, frame):
+        print(f"[常驻] 收到退出信号 {signum}，当前轮次结束后退出")
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, _handle_stop)
+    signal.signal(signal.SIGINT, _handle_stop)
+
+    analyzer = NewsAnalyzer(config=config)
+    print(f"[常驻] 已启动，执行周期 {interval} 分钟")
+
+    if not run_on_start:
+        stop_event.wait(_seconds_until_next_run(interval, analyzer.ctx.timezone))
+
+    last_date = None
+    try:
+        while not stop_event.is_set():
+            # 配置文件变化时重新加载（失败则沿用旧配置）
+            if watcher.changed():
+                try:
+                    new_config = load_config(config_path)
+                    analyzer.ctx.cleanup()
+                    new_analyzer = NewsAnalyzer(config=new_config)
+                    # 旧实例的对冲线程池与响应去重缓存连接不再使用，新实例创建成功后释放
+                    analyzer.data_fetcher.close()
+                    analyzer = new_analyzer
+                    config = new_config
+                    print("[常驻] 配置文件已变化，已重新加载")
+                except Exception as e:
+                    print(f"[常驻] 重新加载配置失败，继续使用旧配置: {e}")
+
+            # 跨天时关闭前一天的数据库连接（下次访问时按新日期重新打开）
+            today = analyzer.ctx.format_date()
+            if last_date and today != last_date:
+                analyzer.storage_manager.cleanup()
+            last_date = today
+
+            start = time.monotonic()
+            analyzer.run(keep_alive=True)
+            print(f"[常驻] 本轮耗时 {time.monotonic() - start:.1f} 秒")
+
+            # 强制推送 / 强制 AI 分析只作用于第一轮
+            config.pop("_FORCE_PUSH", None)
+            config.pop("_FORCE_AI", None)
+
+            wait_seconds = _seconds_until_next_run(interval, analyzer.ctx.timezone)
+            print(f"[常驻] 下一轮将在 {wait_seconds / 60:.1f} 分钟后执行")
+            stop_event.wait(wait_seconds)
+    finally:
+        analyzer.ctx.cleanup()
+        analyzer.data_fetcher.close()
+        close_http_clients()
+        print("[常驻] 已退出")
+
+
+def _compact_news_databases(config: Dict) -> None:
+    """将本地热榜数据库的排名历史批量迁移为紧凑编码"""
+    from trendradar.storage.compact import compact_database
+
+    data_dir = config.get("STORAGE", {}).get("LOCAL", {}).get("DATA_DIR", "output")
+    news_dir = Path(data_dir) / "news"
+    db_files = sorted(
+        f for f in news_dir.glob("*.db")
+        if re.match(r"^\d{4}-\d{2}-\d{2}\.db$", f.name)
+    ) if news_dir.exists() else []
+
+    if not db_files:
+        print(f"[紧凑编码] 未找到热榜数据库: {news_dir}")
+        return
+
+    for db_file in db_files:
+        size_before = db_file.stat().st_size
+        try:
+            migrated = compact_database(db_file, log_prefix="[紧凑编码]")
+        except Exception as e:
+            print(f"[紧凑编码] {db_file.name} 迁移失败: {e}")
+            continue
+        if migrated:
+            size_after = db_file.stat().st_size
+            print(f"[紧凑编码] {db_file.name}: {migrated} 条排名记录，"
+                  f"{size_before / 1024:.0f} KB -> {size_after / 1024:.0f} KB")
+        else:
+            print(f"[紧凑编码] {db_file.name}: 无需迁移")
+
+
 def _handle_status_commands(config: Dict, args) -> None:
     """处理状态查看/重置命令"""
     from trendradar.context import AppContext
@@ -18,7 +18,7 @@ from trendradar.utils.time import (
     convert_time_for_display,
 )
 from trendradar.core import (
-    load_frequency_words,
+    load_keyword_rules,
     matches_word_groups,
     save_titles_to_file,
     read_all_today_titles,
@@ -158,7 +158,7 @@ class AppContext:
     # === 存储操作 ===
 
     def get_storage_manager(self):
-        """获取存储管理器（延迟初始化，单例）"""
+        """获取存储管理器（延迟初始化，每个上下文独享一个实例）"""
         if self._storage_manager is None:
             storage_config = self.config.get("STORAGE", {})
             remote_config = storage_config.get("REMOTE", {})
@@ -176,12 +176,19 @@ class AppContext:
                     "secret_access_key": remote_config.get("SECRET_ACCESS_KEY", ""),
                     "endpoint_url": remote_config.get("ENDPOINT_URL", ""),
                     "region": remote_config.get("REGION", ""),
+                    "delta_sync": remote_config.get("DELTA_SYNC", True),
+                    "part_size_mb": remote_config.get("PART_SIZE_MB", 8),
+                    "cache_dir": remote_config.get("CACHE_DIR", ".cache/remote"),
+                    "cache_max_mb": remote_config.get("CACHE_MAX_MB", 512),
                 },
                 local_retention_days=local_config.get("RETENTION_DAYS", 0),
                 remote_retention_days=remote_config.get("RETENTION_DAYS", 0),
                 pull_enabled=pull_config.get("ENABLED", False),
                 pull_days=pull_config.get("DAYS", 7),
                 timezone=self.timezone,
+                compact_rank_history=storage_config.get("COMPACT_RANK_HISTORY", False),
+                archive_enabled=local_config.get("ARCHIVE", True),
+                force_new=True,
             )
         return self._storage_manager
 
@@ -199,10 +206,16 @@ class AppContext:
         return save_titles_to_file(results, id_to_name, failed_ids, output_path, clean_title)
 
     def read_today_titles(
-        self, platform_ids: Optional[List[str]] = None, quiet: bool = False
+        self,
+        platform_ids: Optional[List[str]] = None,
+        quiet: bool = False,
+        include_timeline: bool = True,
     ) -> Tuple[Dict, Dict, Dict]:
         """读取当天所有标题"""
-        return read_all_today_titles(self.get_storage_manager(), platform_ids, quiet=quiet)
+        return read_all_today_titles(
+            self.get_storage_manager(), platform_ids, quiet=quiet,
+            include_timeline=include_timeline,
+        )
 
     def detect_new_titles(
         self, platform_ids: Optional[List[str]] = None, quiet: bool = False
@@ -219,8 +232,9 @@ class AppContext:
     def load_frequency_words(
         self, frequency_file: Optional[str] = None
     ) -> Tuple[List[Dict], List[str], List[str]]:
-        """加载频率词配置"""
-        return load_frequency_words(frequency_file)
+        """加载频率词配置（文件内容未变化时复用已解析的词组和编译好的匹配器）"""
+        rules = load_keyword_rules(frequency_file)
+        return rules.word_groups, rules.filter_words, rules.global_filters
 
     def matches_word_groups(
         self,
@@ -467,9 +481,16 @@ class AppContext:
 
     # === 资源清理 ===
 
-    def cleanup(self):
-        """清理资源"""
+    def cleanup(self, close_storage: bool = True):
+        """
+        清理资源
+
+        Args:
+            close_storage: 是否关闭存储连接（常驻模式下轮次之间保持连接）
+        """
         if self._storage_manager:
             self._storage_manager.cleanup_old_data()
-            self._storage_manager.cleanup()
-            self._storage_manager = None
+            self._storage_manager.archive_closed_days()
+            if close_storage:
+                self._storage_manager.cleanup()
+                self._storage_manager = None
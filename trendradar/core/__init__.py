@@ -10,7 +10,12 @@ from trendradar.core.config import (
     get_account_at_index,
 )
 from trendradar.core.loader import load_config
-from trendradar.core.frequency import load_frequency_words, matches_word_groups
+from trendradar.core.frequency import (
+    load_frequency_words,
+    load_keyword_rules,
+    matches_word_groups,
+)
+from trendradar.core.matcher import WordGroupMatcher, compile_word_groups
 from trendradar.core.data import (
     save_titles_to_file,
     read_all_today_titles_from_storage,
@@ -20,6 +25,8 @@ from trendradar.core.data import (
 )
 from trendradar.core.analyzer import (
     calculate_news_weight,
+    calculate_news_weights,
+    sort_titles_by_weight,
     format_time_display,
     count_word_frequency,
     count_rss_frequency,
@@ -32,7 +39,10 @@ __all__ = [
     "get_account_at_index",
     "load_config",
     "load_frequency_words",
+    "load_keyword_rules",
     "matches_word_groups",
+    "WordGroupMatcher",
+    "compile_word_groups",
     # 数据处理
     "save_titles_to_file",
     "read_all_today_titles_from_storage",
@@ -41,6 +51,8 @@ __all__ = [
     "detect_latest_new_titles",
     # 统计分析
     "calculate_news_weight",
+    "calculate_news_weights",
+    "sort_titles_by_weight",
     "format_time_display",
     "count_word_frequency",
     "count_rss_frequency",
@@ -4,15 +4,28 @@
 
 提供新闻统计和分析功能：
 - calculate_news_weight: 计算新闻权重
+- calculate_news_weights / sort_titles_by_weight: 批量计算权重并排序（可选 numpy 向量化）
 - format_time_display: 格式化时间显示
 - count_word_frequency: 统计词频
 """
 
-from typing import Dict, List, Tuple, Optional, Callable
+from itertools import chain
+from typing import Dict, List, Sequence, Tuple, Optional, Callable
 
-from trendradar.core.frequency import matches_word_groups, _word_matches
+from trendradar.core.matcher import compile_word_groups
 from trendradar.utils.time import DEFAULT_TIMEZONE
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+
+# 批量计算权重时，条目数达到该值才使用 numpy（数量少时数组构造的开销大于收益）
+VECTORIZE_MIN_ITEMS = 32
+
 
 def calculate_news_weight(
     title_data: Dict,
@@ -61,6 +74,108 @@ def calculate_news_weight(
     return total_weight
 
 
+def calculate_news_weights(
+    titles_data: Sequence[Dict],
+    rank_threshold: int,
+    weight_config: Dict,
+) -> List[float]:
+    """
+    批量计算新闻权重，结果与逐条调用 calculate_news_weight 完全一致
+
+    安装了 numpy 时，所有条目的排名展平为一维数组（加每条的偏移量），
+    一次向量化计算出全部权重；否则逐条计算。
+
+    Args:
+        titles_data: 标题数据列表，每条包含 ranks 和 count
+        rank_threshold: 排名阈值
+        weight_config: 权重配置 {RANK_WEIGHT, FREQUENCY_WEIGHT, HOTNESS_WEIGHT}
+
+    Returns:
+        List[float]: 与输入顺序对应的权重列表
+    """
+    if not HAS_NUMPY or len(titles_data) < VECTORIZE_MIN_ITEMS:
+        return [
+            calculate_news_weight(title_data, rank_threshold, weight_config)
+            for title_data in titles_data
+        ]
+
+    ranks_lists = [title_data.get("ranks", []) for title_data in titles_data]
+    lengths = np.fromiter(map(len, ranks_lists), dtype=np.int64, count=len(ranks_lists))
+    counts = np.fromiter(
+        (
+            title_data.get("count", len(ranks))
+            for title_data, ranks in zip(titles_data, ranks_lists)
+        ),
+        dtype=np.float64,
+        count=len(ranks_lists),
+    )
+    # 排名和计数都是整数，float64 下求和没有舍入误差，与逐条计算的结果逐位相同
+    flat_ranks = np.fromiter(
+        chain.from_iterable(ranks_lists), dtype=np.float64, count=int(lengths.sum())
+    )
+
+    weights = np.zeros(len(ranks_lists), dtype=np.float64)
+    has_ranks = lengths > 0
+    if flat_ranks.size:
+        # reduceat 遇到空段会取错值，只对有排名的条目求和
+        offsets = (np.cumsum(lengths) - lengths)[has_ranks]
+        rank_sums = np.add.reduceat(11 - np.minimum(flat_ranks, 10), offsets)
+        high_rank_counts = np.add.reduceat(
+            (flat_ranks <= rank_threshold).astype(np.float64), offsets
+        )
+        n = lengths[has_ranks]
+
+        # 排名权重：Σ(11 - min(rank, 10)) / 出现次数
+        rank_weight = rank_sums / n
+        # 频次权重：min(出现次数, 10) × 10
+        frequency_weight = np.minimum(counts[has_ranks], 10) * 10
+        # 热度加成：高排名次数 / 总出现次数 × 100
+        hotness_weight = high_rank_counts / n * 100
+
+        weights[has_ranks] = (
+            rank_weight * weight_config["RANK_WEIGHT"]
+            + frequency_weight * weight_config["FREQUENCY_WEIGHT"]
+            + hotness_weight * weight_config["HOTNESS_WEIGHT"]
+        )
+
+    return weights.tolist()
+
+
+def sort_titles_by_weight(
+    titles_data: List[Dict],
+    rank_threshold: int,
+    weight_config: Dict,
+) -> List[Dict]:
+    """
+    按权重降序、最高排名升序、出现次数降序排序（稳定排序）
+
+    Args:
+        titles_data: 标题数据列表，每条包含 ranks 和 count
+        rank_threshold: 排名阈值
+        weight_config: 权重配置
+
+    Returns:
+        List[Dict]: 排序后的新列表
+    """
+    weights = calculate_news_weights(titles_data, rank_threshold, weight_config)
+    best_ranks = [min(x["ranks"]) if x["ranks"] else 999 for x in titles_data]
+    counts = [x["count"] for x in titles_data]
+
+    if HAS_NUMPY and len(titles_data) >= VECTORIZE_MIN_ITEMS:
+        # lexsort 为稳定排序，最后一个键为主键
+        order = np.lexsort((
+            -np.asarray(counts, dtype=np.float64),
+            np.asarray(best_ranks, dtype=np.float64),
+            -np.asarray(weights, dtype=np.float64),
+        )).tolist()
+    else:
+        order = sorted(
+            range(len(titles_data)),
+            key=lambda i: (-weights[i], best_ranks[i], -counts[i]),
+        )
+    return [titles_data[i] for i in order]
+
+
 def format_time_display(
     first_time: str,
     last_time: str,
@@ -164,16 +279,17 @@ def count_word_frequency(
             all_news_are_new = True
     elif mode == "current":
         # current 模式：只处理当前时间批次的新闻，但统计信息来自全部历史
+        # 各平台分别取其最新批次（分源调度时各平台抓取时间不同）
         if title_info:
-            latest_time = None
-            for source_titles in title_info.values():
+            latest_times = {}
+            for source_id, source_titles in title_info.items():
                 for title_data in source_titles.values():
                     last_time = title_data.get("last_time", "")
-                    if last_time:
-                        if latest_time is None or last_time > latest_time:
-                            latest_time = last_time
+                    if last_time and last_time > latest_times.get(source_id, ""):
+                        latest_times[source_id] = last_time
+            latest_time = max(latest_times.values()) if latest_times else None
 
-            # 只处理 last_time 等于最新时间的新闻
+            # 只处理 last_time 等于该平台最新时间的新闻
             if latest_time:
                 results_to_process = {}
                 for source_id, source_titles in results.items():
@@ -182,7 +298,7 @@ def count_word_frequency(
                         for title, title_data in source_titles.items():
                             if title in title_info[source_id]:
                                 info = title_info[source_id][title]
-                                if info.get("last_time") == latest_time:
+                                if info.get("last_time") == latest_times.get(source_id):
                                     filtered_titles[title] = title_data
                         if filtered_titles:
                             results_to_process[source_id] = filtered_titles
@@ -222,6 +338,8 @@ def count_word_frequency(
         group_key = group["group_key"]
         word_stats[group_key] = {"count": 0, "titles": {}}
 
+    matcher = compile_word_groups(word_groups, filter_words, global_filters)
+
     for source_id, titles_data in results_to_process.items():
         total_titles += len(titles_data)
 
@@ -232,12 +350,10 @@ def count_word_frequency(
             if title in processed_titles.get(source_id, {}):
                 continue
 
-            # 使用统一的匹配逻辑
-            matches_frequency_words = matches_word_groups(
-                title, word_groups, filter_words, global_filters
-            )
+            # 一次扫描得到命中的所有词组（已应用过滤词和全局过滤词）
+            matched_groups = matcher.match_groups(title)
 
-            if not matches_frequency_words:
+            if not matched_groups:
                 continue
 
             # 如果是增量模式或 current 模式第一次，统计匹配的新增新闻数量
@@ -250,40 +366,12 @@ def count_word_frequency(
             source_url = title_data.get("url", "")
             source_mobile_url = title_data.get("mobileUrl", "")
 
-            # 找到匹配的词组（防御性转换确保类型安全）
-            title_lower = str(title).lower() if not isinstance(title, str) else title.lower()
-            for group in word_groups:
-                required_words = group["required"]
-                normal_words = group["normal"]
-
-                # 如果是"全部新闻"模式，所有标题都匹配第一个（唯一的）词组
-                if len(word_groups) == 1 and word_groups[0]["group_key"] == "全部新闻":
-                    group_key = group["group_key"]
-                    word_stats[group_key]["count"] += 1
-                    if source_id not in word_stats[group_key]["titles"]:
-                        word_stats[group_key]["titles"][source_id] = []
-                else:
-                    # 原有的匹配逻辑（支持正则语法）
-                    if required_words:
-                        all_required_present = all(
-                            _word_matches(req_item, title_lower)
-                            for req_item in required_words
-                        )
-                        if not all_required_present:
-                            continue
-
-                    if normal_words:
-                        any_normal_present = any(
-                            _word_matches(normal_item, title_lower)
-                            for normal_item in normal_words
-                        )
-                        if not any_normal_present:
-                            continue
-
-                    group_key = group["group_key"]
-                    word_stats[group_key]["count"] += 1
-                    if source_id not in word_stats[group_key]["titles"]:
-                        word_stats[group_key]["titles"][source_id] = []
+            # 记入每个命中的词组（"全部新闻"模式下唯一的词组匹配所有标题）
+            for group_index in matched_groups:
+                group_key = word_groups[group_index]["group_key"]
+                word_stats[group_key]["count"] += 1
+                if source_id not in word_stats[group_key]["titles"]:
+                    word_stats[group_key]["titles"][source_id] = []
 
                 first_time = ""
                 last_time = ""
@@ -437,14 +525,7 @@ def count_word_frequency(
             all_titles.extend(title_list)
 
         # 按权重排序
-        sorted_titles = sorted(
-            all_titles,
-            key=lambda x: (
-                -calculate_news_weight(x, rank_threshold, weight_config),
-                min(x["ranks"]) if x["ranks"] else 999,
-                -x["count"],
-            ),
-        )
+        sorted_titles = sort_titles_by_weight(all_titles, rank_threshold, weight_config)
 
         # 应用最大显示数量限制（优先级：单独配置 > 全局配置）
         group_max_count = group_key_to_max_count.get(group_key, 0)
@@ -572,6 +653,7 @@ def count_rss_frequency(
 
     total_items = len(rss_items)
     processed_urls = set()  # 用于去重
+    matcher = compile_word_groups(word_groups, filter_words, global_filters)
 
     # 为每个条目分配一个基于发布时间的"排名"
     # 按发布时间排序，最新的排在前面
@@ -592,67 +674,36 @@ def count_rss_frequency(
         if url:
             processed_urls.add(url)
 
-        # 使用统一的匹配逻辑
-        if not matches_word_groups(title, word_groups, filter_words, global_filters):
+        # 一次扫描得到命中的词组，一个条目只计入第一个词组（"全部 RSS" 模式下唯一的词组匹配所有条目）
+        matched_groups = matcher.match_groups(title)
+        if not matched_groups:
             continue
-
-        # 找到匹配的词组
-        title_lower = title.lower()
-        for group in word_groups:
-            required_words = group["required"]
-            normal_words = group["normal"]
-            group_key = group["group_key"]
-
-            # "全部 RSS" 模式：所有条目都匹配
-            if len(word_groups) == 1 and word_groups[0]["group_key"] == "全部 RSS":
-                matched = True
-            else:
-                # 检查必须词（支持正则语法）
-                if required_words:
-                    all_required_present = all(
-                        _word_matches(req_item, title_lower)
-                        for req_item in required_words
-                    )
-                    if not all_required_present:
-                        continue
-
-                # 检查普通词（支持正则语法）
-                if normal_words:
-                    any_normal_present = any(
-                        _word_matches(normal_item, title_lower)
-                        for normal_item in normal_words
-                    )
-                    if not any_normal_present:
-                        continue
-
-                matched = True
-
-            if matched:
-                word_stats[group_key]["count"] += 1
-
-                # 格式化时间显示
-                published_at = item.get("published_at", "")
-                time_display = format_iso_time_friendly(published_at, timezone, include_date=True) if published_at else ""
-
-                # 判断是否为新增
-                is_new = url in new_urls if url else False
-
-                # 获取排名（基于发布时间顺序）
-                rank = url_to_rank.get(url, 99) if url else 99
-
-                title_data = {
-                    "title": title,
-                    "source_name": item.get("feed_name", item.get("feed_id", "RSS")),
-                    "time_display": time_display,
-                    "count": 1,  # RSS 条目通常只出现一次
-                    "ranks": [rank],
-                    "rank_threshold": rank_threshold,
-                    "url": url,
-                    "mobile_url": "",
-                    "is_new": is_new,
-                }
-                word_stats[group_key]["titles"].append(title_data)
-                break  # 一个条目只匹配第一个词组
+        group_key = word_groups[matched_groups[0]]["group_key"]
+
+        word_stats[group_key]["count"] += 1
+
+        # 格式化时间显示
+        published_at = item.get("published_at", "")
+        time_display = format_iso_time_friendly(published_at, timezone, include_date=True) if published_at else ""
+
+        # 判断是否为新增
+        is_new = url in new_urls if url else False
+
+        # 获取排名（基于发布时间顺序）
+        rank = url_to_rank.get(url, 99) if url else 99
+
+        title_data = {
+            "title": title,
+            "source_name": item.get("feed_name", item.get("feed_id", "RSS")),
+            "time_display": time_display,
+            "count": 1,  # RSS 条目通常只出现一次
+            "ranks": [rank],
+            "rank_threshold": rank_threshold,
+            "url": url,
+            "mobile_url": "",
+            "is_new": is_new,
+        }
+        word_stats[group_key]["titles"].append(title_data)
 
     # 构建统计结果
     stats = []
@@ -752,14 +803,7 @@ def convert_keyword_stats_to_platform_stats(
 
     # 3. 按权重排序每个平台内的新闻
     for source_name, titles in platform_map.items():
-        platform_map[source_name] = sorted(
-            titles,
-            key=lambda x: (
-                -calculate_news_weight(x, rank_threshold, weight_config),
-                min(x["ranks"]) if x["ranks"] else 999,
-                -x["count"],
-            ),
-        )
+        platform_map[source_name] = sort_titles_by_weight(titles, rank_threshold, weight_config)
 
     # 4. 构建平台统计结果
     platform_stats = []
@@ -10,9 +10,12 @@
 Author: TrendRadar Team
 """
 
+from collections.abc import Mapping
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Callable
 
+from trendradar.storage.base import TitleRecord
+
 
 def save_titles_to_file(
     results: Dict,
@@ -50,7 +53,7 @@ def save_titles_to_file(
             sorted_titles = []
             for title, info in title_data.items():
                 cleaned_title = clean_title_func(title)
-                if isinstance(info, dict):
+                if isinstance(info, Mapping):
                     ranks = info.get("ranks", [])
                     url = info.get("url", "")
                     mobile_url = info.get("mobileUrl", "")
@@ -86,63 +89,41 @@ def save_titles_to_file(
 def read_all_today_titles_from_storage(
     storage_manager,
     current_platform_ids: Optional[List[str]] = None,
+    include_timeline: bool = True,
 ) -> Tuple[Dict, Dict, Dict]:
     """
     从存储后端读取当天所有标题（SQLite 数据）
 
+    按平台流式读取，平台过滤在查询中完成。
+
     Args:
         storage_manager: 存储管理器实例
         current_platform_ids: 当前监控的平台 ID 列表（用于过滤）
+        include_timeline: 是否读取 rank_timeline（仅 AI 分析需要）
 
     Returns:
         Tuple[Dict, Dict, Dict]: (all_results, id_to_name, title_info)
     """
     try:
-        news_data = storage_manager.get_today_all_data()
-
-        if not news_data or not news_data.items:
-            return {}, {}, {}
-
         all_results = {}
         final_id_to_name = {}
         title_info = {}
 
-        for source_id, news_list in news_data.items.items():
-            # 按平台过滤
-            if current_platform_ids is not None and source_id not in current_platform_ids:
-                continue
-
-            # 获取来源名称
-            source_name = news_data.id_to_name.get(source_id, source_id)
+        for source_id, source_name, news_list in storage_manager.iter_news_items(
+            include_timeline=include_timeline,
+            platform_ids=current_platform_ids,
+        ):
             final_id_to_name[source_id] = source_name
 
             if source_id not in all_results:
                 all_results[source_id] = {}
                 title_info[source_id] = {}
 
+            # all_results 与 title_info 共用同一条记录
             for item in news_list:
-                title = item.title
-                ranks = getattr(item, 'ranks', [item.rank])
-                first_time = getattr(item, 'first_time', item.crawl_time)
-                last_time = getattr(item, 'last_time', item.crawl_time)
-                count = getattr(item, 'count', 1)
-                rank_timeline = getattr(item, 'rank_timeline', [])
-
-                all_results[source_id][title] = {
-                    "ranks": ranks,
-                    "url": item.url or "",
-                    "mobileUrl": item.mobile_url or "",
-                }
-
-                title_info[source_id][title] = {
-                    "first_time": first_time,
-                    "last_time": last_time,
-                    "count": count,
-                    "ranks": ranks,
-                    "url": item.url or "",
-                    "mobileUrl": item.mobile_url or "",
-                    "rank_timeline": rank_timeline,
-                }
+                record = TitleRecord.from_news_item(item)
+                all_results[source_id][item.title] = record
+                title_info[source_id][item.title] = record
 
         return all_results, final_id_to_name, title_info
 
@@ -155,6 +136,7 @@ def read_all_today_titles(
     storage_manager,
     current_platform_ids: Optional[List[str]] = None,
     quiet: bool = False,
+    include_timeline: bool = True,
 ) -> Tuple[Dict, Dict, Dict]:
     """
     读取当天所有标题（从存储后端）
@@ -163,12 +145,13 @@ def read_all_today_titles(
         storage_manager: 存储管理器实例
         current_platform_ids: 当前监控的平台 ID 列表（用于过滤）
         quiet: 是否静默模式（不打印日志）
+        include_timeline: 是否读取 rank_timeline（仅 AI 分析需要）
 
     Returns:
         Tuple[Dict, Dict, Dict]: (all_results, id_to_name, title_info)
     """
     all_results, final_id_to_name, title_info = read_all_today_titles_from_storage(
-        storage_manager, current_platform_ids
+        storage_manager, current_platform_ids, include_timeline=include_timeline
     )
 
     if not quiet:
@@ -201,12 +184,6 @@ def detect_latest_new_titles_from_storage(
         if not latest_data or not latest_data.items:
             return {}
 
-        # 获取所有历史数据
-        all_data = storage_manager.get_today_all_data()
-        if not all_data or not all_data.items:
-            # 没有历史数据（第一次抓取），不应该有"新增"标题
-            return {}
-
         # 获取最新批次时间
         latest_time = latest_data.crawl_time
 
@@ -226,11 +203,12 @@ def detect_latest_new_titles_from_storage(
         # 步骤2：收集历史标题
         # 关键逻辑：一个标题只要其 first_crawl_time < latest_time，就是历史标题
         # 这样即使同一标题有多条记录（URL 不同），只要任何一条是历史的，该标题就算历史
+        # 只需要首次出现时间，不读取 rank_timeline
         historical_titles = {}
-        for source_id, news_list in all_data.items.items():
-            if current_platform_ids is not None and source_id not in current_platform_ids:
-                continue
-
+        for source_id, _, news_list in storage_manager.iter_news_items(
+            include_timeline=False,
+            platform_ids=current_platform_ids,
+        ):
             historical_titles[source_id] = set()
             for item in news_list:
                 first_time = getattr(item, 'first_time', item.crawl_time)
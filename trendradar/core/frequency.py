@@ -11,13 +11,22 @@
 - 正则表达式（/pattern/ 语法）
 - 显示名称（=> 别名 语法）
 - 组别名（[组别名] 语法，作为词组第一行）
+
+load_keyword_rules 在进程内缓存解析并编译好的规则，供爬虫和 MCP 共用。
 """
 
+import hashlib
 import os
 import re
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Union
 
+from trendradar.core.matcher import WordGroupMatcher, compile_word_groups
+
+
+# 规则缓存：{文件路径: (修改时间, 内容哈希, 匹配器)}
+_rules_cache: Dict[str, Tuple[float, str, WordGroupMatcher]] = {}
+
 
 def _parse_word(word: str) -> Dict:
     """
@@ -131,6 +140,54 @@ def load_frequency_words(
     with open(frequency_path, "r", encoding="utf-8") as f:
         content = f.read()
 
+    return _parse_frequency_content(content)
+
+
+def load_keyword_rules(frequency_file: Optional[str] = None) -> WordGroupMatcher:
+    """
+    加载频率词配置并编译为匹配器（带进程内缓存）
+
+    文件修改时间未变化时直接复用；修改时间变化但内容哈希相同（如重新部署、touch）也复用，
+    只有内容真正变化时才重新解析和编译。匹配器的 word_groups / filter_words / global_filters
+    即 load_frequency_words 的返回值，调用方不应修改。
+
+    Args:
+        frequency_file: 频率词配置文件路径，默认同 load_frequency_words
+
+    Returns:
+        WordGroupMatcher 实例
+
+    Raises:
+        FileNotFoundError: 频率词文件不存在
+    """
+    if frequency_file is None:
+        frequency_file = os.environ.get(
+            "FREQUENCY_WORDS_PATH", "config/frequency_words.txt"
+        )
+
+    try:
+        mtime = os.path.getmtime(frequency_file)
+    except OSError:
+        raise FileNotFoundError(f"频率词文件 {frequency_file} 不存在")
+
+    cached = _rules_cache.get(frequency_file)
+    if cached and cached[0] == mtime:
+        return cached[2]
+
+    with open(frequency_file, "r", encoding="utf-8") as f:
+        content = f.read()
+    digest = hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+    if cached and cached[1] == digest:
+        rules = cached[2]
+    else:
+        rules = compile_word_groups(*_parse_frequency_content(content))
+    _rules_cache[frequency_file] = (mtime, digest, rules)
+    return rules
+
+
+def _parse_frequency_content(content: str) -> Tuple[List[Dict], List[str], List[str]]:
+    """解析频率词配置文本，返回 (词组列表, 词组内过滤词, 全局过滤词)"""
     word_groups = [group.strip() for group in content.split("\n\n") if group.strip()]
 
     processed_groups = []
@@ -249,6 +306,8 @@ def matches_word_groups(
     """
     检查标题是否匹配词组规则
 
+    使用编译后的匹配器（见 matcher.py），同一组配置只编译一次。
+
     Args:
         title: 标题文本
         word_groups: 词组列表
@@ -258,49 +317,4 @@ def matches_word_groups(
     Returns:
         是否匹配
     """
-    # 防御性类型检查：确保 title 是有效字符串
-    if not isinstance(title, str):
-        title = str(title) if title is not None else ""
-    if not title.strip():
-        return False
-
-    title_lower = title.lower()
-
-    # 全局过滤检查（优先级最高）
-    if global_filters:
-        if any(global_word.lower() in title_lower for global_word in global_filters):
-            return False
-
-    # 如果没有配置词组，则匹配所有标题（支持显示全部新闻）
-    if not word_groups:
-        return True
-
-    # 过滤词检查（兼容新旧格式）
-    for filter_item in filter_words:
-        if _word_matches(filter_item, title_lower):
-            return False
-
-    # 词组匹配检查
-    for group in word_groups:
-        required_words = group["required"]
-        normal_words = group["normal"]
-
-        # 必须词检查
-        if required_words:
-            all_required_present = all(
-                _word_matches(req_item, title_lower) for req_item in required_words
-            )
-            if not all_required_present:
-                continue
-
-        # 普通词检查
-        if normal_words:
-            any_normal_present = any(
-                _word_matches(normal_item, title_lower) for normal_item in normal_words
-            )
-            if not any_normal_present:
-                continue
-
-        return True
-
-    return False
+    return compile_word_groups(word_groups, filter_words, global_filters).matches(title)
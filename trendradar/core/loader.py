@@ -73,6 +73,12 @@ def _load_crawler_config(config_data: Dict) -> Dict:
         "USE_PROXY": crawler_config.get("use_proxy", False),
         "DEFAULT_PROXY": crawler_config.get("default_proxy", ""),
         "ENABLE_CRAWLER": platforms_config.get("enabled", True),
+        "MAX_WORKERS": crawler_config.get("max_workers", 1),
+        "PER_HOST_CONCURRENCY": crawler_config.get("per_host_concurrency", 4),
+        "RATE_LIMIT": crawler_config.get("rate_limit", 0),
+        "CRAWL_DEADLINE": crawler_config.get("crawl_deadline", 0),
+        "HEDGE_REQUESTS": crawler_config.get("hedge_requests", False),
+        "PAYLOAD_DEDUP": crawler_config.get("payload_dedup", False),
     }
 
 
@@ -170,6 +176,10 @@ def _load_rss_config(config_data: Dict) -> Dict:
         "ENABLED": rss.get("enabled", False),
         "REQUEST_INTERVAL": advanced_rss.get("request_interval", 2000),
         "TIMEOUT": advanced_rss.get("timeout", 15),
+        "MAX_WORKERS": advanced_rss.get("max_workers", 8),
+        "CONDITIONAL_GET": advanced_rss.get("conditional_get", True),
+        "MIRROR_HEALTH": advanced_rss.get("mirror_health", True),
+        "STREAMING": advanced_rss.get("streaming", True),
         "USE_PROXY": advanced_rss.get("use_proxy", False),
         "PROXY_URL": rss_proxy_url,
         "FEEDS": rss.get("feeds", []),
@@ -180,6 +190,28 @@ def _load_rss_config(config_data: Dict) -> Dict:
     }
 
 
+def _load_scheduler_config(config_data: Dict) -> Dict:
+    """加载自适应调度配置"""
+    advanced = config_data.get("advanced", {})
+    scheduler = advanced.get("scheduler", {})
+    return {
+        "ENABLED": scheduler.get("enabled", False),
+        "MIN_INTERVAL": scheduler.get("min_interval", 30),
+        "MAX_INTERVAL": scheduler.get("max_interval", 240),
+        "MIN_SAMPLES": scheduler.get("min_samples", 4),
+    }
+
+
+def _load_daemon_config(config_data: Dict) -> Dict:
+    """加载常驻模式配置"""
+    advanced = config_data.get("advanced", {})
+    daemon = advanced.get("daemon", {})
+    return {
+        "INTERVAL": daemon.get("interval", 30),
+        "RUN_ON_START": daemon.get("run_on_start", True),
+    }
+
+
 def _load_display_config(config_data: Dict) -> Dict:
     """加载推送内容显示配置"""
     display = config_data.get("display", {})
@@ -305,6 +337,7 @@ def _load_storage_config(config_data: Dict) -> Dict:
         "LOCAL": {
             "DATA_DIR": local.get("data_dir", "output"),
             "RETENTION_DAYS": _get_env_int("LOCAL_RETENTION_DAYS") or local.get("retention_days", 0),
+            "ARCHIVE": local.get("archive", True),
         },
         "REMOTE": {
             "ENDPOINT_URL": _get_env_str("S3_ENDPOINT_URL") or remote.get("endpoint_url", ""),
@@ -313,11 +346,16 @@ def _load_storage_config(config_data: Dict) -> Dict:
             "SECRET_ACCESS_KEY": _get_env_str("S3_SECRET_ACCESS_KEY") or remote.get("secret_access_key", ""),
             "REGION": _get_env_str("S3_REGION") or remote.get("region", ""),
             "RETENTION_DAYS": _get_env_int("REMOTE_RETENTION_DAYS") or remote.get("retention_days", 0),
+            "DELTA_SYNC": remote.get("delta_sync", True),
+            "PART_SIZE_MB": remote.get("part_size_mb", 8),
+            "CACHE_DIR": remote.get("cache_dir", ".cache/remote"),
+            "CACHE_MAX_MB": remote.get("cache_max_mb", 512),
         },
         "PULL": {
             "ENABLED": pull_enabled_env if pull_enabled_env is not None else pull.get("enabled", False),
             "DAYS": _get_env_int("PULL_DAYS") or pull.get("days", 7),
         },
+        "COMPACT_RANK_HISTORY": storage.get("compact_rank_history", False),
     }
 
 
@@ -502,6 +540,12 @@ def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
     # RSS 配置
     config["RSS"] = _load_rss_config(config_data)
 
+    # 自适应调度配置
+    config["SCHEDULER"] = _load_scheduler_config(config_data)
+
+    # 常驻模式配置
+    config["DAEMON"] = _load_daemon_config(config_data)
+
     # AI 模型共享配置
     config["AI"] = _load_ai_config(config_data)
 
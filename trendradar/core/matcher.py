@@ -0,0 +1,343 @@
+# coding=utf-8
+"""
+频率词编译匹配模块
+
+将 load_frequency_words 的结果（词组、过滤词、全局过滤词）编译为一个匹配器，
+每个标题只扫描一次即可得到所有命中的词组：
+- 所有普通文本词（包括必须词、过滤词、全局过滤词）合并为一个 Aho–Corasick 自动机
+- 只由字面分支组成的正则（如 /华为|鸿蒙/，配置中最常见的写法）拆成多个文本词并入自动机
+- 其余正则词合并为一个分支正则作为预筛，命中后再逐个确认具体是哪些正则
+
+匹配语义与逐词检查（frequency._word_matches / matches_word_groups）完全一致：
+文本词为忽略大小写的子串匹配，正则词对小写标题执行 search。
+"""
+
+import re
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Union
+
+# 正则中的反向引用依赖自身的分组编号，合并后编号会变化，这类正则单独匹配
+_BACKREFERENCE = re.compile(r"\\\d|\(\?P=")
+
+# 正则元字符（分支符 | 除外）
+_REGEX_METACHARS = frozenset(".^$*+?{}[]\\()")
+
+
+def _literal_alternatives(pattern_str: str) -> Optional[List[str]]:
+    """
+    将只由字面分支组成的正则拆分为小写文本词，其他正则返回 None
+
+    只接受 ASCII 字符和无大小写之分的字符（如汉字），
+    以保证忽略大小写的正则匹配与小写子串匹配结果一致。
+    """
+    alternatives = pattern_str.split("|")
+    for alternative in alternatives:
+        if not alternative:
+            return None
+        for char in alternative:
+            if char in _REGEX_METACHARS:
+                return None
+            if not char.isascii() and char.lower() != char.upper():
+                return None
+    return [alternative.lower() for alternative in alternatives]
+
+
+class _Automaton:
+    """Aho–Corasick 自动机（多模式子串匹配）"""
+
+    def __init__(self, patterns: Dict[str, Set[int]]):
+        """
+        Args:
+            patterns: {模式串: 词 ID 集合}，模式串非空
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[FrozenSet[int]] = [frozenset()]
+
+        outputs: List[Set[int]] = [set()]
+        for pattern, word_ids in patterns.items():
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append(set())
+                state = next_state
+            outputs[state].update(word_ids)
+
+        # 按层构建失败指针，并把失败链上的输出合并到每个状态
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                outputs[next_state] |= outputs[self._fail[next_state]]
+
+        self._output = [frozenset(words) for words in outputs]
+
+    def search(self, text: str) -> Set[int]:
+        """返回在 text 中出现的所有模式的词 ID"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        found: Set[int] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+        return found
+
+
+class WordGroupMatcher:
+    """
+    编译后的频率词匹配器
+
+    Examples:
+        >>> word_groups, filter_words, global_filters = load_frequency_words()
+        >>> matcher = WordGroupMatcher(word_groups, filter_words, global_filters)
+        >>> matcher.matches("华为发布新机")
+        True
+        >>> matcher.match_groups("华为发布新机")  # 命中词组在 word_groups 中的下标
+        [0]
+    """
+
+    def __init__(
+        self,
+        word_groups: List[Dict],
+        filter_words: List,
+        global_filters: Optional[List[str]] = None,
+    ):
+        """
+        Args:
+            word_groups: 词组列表
+            filter_words: 过滤词列表（可以是字符串列表或字典列表）
+            global_filters: 全局过滤词列表
+        """
+        self.word_groups = word_groups
+        self.filter_words = filter_words
+        self.global_filters = global_filters
+
+        self._word_ids: Dict = {}
+        self._literals: Dict[str, Set[int]] = {}
+        self._regexes: Dict[int, "re.Pattern"] = {}
+        self._always: Set[int] = set()  # 空字符串词，任何标题都包含
+
+        self._global_ids = frozenset(self._add_word(word) for word in (global_filters or []))
+        self._filter_ids = frozenset(self._add_word(word) for word in filter_words)
+
+        # 每个词组编译为 (必须词 ID 集合, 普通词 ID 集合)
+        self._groups = []
+        self._groups_by_word: Dict[int, List[int]] = {}
+        self._unconditional_groups: List[int] = []  # 没有任何词的词组，匹配所有标题
+        for index, group in enumerate(word_groups):
+            required = frozenset(self._add_word(word) for word in group["required"])
+            normal = frozenset(self._add_word(word) for word in group["normal"])
+            self._groups.append((required, normal))
+            if not required and not normal:
+                self._unconditional_groups.append(index)
+            for word_id in required | normal:
+                self._groups_by_word.setdefault(word_id, []).append(index)
+
+        self._automaton = _Automaton(self._literals) if self._literals else None
+        self._compile_regexes()
+
+    def _add_word(self, word_config: Union[str, Dict]) -> int:
+        """登记一个词并返回其 ID（相同的词共用一个 ID）"""
+        if isinstance(word_config, str):
+            key = ("text", word_config.lower())
+        elif word_config.get("is_regex") and word_config.get("pattern"):
+            key = ("regex", word_config["pattern"].pattern)
+        else:
+            key = ("text", word_config["word"].lower())
+
+        word_id = self._word_ids.get(key)
+        if word_id is not None:
+            return word_id
+
+        word_id = len(self._word_ids)
+        self._word_ids[key] = word_id
+        if key[0] == "regex":
+            alternatives = _literal_alternatives(key[1])
+            if alternatives is None:
+                self._regexes[word_id] = word_config["pattern"]
+            else:
+                for alternative in alternatives:
+                    self._literals.setdefault(alternative, set()).add(word_id)
+        elif key[1]:
+            self._literals.setdefault(key[1], set()).add(word_id)
+        else:
+            self._always.add(word_id)
+        return word_id
+
+    def _compile_regexes(self) -> None:
+        """把可合并的正则词合并为一个分支正则，用于快速排除不含任何正则命中的标题"""
+        self._combined_regex = None
+        self._separate_regexes = {}
+        combinable = {}
+        for word_id, pattern in self._regexes.items():
+            if _BACKREFERENCE.search(pattern.pattern):
+                self._separate_regexes[word_id] = pattern
+            else:
+                combinable[word_id] = pattern
+
+        if len(combinable) > 1:
+            try:
+                self._combined_regex = re.compile(
+                    "|".join(f"(?:{pattern.pattern})" for pattern in combinable.values()),
+                    re.IGNORECASE,
+                )
+            except re.error:
+                # 个别正则无法合并（如含局部内联标记），全部单独匹配
+                self._combined_regex = None
+        if self._combined_regex is None:
+            self._separate_regexes.update(combinable)
+            combinable = {}
+        self._combined_members = combinable
+
+    def _scan(self, title_lower: str) -> Set[int]:
+        """扫描一次标题，返回命中的所有词 ID"""
+        hits = self._automaton.search(title_lower) if self._automaton else set()
+        if self._always:
+            hits |= self._always
+        if self._combined_regex is not None and self._combined_regex.search(title_lower):
+            hits.update(
+                word_id for word_id, pattern in self._combined_members.items()
+                if pattern.search(title_lower)
+            )
+        for word_id, pattern in self._separate_regexes.items():
+            if pattern.search(title_lower):
+                hits.add(word_id)
+        return hits
+
+    @staticmethod
+    def _normalize(title) -> Optional[str]:
+        """防御性类型转换，空标题返回 None"""
+        if not isinstance(title, str):
+            title = str(title) if title is not None else ""
+        if not title.strip():
+            return None
+        return title.lower()
+
+    def _group_matches(self, index: int, hits: Set[int]) -> bool:
+        required, normal = self._groups[index]
+        if required and not required <= hits:
+            return False
+        if normal and normal.isdisjoint(hits):
+            return False
+        return True
+
+    def _matched_groups(self, hits: Set[int]) -> List[int]:
+        candidates = set(self._unconditional_groups)
+        for word_id in hits:
+            candidates.update(self._groups_by_word.get(word_id, ()))
+        return sorted(index for index in candidates if self._group_matches(index, hits))
+
+    def matches(self, title) -> bool:
+        """
+        检查标题是否匹配词组规则（与 matches_word_groups 语义一致）
+
+        Args:
+            title: 标题文本
+
+        Returns:
+            是否匹配
+        """
+        title_lower = self._normalize(title)
+        if title_lower is None:
+            return False
+
+        hits = self._scan(title_lower)
+        if not self._global_ids.isdisjoint(hits):
+            return False
+
+        # 如果没有配置词组，则匹配所有标题
+        if not self._groups:
+            return True
+
+        if not self._filter_ids.isdisjoint(hits):
+            return False
+        return bool(self._matched_groups(hits))
+
+    def match_groups(self, title) -> List[int]:
+        """
+        返回标题命中的所有词组下标（按配置顺序），被过滤或未命中时返回空列表
+
+        Args:
+            title: 标题文本
+
+        Returns:
+            命中词组在 word_groups 中的下标列表
+        """
+        title_lower = self._normalize(title)
+        if title_lower is None:
+            return []
+
+        hits = self._scan(title_lower)
+        if not self._global_ids.isdisjoint(hits) or not self._filter_ids.isdisjoint(hits):
+            return []
+        return self._matched_groups(hits)
+
+    def match_titles(self, titles: Iterable, first_only: bool = False) -> Dict[int, List]:
+        """
+        批量匹配标题
+
+        Args:
+            titles: 标题列表
+            first_only: 每个标题是否只计入第一个命中的词组
+
+        Returns:
+            {词组下标: 命中的标题列表}，按词组配置顺序排列，标题保持输入顺序
+        """
+        hits_by_group: Dict[int, List] = {}
+        for title in titles:
+            matched_groups = self.match_groups(title)
+            if first_only:
+                matched_groups = matched_groups[:1]
+            for index in matched_groups:
+                hits_by_group.setdefault(index, []).append(title)
+        return dict(sorted(hits_by_group.items()))
+
+
+def compile_word_groups(
+    word_groups: List[Dict],
+    filter_words: List,
+    global_filters: Optional[List[str]] = None,
+) -> WordGroupMatcher:
+    """
+    获取词组配置对应的匹配器
+
+    同一组配置对象（load_frequency_words 的同一次返回结果）重复调用时复用上次编译的匹配器。
+
+    Args:
+        word_groups: 词组列表
+        filter_words: 过滤词列表
+        global_filters: 全局过滤词列表
+
+    Returns:
+        WordGroupMatcher 实例
+    """
+    global _last_matcher
+    matcher = _last_matcher
+    if (
+        matcher is not None
+        and matcher.word_groups is word_groups
+        and matcher.filter_words is filter_words
+        and matcher.global_filters is global_filters
+    ):
+        return matcher
+    matcher = WordGroupMatcher(word_groups, filter_words, global_filters)
+    _last_matcher = matcher
+    return matcher
+
+
+_last_matcher: Optional[WordGroupMatcher] = None
@@ -4,5 +4,18 @@
 """
 
 from trendradar.crawler.fetcher import DataFetcher
+from trendradar.crawler.http_client import HTTPClient, get_http_client, close_http_clients
+from trendradar.crawler.latency import LatencyTracker
+from trendradar.crawler.payload_cache import PayloadCache
+from trendradar.crawler.scheduler import AdaptiveScheduler
+
+__all__ = [
+    "DataFetcher",
+    "HTTPClient",
+    "get_http_client",
+    "close_http_clients",
+    "LatencyTracker",
+    "PayloadCache",
+    "AdaptiveScheduler",
+]
 
-__all__ = ["DataFetcher"]
@@ -4,17 +4,81 @@
 
 负责从 NewsNow API 抓取新闻数据，支持：
 - 单个平台数据获取
-- 批量平台数据爬取
+- 批量平台数据爬取（顺序 / 并发）
 - 自动重试机制
 - 代理支持
+- 并发模式下的单主机并发限制、全局限速与单次爬取截止时间
+- 按平台历史延迟的请求超时预算与对冲请求
+- 响应只解码一次（可选 orjson），响应体与上次相同时复用上次解析结果
 """
 
-import json
 import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from typing import Dict, List, Tuple, Optional, Union
+from urllib.parse import urlparse
 
-import requests
+from trendradar.crawler.http_client import DEFAULT_POOL_MAXSIZE, get_http_client
+from trendradar.crawler.latency import LatencyTracker
+from trendradar.crawler.payload_cache import PayloadCache, payload_digest
+from trendradar.utils import fast_json
+
+
+class RateLimiter:
+    """
+    全局限速器（线程安全）
+
+    按固定间隔放行请求：rate 为每秒允许发起的请求数，
+    rate <= 0 表示不限速。
+    """
+
+    def __init__(self, rate: float = 0):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def acquire(self, deadline: Optional[float] = None) -> bool:
+        """
+        获取一个请求配额，必要时阻塞等待
+
+        Args:
+            deadline: 截止时间（time.monotonic() 时间戳），超过则放弃等待
+
+        Returns:
+            是否获得配额（等待会超过截止时间时返回 False）
+        """
+        if self.interval <= 0:
+            return deadline is None or time.monotonic() < deadline
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_time)
+            if deadline is not None and slot >= deadline:
+                return False
+            self._next_time = slot + self.interval
+
+        wait_time = slot - now
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return True
+
+    def try_acquire(self) -> bool:
+        """
+        不等待地获取一个请求配额
+
+        Returns:
+            当前是否有可用配额（没有时不占用配额）
+        """
+        if self.interval <= 0:
+            return True
+
+        with self._lock:
+            now = time.monotonic()
+            if self._next_time > now:
+                return False
+            self._next_time = now + self.interval
+        return True
 
 
 class DataFetcher:
@@ -32,10 +96,26 @@ class DataFetcher:
         "Cache-Control": "no-cache",
     }
 
+    # 单次请求超时（秒）
+    REQUEST_TIMEOUT = 10
+
+    # 延迟预算：单次请求超时 = 平台 p95 延迟 × BUDGET_FACTOR（不低于 MIN_REQUEST_BUDGET 秒）
+    BUDGET_FACTOR = 3
+    MIN_REQUEST_BUDGET = 3.0
+    # 对冲请求的最短等待时间（秒）
+    MIN_HEDGE_DELAY = 0.2
+
     def __init__(
         self,
         proxy_url: Optional[str] = None,
         api_url: Optional[str] = None,
+        max_workers: int = 1,
+        per_host_concurrency: int = 4,
+        rate_limit: float = 0,
+        crawl_deadline: float = 0,
+        latency_tracker: Optional[LatencyTracker] = None,
+        hedge_requests: bool = False,
+        payload_cache: Optional[PayloadCache] = None,
     ):
         """
         初始化数据获取器
@@ -43,9 +123,178 @@ class DataFetcher:
         Args:
             proxy_url: 代理服务器 URL（可选）
             api_url: API 基础 URL（可选，默认使用 DEFAULT_API_URL）
+            max_workers: 并发线程数，<= 1 时使用顺序爬取（兼容旧行为）
+            per_host_concurrency: 同一主机的最大并发请求数
+            rate_limit: 全局限速（每秒请求数），<= 0 时不限速
+            crawl_deadline: 单次爬取截止时间（秒），<= 0 时不限制
+            latency_tracker: 平台延迟跟踪器（可选），用于延迟预算与对冲请求
+            hedge_requests: 是否启用对冲请求（需要 latency_tracker）
+            payload_cache: 响应去重缓存（可选），响应体与上次相同时复用上次解析结果
         """
         self.proxy_url = proxy_url
         self.api_url = api_url or self.DEFAULT_API_URL
+        self.max_workers = max(1, int(max_workers or 1))
+        self.per_host_concurrency = max(1, int(per_host_concurrency or 1))
+        self.rate_limit = rate_limit or 0
+        self.crawl_deadline = crawl_deadline or 0
+
+        self.latency_tracker = latency_tracker
+        self.hedge_requests = hedge_requests and latency_tracker is not None
+        self.payload_cache = payload_cache
+        # 最近一次爬取中响应体与上次相同的平台
+        self.unchanged_ids: List[str] = []
+
+        self._host_semaphores: Dict[str, threading.Semaphore] = {}
+        self._host_lock = threading.Lock()
+
+        # 对冲请求线程池（延迟创建）与统计
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._hedge_lock = threading.Lock()
+        self.hedge_stats = {"sent": 0, "won": 0}
+
+        # 共享连接池（同一代理配置复用同一客户端）
+        self.http = get_http_client(self.proxy_url)
+        if self.per_host_concurrency > DEFAULT_POOL_MAXSIZE:
+            self.http.set_host_pool_size(
+                urlparse(self.api_url).netloc, self.per_host_concurrency
+            )
+
+    def _get_host_semaphore(self, url: str) -> threading.Semaphore:
+        """获取指定 URL 所属主机的并发信号量"""
+        host = urlparse(url).netloc
+        with self._host_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.Semaphore(self.per_host_concurrency)
+                self._host_semaphores[host] = semaphore
+            return semaphore
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        with self._hedge_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers * 2 + 2,
+                    thread_name_prefix="crawl-hedge",
+                )
+            return self._hedge_executor
+
+    def close(self) -> None:
+        """
+        释放资源：关闭对冲请求线程池和响应去重缓存
+
+        共享 HTTP 连接池由 close_http_clients() 统一关闭，这里不处理。
+        """
+        with self._hedge_lock:
+            executor, self._hedge_executor = self._hedge_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if self.payload_cache is not None:
+            self.payload_cache.close()
+            self.payload_cache = None
+
+    @staticmethod
+    def _discard_request(future) -> None:
+        """放弃未被采用的请求：尚未开始的直接取消，已发出的在返回后关闭响应、归还连接"""
+        if future.cancel():
+            return
+
+        def close_response(done_future) -> None:
+            if done_future.cancelled() or done_future.exception() is not None:
+                return
+            done_future.result().close()
+
+        future.add_done_callback(close_response)
+
+    def _hedged_get(
+        self,
+        url: str,
+        timeout: float,
+        hedge_delay: float,
+        limiter: Optional[RateLimiter] = None,
+        host_semaphore: Optional[threading.Semaphore] = None,
+    ):
+        """
+        发送对冲请求
+
+        主请求超过 hedge_delay 仍未返回时，再发送一个相同请求，取先成功返回的响应。
+        对冲请求与普通请求一样占用限速配额和主机并发名额，两者当时都有空余时才发送，
+        否则只等待主请求。未被采用的请求返回后关闭响应。
+
+        Args:
+            url: 请求地址
+            timeout: 请求超时（秒）
+            hedge_delay: 发送对冲请求前等待主请求的时间（秒）
+            limiter: 本次爬取的限速器（可选）
+            host_semaphore: 主机并发信号量（可选），对冲请求结束后释放
+
+        Returns:
+            (响应, 是否来自对冲请求) 元组
+
+        Raises:
+            请求都失败时抛出最后一个异常
+        """
+        executor = self._get_hedge_executor()
+        end_time = time.monotonic() + timeout + 1
+
+        def do_get(request_timeout: float):
+            response = self.http.get(url, headers=self.DEFAULT_HEADERS, timeout=request_timeout)
+            try:
+                response.raise_for_status()
+            except Exception:
+                response.close()
+                raise
+            return response
+
+        primary = executor.submit(do_get, timeout)
+        done, _ = wait([primary], timeout=hedge_delay)
+        if done:
+            return primary.result(), False
+
+        hedge = None
+        if host_semaphore is None or host_semaphore.acquire(blocking=False):
+            if limiter is None or limiter.try_acquire():
+                hedge = executor.submit(do_get, max(0.5, timeout - hedge_delay))
+                if host_semaphore is not None:
+                    hedge.add_done_callback(lambda _: host_semaphore.release())
+                with self._hedge_lock:
+                    self.hedge_stats["sent"] += 1
+            elif host_semaphore is not None:
+                host_semaphore.release()
+
+        is_hedge = {primary: False}
+        if hedge is not None:
+            is_hedge[hedge] = True
+        pending = set(is_hedge)
+        error: Optional[Exception] = None
+        try:
+            while pending:
+                done, pending = wait(
+                    pending,
+                    timeout=max(0.0, end_time - time.monotonic()),
+                    return_when=FIRST_COMPLETED,
+                )
+                if not done:
+                    break
+                for future in done:
+                    try:
+                        response = future.result()
+                    except Exception as e:
+                        error = e
+                        continue
+                    pending = set()
+                    for other in is_hedge:
+                        if other is not future:
+                            self._discard_request(other)
+                    if is_hedge[future]:
+                        with self._hedge_lock:
+                            self.hedge_stats["won"] += 1
+                    return response, is_hedge[future]
+        finally:
+            for future in pending:
+                self._discard_request(future)
+
+        raise error or TimeoutError(f"请求超时（{timeout:.1f}秒）")
 
     def fetch_data(
         self,
@@ -53,6 +302,7 @@ class DataFetcher:
         max_retries: int = 2,
         min_retry_wait: int = 3,
         max_retry_wait: int = 5,
+        deadline: Optional[float] = None,
     ) -> Tuple[Optional[str], str, str]:
         """
         获取指定ID数据，支持重试
@@ -62,10 +312,36 @@ class DataFetcher:
             max_retries: 最大重试次数
             min_retry_wait: 最小重试等待时间（秒）
             max_retry_wait: 最大重试等待时间（秒）
+            deadline: 截止时间（time.monotonic() 时间戳），超过后不再重试
 
         Returns:
             (响应文本, 平台ID, 别名) 元组，失败时响应文本为 None
         """
+        content, _, id_value, alias = self._fetch_payload(
+            id_info, max_retries, min_retry_wait, max_retry_wait, deadline
+        )
+        text = content.decode("utf-8", errors="replace") if content is not None else None
+        return text, id_value, alias
+
+    def _fetch_payload(
+        self,
+        id_info: Union[str, Tuple[str, str]],
+        max_retries: int = 2,
+        min_retry_wait: int = 3,
+        max_retry_wait: int = 5,
+        deadline: Optional[float] = None,
+        limiter: Optional[RateLimiter] = None,
+        host_semaphore: Optional[threading.Semaphore] = None,
+    ) -> Tuple[Optional[bytes], Optional[Dict], str, str]:
+        """
+        获取指定ID数据并解码（每个响应只解码一次），支持重试
+
+        limiter / host_semaphore 为并发爬取时的限速器和主机并发信号量，
+        对冲请求同样计入二者。
+
+        Returns:
+            (响应体, 解码后的数据, 平台ID, 别名) 元组，失败时响应体和数据为 None
+        """
         if isinstance(id_info, tuple):
             id_value, alias = id_info
         else:
@@ -74,31 +350,56 @@ class DataFetcher:
 
         url = f"{self.api_url}?id={id_value}&latest"
 
-        proxies = None
-        if self.proxy_url:
-            proxies = {"http": self.proxy_url, "https": self.proxy_url}
-
         retries = 0
         while retries <= max_retries:
+            timeout = self.REQUEST_TIMEOUT
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    print(f"请求 {id_value} 超出截止时间，放弃")
+                    return None, None, id_value, alias
+                timeout = min(timeout, remaining)
+
+            # 延迟预算：按平台历史 p95 延迟收紧单次请求超时
+            p95 = self.latency_tracker.get_percentile(id_value) if self.latency_tracker else None
+            if p95 is not None:
+                timeout = min(timeout, max(self.MIN_REQUEST_BUDGET, p95 * self.BUDGET_FACTOR))
+
             try:
-                response = requests.get(
-                    url,
-                    proxies=proxies,
-                    headers=self.DEFAULT_HEADERS,
-                    timeout=10,
-                )
-                response.raise_for_status()
+                start = time.perf_counter()
+                hedged = False
+                if self.hedge_requests and p95 is not None:
+                    response, hedged = self._hedged_get(
+                        url,
+                        timeout,
+                        max(self.MIN_HEDGE_DELAY, p95),
+                        limiter=limiter,
+                        host_semaphore=host_semaphore,
+                    )
+                else:
+                    response = self.http.get(
+                        url,
+                        headers=self.DEFAULT_HEADERS,
+                        timeout=timeout,
+                    )
+                    response.raise_for_status()
+                latency_ms = (time.perf_counter() - start) * 1000
 
-                data_text = response.text
-                data_json = json.loads(data_text)
+                content = response.content
+                data_json = fast_json.loads(content)
 
                 status = data_json.get("status", "未知")
                 if status not in ["success", "cache"]:
                     raise ValueError(f"响应状态异常: {status}")
 
+                if self.latency_tracker:
+                    self.latency_tracker.record(id_value, latency_ms, hedged)
+
                 status_info = "最新数据" if status == "success" else "缓存数据"
-                print(f"获取 {id_value} 成功（{status_info}）")
-                return data_text, id_value, alias
+                if self.hedge_requests:
+                    status_info += "，对冲请求" if hedged else "，主请求"
+                print(f"获取 {id_value} 成功（{status_info}，{latency_ms:.0f} ms）")
+                return content, data_json, id_value, alias
 
             except Exception as e:
                 retries += 1
@@ -106,13 +407,77 @@ class DataFetcher:
                     base_wait = random.uniform(min_retry_wait, max_retry_wait)
                     additional_wait = (retries - 1) * random.uniform(1, 2)
                     wait_time = base_wait + additional_wait
+                    if deadline is not None and time.monotonic() + wait_time >= deadline:
+                        print(f"请求 {id_value} 失败: {e}（剩余时间不足，不再重试）")
+                        return None, None, id_value, alias
                     print(f"请求 {id_value} 失败: {e}. {wait_time:.2f}秒后重试...")
                     time.sleep(wait_time)
                 else:
                     print(f"请求 {id_value} 失败: {e}")
-                    return None, id_value, alias
+                    return None, None, id_value, alias
 
-        return None, id_value, alias
+        return None, None, id_value, alias
+
+    def _process_payload(
+        self,
+        id_value: str,
+        content: bytes,
+        payload: Dict,
+        results: Dict,
+        failed_ids: List,
+    ) -> None:
+        """
+        处理单个平台的响应
+
+        响应体摘要与上次相同时直接复用上次的解析结果，并记入 unchanged_ids；
+        否则解析并更新缓存。
+        """
+        if self.payload_cache is None:
+            self._parse_response(id_value, payload, results, failed_ids)
+            return
+
+        digest = payload_digest(content)
+        cached = self.payload_cache.get(id_value)
+        if cached and cached[0] == digest:
+            results[id_value] = cached[1]
+            self.unchanged_ids.append(id_value)
+            return
+
+        self._parse_response(id_value, payload, results, failed_ids)
+        if id_value in results:
+            self.payload_cache.save(id_value, digest, results[id_value])
+
+    def _parse_response(
+        self,
+        id_value: str,
+        data: Dict,
+        results: Dict,
+        failed_ids: List,
+    ) -> None:
+        """解析单个平台已解码的响应并写入结果字典"""
+        try:
+            results[id_value] = {}
+
+            for index, item in enumerate(data.get("items", []), 1):
+                title = item.get("title")
+                # 跳过无效标题（None、float、空字符串）
+                if title is None or isinstance(title, float) or not str(title).strip():
+                    continue
+                title = str(title).strip()
+                url = item.get("url", "")
+                mobile_url = item.get("mobileUrl", "")
+
+                if title in results[id_value]:
+                    results[id_value][title]["ranks"].append(index)
+                else:
+                    results[id_value][title] = {
+                        "ranks": [index],
+                        "url": url,
+                        "mobileUrl": mobile_url,
+                    }
+        except Exception as e:
+            print(f"处理 {id_value} 数据出错: {e}")
+            failed_ids.append(id_value)
 
     def crawl_websites(
         self,
@@ -122,13 +487,33 @@ class DataFetcher:
         """
         爬取多个网站数据
 
+        max_workers > 1 时使用并发模式，否则按 request_interval 顺序爬取。
+
         Args:
             ids_list: 平台ID列表，每个元素可以是字符串或 (平台ID, 别名) 元组
-            request_interval: 请求间隔（毫秒）
+            request_interval: 请求间隔（毫秒），仅顺序模式使用
 
         Returns:
             (结果字典, ID到名称的映射, 失败ID列表) 元组
         """
+        with self._hedge_lock:
+            self.hedge_stats = {"sent": 0, "won": 0}
+        self.unchanged_ids = []
+
+        try:
+            if self.max_workers > 1 and len(ids_list) > 1:
+                return self._crawl_concurrent(ids_list)
+            return self._crawl_sequential(ids_list, request_interval)
+        finally:
+            if self.latency_tracker:
+                self.latency_tracker.flush()
+
+    def _crawl_sequential(
+        self,
+        ids_list: List[Union[str, Tuple[str, str]]],
+        request_interval: int,
+    ) -> Tuple[Dict, Dict, List]:
+        """顺序爬取（每个请求之间固定间隔）"""
         results = {}
         id_to_name = {}
         failed_ids = []
@@ -141,36 +526,10 @@ class DataFetcher:
                 name = id_value
 
             id_to_name[id_value] = name
-            response, _, _ = self.fetch_data(id_info)
-
-            if response:
-                try:
-                    data = json.loads(response)
-                    results[id_value] = {}
-
-                    for index, item in enumerate(data.get("items", []), 1):
-                        title = item.get("title")
-                        # 跳过无效标题（None、float、空字符串）
-                        if title is None or isinstance(title, float) or not str(title).strip():
-                            continue
-                        title = str(title).strip()
-                        url = item.get("url", "")
-                        mobile_url = item.get("mobileUrl", "")
-
-                        if title in results[id_value]:
-                            results[id_value][title]["ranks"].append(index)
-                        else:
-                            results[id_value][title] = {
-                                "ranks": [index],
-                                "url": url,
-                                "mobileUrl": mobile_url,
-                            }
-                except json.JSONDecodeError:
-                    print(f"解析 {id_value} 响应失败")
-                    failed_ids.append(id_value)
-                except Exception as e:
-                    print(f"处理 {id_value} 数据出错: {e}")
-                    failed_ids.append(id_value)
+            content, payload, _, _ = self._fetch_payload(id_info)
+
+            if payload is not None:
+                self._process_payload(id_value, content, payload, results, failed_ids)
             else:
                 failed_ids.append(id_value)
 
@@ -180,5 +539,108 @@ class DataFetcher:
                 actual_interval = max(50, actual_interval)
                 time.sleep(actual_interval / 1000)
 
+        self._print_summary(results, failed_ids)
+        return results, id_to_name, failed_ids
+
+    def _print_summary(self, results: Dict, failed_ids: List) -> None:
         print(f"成功: {list(results.keys())}, 失败: {failed_ids}")
+        if self.unchanged_ids:
+            print(f"响应与上次相同（复用解析结果）: {self.unchanged_ids}")
+
+    def _crawl_concurrent(
+        self,
+        ids_list: List[Union[str, Tuple[str, str]]],
+    ) -> Tuple[Dict, Dict, List]:
+        """
+        并发爬取
+
+        - 线程池大小由 max_workers 控制
+        - 同一主机的并发请求数不超过 per_host_concurrency
+        - 全局限速器替代固定的请求间隔
+        - 到达截止时间后未完成、或任务异常的平台计入失败列表
+        """
+        id_to_name = {}
+        order = []
+        for id_info in ids_list:
+            if isinstance(id_info, tuple):
+                id_value, name = id_info
+            else:
+                id_value = id_info
+                name = id_value
+            id_to_name[id_value] = name
+            order.append(id_value)
+
+        deadline = None
+        if self.crawl_deadline > 0:
+            deadline = time.monotonic() + self.crawl_deadline
+
+        limiter = RateLimiter(self.rate_limit)
+        semaphore = self._get_host_semaphore(self.api_url)
+
+        def task(id_info):
+            with semaphore:
+                if not limiter.acquire(deadline):
+                    id_value = id_info[0] if isinstance(id_info, tuple) else id_info
+                    print(f"请求 {id_value} 超出截止时间，跳过")
+                    return None, None, id_value, id_value
+                return self._fetch_payload(
+                    id_info, deadline=deadline, limiter=limiter, host_semaphore=semaphore
+                )
+
+        workers = min(self.max_workers, len(ids_list))
+        print(
+            f"并发爬取: 线程数 {workers}, 单主机并发 {self.per_host_concurrency}, "
+            f"限速 {self.rate_limit or '不限'}/秒, "
+            f"截止时间 {str(self.crawl_deadline) + '秒' if deadline else '不限'}"
+        )
+
+        responses: Dict[str, Tuple[Optional[bytes], Optional[Dict]]] = {}
+        errored = []
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            future_ids = {
+                executor.submit(task, id_info): id_value
+                for id_info, id_value in zip(ids_list, order)
+            }
+            pending = set(future_ids)
+            while pending:
+                timeout = None
+                if deadline is not None:
+                    timeout = max(0.0, deadline - time.monotonic())
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    # 到达截止时间，剩余任务全部放弃
+                    break
+                for future in done:
+                    try:
+                        content, payload, id_value, _ = future.result()
+                    except Exception as e:
+                        print(f"爬取任务异常 {future_ids[future]}: {e}")
+                        errored.append(future_ids[future])
+                        continue
+                    responses[id_value] = (content, payload)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        # 按配置顺序组装结果，保证输出稳定
+        results = {}
+        failed_ids = []
+        timed_out = []
+        for id_value in order:
+            if id_value in errored:
+                failed_ids.append(id_value)
+                continue
+            if id_value not in responses:
+                timed_out.append(id_value)
+                failed_ids.append(id_value)
+                continue
+            content, payload = responses[id_value]
+            if payload is not None:
+                self._process_payload(id_value, content, payload, results, failed_ids)
+            else:
+                failed_ids.append(id_value)
+
+        if timed_out:
+            print(f"超出截止时间未完成: {timed_out}")
+        self._print_summary(results, failed_ids)
         return results, id_to_name, failed_ids
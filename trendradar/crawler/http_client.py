@@ -0,0 +1,174 @@
+# coding=utf-8
+"""
+HTTP 客户端模块
+
+为所有抓取器提供统一的 HTTP 连接层，支持：
+- 基于 requests.Session 的长连接复用（连接池）
+- 按主机单独配置连接池大小
+- 统一的代理配置（相同代理共享同一个客户端）
+- 连接池命中 / 新建连接（握手）计数
+"""
+
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# 默认连接池参数
+DEFAULT_POOL_CONNECTIONS = 20   # 缓存的主机连接池数量
+DEFAULT_POOL_MAXSIZE = 10       # 每个主机连接池的最大连接数
+
+
+class HTTPClient:
+    """
+    共享 HTTP 客户端
+
+    线程安全地复用同一个 Session，同一主机的重复请求会复用已建立的连接，
+    避免每次请求都重新进行 TCP + TLS 握手。
+    """
+
+    def __init__(
+        self,
+        proxy_url: Optional[str] = None,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        host_pool_sizes: Optional[Dict[str, int]] = None,
+    ):
+        """
+        初始化 HTTP 客户端
+
+        Args:
+            proxy_url: 代理服务器 URL（可选）
+            pool_connections: 缓存的主机连接池数量
+            pool_maxsize: 每个主机连接池的默认最大连接数
+            host_pool_sizes: 按主机覆盖连接池大小，如 {"newsnow.busiyi.world": 16}
+        """
+        self.proxy_url = proxy_url or None
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+
+        self._adapters = []
+        self._request_count = 0
+        self._lock = threading.Lock()
+
+        self.session = requests.Session()
+        default_adapter = self._new_adapter(pool_maxsize)
+        self.session.mount("http://", default_adapter)
+        self.session.mount("https://", default_adapter)
+
+        for host, size in (host_pool_sizes or {}).items():
+            self.set_host_pool_size(host, size)
+
+        if self.proxy_url:
+            self.session.proxies = {
+                "http": self.proxy_url,
+                "https": self.proxy_url,
+            }
+
+    def _new_adapter(self, pool_maxsize: int) -> HTTPAdapter:
+        """创建连接池适配器"""
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=pool_maxsize,
+        )
+        self._adapters.append(adapter)
+        return adapter
+
+    def set_host_pool_size(self, host: str, size: int) -> None:
+        """
+        为指定主机单独设置连接池大小
+
+        Args:
+            host: 主机名（可带端口）
+            size: 最大连接数
+        """
+        if not host or size <= 0:
+            return
+        adapter = self._new_adapter(size)
+        self.session.mount(f"http://{host}/", adapter)
+        self.session.mount(f"https://{host}/", adapter)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """发送请求（参数与 requests.Session.request 一致）"""
+        with self._lock:
+            self._request_count += 1
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """发送 GET 请求"""
+        return self.request("GET", url, **kwargs)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        获取连接统计
+
+        Returns:
+            {
+                "requests": 请求总数,
+                "handshakes": 新建连接数（TCP/TLS 握手次数）,
+                "pool_hits": 复用已有连接的请求数,
+                "pools": 当前主机连接池数量,
+            }
+        """
+        handshakes = 0
+        pooled_requests = 0
+        pools = 0
+
+        for adapter in self._adapters:
+            managers = [adapter.poolmanager] + list(adapter.proxy_manager.values())
+            for manager in managers:
+                if manager is None:
+                    continue
+                for key in list(manager.pools.keys()):
+                    pool = manager.pools.get(key)
+                    if pool is None:
+                        continue
+                    pools += 1
+                    handshakes += getattr(pool, "num_connections", 0)
+                    pooled_requests += getattr(pool, "num_requests", 0)
+
+        return {
+            "requests": self._request_count,
+            "handshakes": handshakes,
+            "pool_hits": max(0, pooled_requests - handshakes),
+            "pools": pools,
+        }
+
+    def close(self) -> None:
+        """关闭所有连接"""
+        self.session.close()
+
+
+# 按代理地址缓存的共享客户端
+_clients: Dict[Optional[str], HTTPClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_http_client(proxy_url: Optional[str] = None, **kwargs) -> HTTPClient:
+    """
+    获取共享 HTTP 客户端（相同代理配置复用同一实例）
+
+    Args:
+        proxy_url: 代理服务器 URL（可选）
+        **kwargs: 首次创建时传给 HTTPClient 的参数
+
+    Returns:
+        HTTPClient 实例
+    """
+    key = proxy_url or None
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = HTTPClient(proxy_url=key, **kwargs)
+            _clients[key] = client
+        return client
+
+
+def close_http_clients() -> None:
+    """关闭并清空所有共享客户端"""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
@@ -0,0 +1,148 @@
+# coding=utf-8
+"""
+平台请求延迟跟踪模块
+
+按平台 ID 持久化最近 N 次成功请求的延迟（滚动窗口），用于：
+- 对冲请求：超过该平台 p95 延迟仍未返回时，发送一个重复请求，取先返回者
+- 延迟预算：按平台历史延迟收紧单次请求超时，避免慢请求拖长整轮抓取
+
+延迟数据跨天保留，存放在热榜日库同目录（如 output/news/crawl_latency.db）。
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+class LatencyTracker:
+    """
+    平台延迟滚动窗口（线程安全）
+
+    启动时一次性加载历史样本，运行期间只在内存中记录，
+    flush() 时批量写回 SQLite 并裁剪超出窗口的旧样本。
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        window: int = 100,
+        min_samples: int = 10,
+        percentile: float = 0.95,
+    ):
+        """
+        初始化跟踪器
+
+        Args:
+            db_path: SQLite 文件路径
+            window: 每个平台保留的样本数
+            min_samples: 样本数达到该值后才给出 p95 / 预算
+            percentile: 触发对冲的延迟分位数
+        """
+        self.db_path = Path(db_path)
+        self.window = max(1, window)
+        self.min_samples = max(1, min_samples)
+        self.percentile = percentile
+
+        self._lock = threading.Lock()
+        self._samples: Dict[str, List[float]] = {}
+        self._pending: List[Tuple[str, float, int]] = []
+
+        self._load()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path))
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS crawl_latency (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                platform_id TEXT NOT NULL,
+                latency_ms REAL NOT NULL,
+                hedged INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_crawl_latency_platform
+            ON crawl_latency(platform_id, id)
+        """)
+        return conn
+
+    def _load(self) -> None:
+        """加载每个平台最近 window 个样本"""
+        try:
+            conn = self._connect()
+            try:
+                rows = conn.execute("""
+                    SELECT platform_id, latency_ms FROM (
+                        SELECT platform_id, latency_ms, id,
+                               ROW_NUMBER() OVER (
+                                   PARTITION BY platform_id ORDER BY id DESC
+                               ) AS rn
+                        FROM crawl_latency
+                    )
+                    WHERE rn <= ?
+                    ORDER BY id
+                """, (self.window,)).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[延迟] 加载历史延迟失败: {e}")
+            return
+
+        for platform_id, latency_ms in rows:
+            self._samples.setdefault(platform_id, []).append(latency_ms)
+
+    def record(self, platform_id: str, latency_ms: float, hedged: bool = False) -> None:
+        """记录一次成功请求的延迟"""
+        with self._lock:
+            samples = self._samples.setdefault(platform_id, [])
+            samples.append(latency_ms)
+            if len(samples) > self.window:
+                del samples[:-self.window]
+            self._pending.append((platform_id, latency_ms, int(hedged)))
+
+    def get_percentile(self, platform_id: str) -> Optional[float]:
+        """
+        获取平台的分位数延迟（秒）
+
+        Returns:
+            样本不足时返回 None
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(platform_id, []))
+        if len(samples) < self.min_samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * self.percentile))
+        return samples[index] / 1000
+
+    def flush(self) -> None:
+        """将本轮新增样本写回 SQLite，并裁剪每个平台超出窗口的旧样本"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        try:
+            conn = self._connect()
+            try:
+                conn.executemany("""
+                    INSERT INTO crawl_latency (platform_id, latency_ms, hedged)
+                    VALUES (?, ?, ?)
+                """, pending)
+                conn.execute("""
+                    DELETE FROM crawl_latency WHERE id IN (
+                        SELECT id FROM (
+                            SELECT id, ROW_NUMBER() OVER (
+                                PARTITION BY platform_id ORDER BY id DESC
+                            ) AS rn
+                            FROM crawl_latency
+                        )
+                        WHERE rn > ?
+                    )
+                """, (self.window,))
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[延迟] 保存延迟数据失败: {e}")
@@ -0,0 +1,86 @@
+# coding=utf-8
+"""
+热榜响应去重缓存
+
+按平台持久化上一次响应体的摘要和解析结果：
+- 响应体摘要与上次一致时（NewsNow 返回 status == "cache" 时很常见），
+  直接复用上次的解析结果，跳过逐条解析
+- 存储层据此走快速路径，整体刷新该平台上次的榜单，不再逐条查询和更新
+
+默认存放在热榜日库同目录（如 output/news/crawl_cache.db），跨天保留。
+"""
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from trendradar.utils import fast_json
+
+
+def payload_digest(content: bytes) -> str:
+    """计算响应体摘要"""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+class PayloadCache:
+    """
+    平台响应摘要缓存（SQLite，线程安全）
+    """
+
+    def __init__(self, db_path: str):
+        """
+        初始化缓存
+
+        Args:
+            db_path: SQLite 文件路径
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS news_payload_cache (
+                platform_id TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                results_json TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, platform_id: str) -> Optional[Tuple[str, Dict]]:
+        """
+        获取平台上次的响应摘要和解析结果
+
+        Returns:
+            (摘要, {标题: {"ranks", "url", "mobileUrl"}})，不存在时返回 None
+        """
+        with self._lock:
+            row = self._conn.execute("""
+                SELECT digest, results_json FROM news_payload_cache
+                WHERE platform_id = ?
+            """, (platform_id,)).fetchone()
+
+        if not row:
+            return None
+        try:
+            return row[0], fast_json.loads(row[1])
+        except ValueError:
+            return None
+
+    def save(self, platform_id: str, digest: str, results: Dict) -> None:
+        """保存平台本次的响应摘要和解析结果"""
+        with self._lock:
+            self._conn.execute("""
+                INSERT OR REPLACE INTO news_payload_cache
+                (platform_id, digest, results_json, updated_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            """, (platform_id, digest, fast_json.dumps(results)))
+            self._conn.commit()
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
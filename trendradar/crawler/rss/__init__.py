@@ -7,5 +7,14 @@ RSS 抓取模块
 
 from .parser import RSSParser
 from .fetcher import RSSFetcher, RSSFeedConfig
+from .cache import RSSValidatorStore, FeedValidator
+from .mirrors import MirrorHealthTracker
 
-__all__ = ["RSSParser", "RSSFetcher", "RSSFeedConfig"]
+__all__ = [
+    "RSSParser",
+    "RSSFetcher",
+    "RSSFeedConfig",
+    "RSSValidatorStore",
+    "FeedValidator",
+    "MirrorHealthTracker",
+]
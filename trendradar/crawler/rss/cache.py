@@ -0,0 +1,133 @@
+# coding=utf-8
+"""
+RSS 条件请求缓存
+
+按源持久化 HTTP 校验信息（ETag / Last-Modified）和上次解析结果：
+- 请求时附带 If-None-Match / If-Modified-Since
+- 服务器返回 304 时直接复用上次解析的条目，跳过下载和解析
+"""
+
+import json
+import sqlite3
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .parser import ParsedRSSItem
+
+
+@dataclass
+class FeedValidator:
+    """单个源的校验信息"""
+    feed_id: str
+    url: str                      # 产生该校验信息的实际请求 URL
+    etag: str = ""
+    last_modified: str = ""
+    body_bytes: int = 0           # 上次完整响应体大小（字节）
+    parse_ms: float = 0.0         # 上次解析耗时（毫秒）
+    items: Optional[List[ParsedRSSItem]] = None
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        构建条件请求头
+
+        仅当校验信息来自同一 URL 时才附带（RSSHub 换镜像后不复用）
+        """
+        if url != self.url:
+            return {}
+
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class RSSValidatorStore:
+    """
+    RSS 校验信息存储（SQLite）
+
+    默认存放在 RSS 日库同目录（如 output/rss/feed_cache.db），
+    跨天保留，线程安全。
+    """
+
+    def __init__(self, db_path: str):
+        """
+        初始化存储
+
+        Args:
+            db_path: SQLite 文件路径
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS rss_feed_validators (
+                feed_id TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT DEFAULT '',
+                last_modified TEXT DEFAULT '',
+                body_bytes INTEGER DEFAULT 0,
+                parse_ms REAL DEFAULT 0,
+                items_json TEXT DEFAULT '[]',
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, feed_id: str) -> Optional[FeedValidator]:
+        """获取源的校验信息，不存在时返回 None"""
+        with self._lock:
+            row = self._conn.execute("""
+                SELECT url, etag, last_modified, body_bytes, parse_ms, items_json
+                FROM rss_feed_validators WHERE feed_id = ?
+            """, (feed_id,)).fetchone()
+
+        if not row:
+            return None
+
+        try:
+            items = [ParsedRSSItem(**item) for item in json.loads(row[5] or "[]")]
+        except (ValueError, TypeError):
+            return None
+
+        return FeedValidator(
+            feed_id=feed_id,
+            url=row[0],
+            etag=row[1] or "",
+            last_modified=row[2] or "",
+            body_bytes=row[3] or 0,
+            parse_ms=row[4] or 0.0,
+            items=items,
+        )
+
+    def save(self, validator: FeedValidator) -> None:
+        """保存源的校验信息（无 ETag 和 Last-Modified 时删除旧记录）"""
+        with self._lock:
+            if not validator.etag and not validator.last_modified:
+                self._conn.execute(
+                    "DELETE FROM rss_feed_validators WHERE feed_id = ?",
+                    (validator.feed_id,),
+                )
+            else:
+                items_json = json.dumps(
+                    [asdict(item) for item in (validator.items or [])],
+                    ensure_ascii=False,
+                )
+                self._conn.execute("""
+                    INSERT OR REPLACE INTO rss_feed_validators
+                    (feed_id, url, etag, last_modified, body_bytes, parse_ms,
+                     items_json, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                """, (validator.feed_id, validator.url, validator.etag,
+                      validator.last_modified, validator.body_bytes,
+                      validator.parse_ms, items_json))
+            self._conn.commit()
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
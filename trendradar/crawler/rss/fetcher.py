@@ -7,13 +7,19 @@ RSS 抓取器
 
 import time
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple, Callable
+from urllib.parse import urlparse
 
 import requests
 
 from .parser import RSSParser, ParsedRSSItem
+from .cache import FeedValidator, RSSValidatorStore
+from .mirrors import MirrorHealthTracker
+from trendradar.crawler.http_client import HTTPClient, get_http_client
 from trendradar.storage.base import RSSItem, RSSData
 from trendradar.utils.time import get_configured_time, is_within_days, DEFAULT_TIMEZONE
 
@@ -32,6 +38,9 @@ class RSSFeedConfig:
 class RSSFetcher:
     """RSS 抓取器"""
 
+    # 流式读取块大小（字节）
+    STREAM_CHUNK_SIZE = 64 * 1024
+
     def __init__(
         self,
         feeds: List[RSSFeedConfig],
@@ -44,6 +53,10 @@ class RSSFetcher:
         default_max_age_days: int = 3,
         rsshub_base: str = "https://rsshub.app/",
         rsshub_mirrors: List[str] = None,
+        max_workers: int = 8,
+        validator_store: Optional[RSSValidatorStore] = None,
+        mirror_tracker: Optional[MirrorHealthTracker] = None,
+        streaming: bool = True,
     ):
         """
         初始化抓取器
@@ -59,6 +72,10 @@ class RSSFetcher:
             default_max_age_days: 默认最大文章年龄（天）
             rsshub_base: RSSHub 服务器基础 URL（用于处理 rsshub:// 协议）
             rsshub_mirrors: RSSHub 备用镜像列表
+            max_workers: 并发抓取的主机数（同一主机内仍按 request_interval 顺序抓取）
+            validator_store: 条件请求缓存（可选，启用 ETag / Last-Modified）
+            mirror_tracker: RSSHub 镜像健康度跟踪器（可选，按健康度选择镜像）
+            streaming: 是否流式下载与解析（达到 max_items 后提前结束下载）
         """
         self.feeds = [f for f in feeds if f.enabled]
         self.request_interval = request_interval
@@ -68,6 +85,14 @@ class RSSFetcher:
         self.timezone = timezone
         self.freshness_enabled = freshness_enabled
         self.default_max_age_days = default_max_age_days
+        self.max_workers = max(1, int(max_workers or 1))
+        self.validator_store = validator_store
+        self.mirror_tracker = mirror_tracker
+        self.streaming = streaming
+
+        # 条件请求统计（每次 fetch_all 重置）
+        self.stats = {"not_modified": 0, "bytes_saved": 0, "parse_ms_saved": 0.0}
+        self._stats_lock = threading.Lock()
         
         # 初始化 RSSHub 镜像列表
         self.rsshub_mirrors = rsshub_mirrors or []
@@ -77,24 +102,86 @@ class RSSFetcher:
         self.rsshub_mirrors = [m.rstrip('/') + '/' for m in self.rsshub_mirrors]
 
         self.parser = RSSParser()
-        self.session = self._create_session()
-
-    def _create_session(self) -> requests.Session:
-        """创建请求会话"""
-        session = requests.Session()
-        session.headers.update({
+        self.headers = {
             "User-Agent": "TrendRadar/2.0 RSS Reader (https://github.com/trendradar)",
             "Accept": "application/feed+json, application/json, application/rss+xml, application/atom+xml, application/xml, text/xml, */*",
             "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-        })
+        }
+        self.http = self._create_client()
+
+    def _create_client(self) -> HTTPClient:
+        """获取共享 HTTP 客户端（按代理配置复用连接池）"""
+        proxy_url = self.proxy_url if self.use_proxy and self.proxy_url else None
+        return get_http_client(proxy_url)
 
-        if self.use_proxy and self.proxy_url:
-            session.proxies = {
-                "http": self.proxy_url,
-                "https": self.proxy_url,
-            }
+    def _get(
+        self,
+        url: str,
+        extra_headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """发送 GET 请求"""
+        headers = {**self.headers, **extra_headers} if extra_headers else self.headers
+        return self.http.get(url, headers=headers, timeout=self.timeout, stream=stream)
+
+    def _request_and_parse(
+        self,
+        feed: RSSFeedConfig,
+        url: str,
+        validator: Optional[FeedValidator],
+    ) -> List[ParsedRSSItem]:
+        """
+        请求并解析单个 URL（支持条件请求）
 
-        return session
+        服务器返回 304 时复用上次解析结果；否则解析并更新校验信息。
+        """
+        conditional_headers = validator.conditional_headers(url) if validator else {}
+        response = self._get(url, conditional_headers, stream=self.streaming)
+
+        try:
+            if response.status_code == 304 and conditional_headers:
+                with self._stats_lock:
+                    self.stats["not_modified"] += 1
+                    self.stats["bytes_saved"] += validator.body_bytes
+                    self.stats["parse_ms_saved"] += validator.parse_ms
+                print(f"[RSS] {feed.name}: 未变化（304），复用上次解析结果")
+                return list(validator.items or [])
+
+            response.raise_for_status()
+
+            start = time.perf_counter()
+            if self.streaming:
+                # 流式读取：边下载边解析，达到 max_items 后提前关闭连接
+                body_bytes = 0
+
+                def chunks():
+                    nonlocal body_bytes
+                    for chunk in response.iter_content(self.STREAM_CHUNK_SIZE):
+                        body_bytes += len(chunk)
+                        yield chunk
+
+                parsed_items = list(self.parser.parse_stream(
+                    chunks(), feed.url, max_items=feed.max_items, encoding=response.encoding,
+                ))
+            else:
+                parsed_items = self.parser.parse(response.text, feed.url)
+                body_bytes = len(response.content)
+            parse_ms = (time.perf_counter() - start) * 1000
+        finally:
+            response.close()
+
+        if self.validator_store is not None:
+            self.validator_store.save(FeedValidator(
+                feed_id=feed.id,
+                url=url,
+                etag=response.headers.get("ETag", ""),
+                last_modified=response.headers.get("Last-Modified", ""),
+                body_bytes=body_bytes,
+                parse_ms=parse_ms,
+                items=parsed_items,
+            ))
+
+        return parsed_items
 
     def _filter_by_freshness(
         self,
@@ -153,21 +240,27 @@ class RSSFetcher:
             feed_url = feed.url
             is_rsshub_url = feed_url.startswith('rsshub://')
             rsshub_path = feed_url[9:] if is_rsshub_url else ''
-            
-            # 如果是 rsshub:// 协议，尝试所有可用的镜像
+            validator = self.validator_store.get(feed.id) if self.validator_store else None
+
+            # 如果是 rsshub:// 协议，按健康度依次尝试可用的镜像
             if is_rsshub_url:
                 errors = []
-                for mirror in self.rsshub_mirrors:
+                mirrors = self.rsshub_mirrors
+                if self.mirror_tracker:
+                    mirrors = self.mirror_tracker.order_mirrors(mirrors)
+                for mirror in mirrors:
                     try:
                         current_url = mirror + rsshub_path
-                        response = self.session.get(current_url, timeout=self.timeout)
-                        response.raise_for_status()
-                        
-                        # 如果成功，处理响应
-                        parsed_items = self.parser.parse(response.text, feed.url)
+                        start = time.perf_counter()
+                        parsed_items = self._request_and_parse(feed, current_url, validator)
+                        if self.mirror_tracker:
+                            latency_ms = (time.perf_counter() - start) * 1000
+                            self.mirror_tracker.record_success(mirror, latency_ms)
                         break
                     except requests.RequestException as e:
                         errors.append(f"{mirror}: {e}")
+                        if self.mirror_tracker:
+                            self.mirror_tracker.record_failure(mirror, str(e))
                 else:
                     # 所有镜像都尝试失败
                     error = f"所有 RSSHub 镜像请求失败: {'; '.join(errors)}"
@@ -175,9 +268,7 @@ class RSSFetcher:
                     return [], error
             else:
                 # 普通 URL，直接请求
-                response = self.session.get(feed_url, timeout=self.timeout)
-                response.raise_for_status()
-                parsed_items = self.parser.parse(response.text, feed.url)
+                parsed_items = self._request_and_parse(feed, feed_url, validator)
 
             # 限制条目数量（0=不限制）
             if feed.max_items > 0:
@@ -229,10 +320,40 @@ class RSSFetcher:
             print(f"[RSS] {feed.name}: {error}")
             return [], error
 
+    def _get_host_key(self, feed: RSSFeedConfig) -> str:
+        """
+        获取源的礼貌调度分组键
+
+        rsshub:// 源统一归入 RSSHub 镜像分组（按镜像列表依次请求），
+        其余源按 URL 主机名分组。
+        """
+        if feed.url.startswith('rsshub://'):
+            return "rsshub"
+        return urlparse(feed.url).netloc.lower() or feed.url
+
+    def _fetch_host_group(
+        self,
+        feeds: List[RSSFeedConfig],
+    ) -> Dict[str, Tuple[List[RSSItem], Optional[str]]]:
+        """顺序抓取同一主机下的源，源之间保持请求间隔"""
+        results = {}
+        for i, feed in enumerate(feeds):
+            # 请求间隔（带随机波动）
+            if i > 0:
+                interval = self.request_interval / 1000
+                jitter = random.uniform(-0.2, 0.2) * interval
+                time.sleep(interval + jitter)
+
+            results[feed.id] = self.fetch_feed(feed)
+        return results
+
     def fetch_all(self) -> RSSData:
         """
         抓取所有 RSS 源
 
+        不同主机的源并发抓取，同一主机（或同一 RSSHub 镜像）内的源
+        按 request_interval 顺序抓取。
+
         Returns:
             RSSData 对象
         """
@@ -245,16 +366,33 @@ class RSSFetcher:
         crawl_time = now.strftime("%H:%M")
         crawl_date = now.strftime("%Y-%m-%d")
 
-        print(f"[RSS] 开始抓取 {len(self.feeds)} 个 RSS 源...")
+        with self._stats_lock:
+            self.stats = {"not_modified": 0, "bytes_saved": 0, "parse_ms_saved": 0.0}
 
-        for i, feed in enumerate(self.feeds):
-            # 请求间隔（带随机波动）
-            if i > 0:
-                interval = self.request_interval / 1000
-                jitter = random.uniform(-0.2, 0.2) * interval
-                time.sleep(interval + jitter)
+        # 后台探测冷却期已结束的熔断镜像
+        if self.mirror_tracker:
+            self.mirror_tracker.start_probe(self.rsshub_mirrors, self.http, self.timeout)
 
-            items, error = self.fetch_feed(feed)
+        # 按主机分组
+        host_groups: Dict[str, List[RSSFeedConfig]] = {}
+        for feed in self.feeds:
+            host_groups.setdefault(self._get_host_key(feed), []).append(feed)
+
+        workers = min(self.max_workers, len(host_groups)) or 1
+        print(f"[RSS] 开始抓取 {len(self.feeds)} 个 RSS 源（{len(host_groups)} 个主机，并发 {workers}）...")
+
+        fetch_results: Dict[str, Tuple[List[RSSItem], Optional[str]]] = {}
+        if workers <= 1:
+            for group in host_groups.values():
+                fetch_results.update(self._fetch_host_group(group))
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for group_results in executor.map(self._fetch_host_group, host_groups.values()):
+                    fetch_results.update(group_results)
+
+        # 按配置顺序组装结果
+        for feed in self.feeds:
+            items, error = fetch_results.get(feed.id, ([], "未抓取"))
 
             id_to_name[feed.id] = feed.name
 
@@ -265,6 +403,12 @@ class RSSFetcher:
 
         total_items = sum(len(items) for items in all_items.values())
         print(f"[RSS] 抓取完成: {len(all_items)} 个源成功, {len(failed_ids)} 个失败, 共 {total_items} 条")
+        if self.stats["not_modified"]:
+            print(
+                f"[RSS] 条件请求: {self.stats['not_modified']} 个源未变化，"
+                f"节省下载 {self.stats['bytes_saved'] / 1024:.1f} KB，"
+                f"节省解析 {self.stats['parse_ms_saved']:.0f} ms"
+            )
 
         return RSSData(
             date=crawl_date,
@@ -353,4 +497,6 @@ class RSSFetcher:
             default_max_age_days=default_max_age_days,
             rsshub_base=rsshub_base,
             rsshub_mirrors=rsshub_mirrors,
+            max_workers=config.get("max_workers", 8),
+            streaming=config.get("streaming", True),
         )
@@ -0,0 +1,248 @@
+# coding=utf-8
+"""
+RSSHub 镜像健康度跟踪
+
+按镜像记录请求延迟与失败情况并持久化（与条件请求缓存同库），用于：
+- 选择最快的健康镜像
+- 熔断连续失败的镜像，冷却期内不再发送业务请求
+- 冷却期结束后由后台探测确认恢复，再重新启用
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class MirrorHealthTracker:
+    """
+    RSSHub 镜像健康度跟踪器（SQLite 持久化，线程安全）
+
+    熔断状态：
+    - closed: 正常参与选择
+    - open: 熔断中，业务请求跳过该镜像；冷却期结束后等待后台探测
+    """
+
+    # 延迟指数加权平均系数
+    EWMA_ALPHA = 0.3
+    # 尚无延迟数据的镜像按此延迟参与排序（毫秒）
+    UNKNOWN_LATENCY_MS = 1000.0
+
+    def __init__(
+        self,
+        db_path: str,
+        failure_threshold: int = 2,
+        cooldown_seconds: int = 600,
+        max_cooldown_seconds: int = 6 * 3600,
+    ):
+        """
+        初始化跟踪器
+
+        Args:
+            db_path: SQLite 文件路径
+            failure_threshold: 连续失败多少次后熔断
+            cooldown_seconds: 首次熔断冷却时间（秒），探测失败后翻倍
+            max_cooldown_seconds: 最长冷却时间（秒）
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+
+        self._lock = threading.Lock()
+        self._closed = False
+        self._probe_thread: Optional[threading.Thread] = None
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS rss_mirror_health (
+                mirror TEXT PRIMARY KEY,
+                latency_ms REAL,
+                success_count INTEGER DEFAULT 0,
+                failure_count INTEGER DEFAULT 0,
+                consecutive_failures INTEGER DEFAULT 0,
+                open_until REAL DEFAULT 0,
+                cooldown REAL DEFAULT 0,
+                last_error TEXT DEFAULT '',
+                last_success_at REAL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        self._conn.commit()
+
+    def _get_row(self, mirror: str) -> Optional[sqlite3.Row]:
+        return self._conn.execute(
+            "SELECT * FROM rss_mirror_health WHERE mirror = ?", (mirror,)
+        ).fetchone()
+
+    def is_open(self, mirror: str) -> bool:
+        """镜像是否处于熔断状态"""
+        with self._lock:
+            row = self._get_row(mirror)
+        return bool(row and row["open_until"] > 0)
+
+    def order_mirrors(self, mirrors: List[str]) -> List[str]:
+        """
+        按健康度排序镜像
+
+        未熔断的镜像按连续失败次数、平均延迟升序（相同则保持配置顺序）；
+        若全部熔断，则按配置顺序全部返回作为兜底。
+        """
+        with self._lock:
+            rows = {m: self._get_row(m) for m in mirrors}
+
+        healthy = []
+        for index, mirror in enumerate(mirrors):
+            row = rows[mirror]
+            if row and row["open_until"] > 0:
+                continue
+            latency = row["latency_ms"] if row and row["latency_ms"] is not None else self.UNKNOWN_LATENCY_MS
+            failures = row["consecutive_failures"] if row else 0
+            healthy.append((failures, latency, index, mirror))
+
+        if not healthy:
+            return list(mirrors)
+
+        healthy.sort()
+        return [item[-1] for item in healthy]
+
+    def record_success(self, mirror: str, latency_ms: float) -> None:
+        """记录一次成功请求，并关闭熔断"""
+        with self._lock:
+            if self._closed:
+                return
+            row = self._get_row(mirror)
+            if row and row["latency_ms"] is not None:
+                latency_ms = self.EWMA_ALPHA * latency_ms + (1 - self.EWMA_ALPHA) * row["latency_ms"]
+            self._conn.execute("""
+                INSERT INTO rss_mirror_health
+                (mirror, latency_ms, success_count, consecutive_failures,
+                 open_until, cooldown, last_success_at, updated_at)
+                VALUES (?, ?, 1, 0, 0, 0, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(mirror) DO UPDATE SET
+                    latency_ms = excluded.latency_ms,
+                    success_count = success_count + 1,
+                    consecutive_failures = 0,
+                    open_until = 0,
+                    cooldown = 0,
+                    last_success_at = excluded.last_success_at,
+                    updated_at = CURRENT_TIMESTAMP
+            """, (mirror, latency_ms, time.time()))
+            self._conn.commit()
+
+    def record_failure(self, mirror: str, error: str = "") -> None:
+        """记录一次失败请求，连续失败达到阈值时熔断"""
+        with self._lock:
+            if self._closed:
+                return
+            row = self._get_row(mirror)
+            consecutive = (row["consecutive_failures"] if row else 0) + 1
+            open_until = row["open_until"] if row else 0
+            cooldown = row["cooldown"] if row else 0
+
+            if consecutive >= self.failure_threshold:
+                # 已熔断（探测失败）则冷却时间翻倍
+                if open_until > 0 and cooldown > 0:
+                    cooldown = min(cooldown * 2, self.max_cooldown_seconds)
+                else:
+                    cooldown = self.cooldown_seconds
+                open_until = time.time() + cooldown
+                if not row or row["open_until"] == 0:
+                    print(f"[RSS] 镜像 {mirror} 连续失败 {consecutive} 次，暂停使用 {cooldown:.0f} 秒")
+
+            self._conn.execute("""
+                INSERT INTO rss_mirror_health
+                (mirror, failure_count, consecutive_failures, open_until,
+                 cooldown, last_error, updated_at)
+                VALUES (?, 1, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(mirror) DO UPDATE SET
+                    failure_count = failure_count + 1,
+                    consecutive_failures = excluded.consecutive_failures,
+                    open_until = excluded.open_until,
+                    cooldown = excluded.cooldown,
+                    last_error = excluded.last_error,
+                    updated_at = CURRENT_TIMESTAMP
+            """, (mirror, consecutive, open_until, cooldown, str(error)[:200]))
+            self._conn.commit()
+
+    def get_probe_candidates(self, mirrors: List[str]) -> List[str]:
+        """获取冷却期已结束、等待探测的熔断镜像"""
+        now = time.time()
+        with self._lock:
+            rows = {m: self._get_row(m) for m in mirrors}
+        return [
+            m for m, row in rows.items()
+            if row and 0 < row["open_until"] <= now
+        ]
+
+    def start_probe(self, mirrors: List[str], http_client, timeout: int = 10) -> None:
+        """
+        后台探测冷却期已结束的熔断镜像
+
+        探测成功则关闭熔断；失败则延长冷却时间。
+
+        Args:
+            mirrors: 镜像列表
+            http_client: HTTPClient 实例
+            timeout: 探测超时（秒）
+        """
+        candidates = self.get_probe_candidates(mirrors)
+        if not candidates:
+            return
+        if self._probe_thread and self._probe_thread.is_alive():
+            return
+
+        def probe():
+            for mirror in candidates:
+                start = time.perf_counter()
+                try:
+                    response = http_client.get(mirror, timeout=timeout)
+                    if response.status_code >= 500:
+                        raise ValueError(f"HTTP {response.status_code}")
+                    latency_ms = (time.perf_counter() - start) * 1000
+                    self.record_success(mirror, latency_ms)
+                    print(f"[RSS] 镜像 {mirror} 探测恢复（{latency_ms:.0f} ms）")
+                except Exception as e:
+                    self.record_failure(mirror, f"探测失败: {e}")
+
+        self._probe_thread = threading.Thread(target=probe, name="rss-mirror-probe", daemon=True)
+        self._probe_thread.start()
+
+    def get_stats(self) -> List[Dict]:
+        """获取所有镜像的健康统计"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM rss_mirror_health ORDER BY mirror"
+            ).fetchall()
+
+        now = time.time()
+        stats = []
+        for row in rows:
+            total = row["success_count"] + row["failure_count"]
+            stats.append({
+                "mirror": row["mirror"],
+                "state": "open" if row["open_until"] > 0 else "closed",
+                "avg_latency_ms": round(row["latency_ms"], 1) if row["latency_ms"] is not None else None,
+                "success_count": row["success_count"],
+                "failure_count": row["failure_count"],
+                "success_rate": round(row["success_count"] / total, 3) if total else None,
+                "consecutive_failures": row["consecutive_failures"],
+                "retry_in_seconds": max(0, int(row["open_until"] - now)) if row["open_until"] > 0 else 0,
+                "last_error": row["last_error"] or "",
+            })
+        return stats
+
+    def close(self, wait_probe: float = 5.0) -> None:
+        """
+        关闭跟踪器
+
+        Args:
+            wait_probe: 等待后台探测结束的最长时间（秒）
+        """
+        if self._probe_thread and self._probe_thread.is_alive():
+            self._probe_thread.join(timeout=wait_probe)
+        with self._lock:
+            self._closed = True
+            self._conn.close()
@@ -8,9 +8,11 @@ RSS 解析器
 import re
 import html
 import json
+import itertools
+import xml.etree.ElementTree as ET
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Iterator
 from email.utils import parsedate_to_datetime
 
 try:
@@ -20,6 +22,14 @@ except ImportError:
     HAS_FEEDPARSER = False
     feedparser = None
 
+from .stream import (
+    is_streamable_encoding,
+    iter_json_items,
+    iter_xml_entries,
+    sniff_format,
+    sniff_xml_encoding,
+)
+
 
 @dataclass
 class ParsedRSSItem:
@@ -80,6 +90,111 @@ class RSSParser:
 
         return items
 
+    def parse_stream(
+        self,
+        chunks: Iterable[bytes],
+        feed_url: str = "",
+        max_items: int = 0,
+        encoding: Optional[str] = None,
+    ) -> Iterator[ParsedRSSItem]:
+        """
+        流式解析 RSS/Atom/JSON Feed 内容
+
+        按块读取数据并逐条产出条目，达到 max_items 后立即停止读取。
+        XML 在产出第一条之前解析失败（如包含未声明实体）时，
+        回退到 feedparser 整体解析；XML 声明为 gbk 等多字节编码时直接整体解析。
+
+        Args:
+            chunks: 响应内容块（bytes）
+            feed_url: Feed URL（用于错误提示）
+            max_items: 最大条目数（0=不限制）
+            encoding: 响应声明的编码（回退整体解析时使用）
+
+        Yields:
+            解析后的条目
+        """
+        chunk_iter = iter(chunks)
+
+        # 读取开头，判断格式
+        head = b""
+        fmt = None
+        for chunk in chunk_iter:
+            head += chunk
+            if head.strip():
+                fmt = sniff_format(head)
+                break
+
+        limit = max_items if max_items > 0 else None
+
+        declared_encoding = None
+        if fmt == "xml":
+            # 读到完整的 XML 声明（第一个 >）后再判断编码
+            while b">" not in head and len(head) < 1024:
+                chunk = next(chunk_iter, None)
+                if chunk is None:
+                    break
+                head += chunk
+            declared_encoding = sniff_xml_encoding(head)
+
+        if fmt == "json":
+            items = (
+                self._parse_streamed_json_item(item_data)
+                for item_data in iter_json_items(itertools.chain([head], chunk_iter))
+            )
+            yield from itertools.islice((item for item in items if item), limit)
+            return
+
+        if fmt == "xml" and is_streamable_encoding(declared_encoding):
+            # 产出第一条之前保留原始数据，用于解析失败时回退
+            retained: Optional[List[bytes]] = [head]
+
+            def source():
+                yield head
+                for chunk in chunk_iter:
+                    if retained is not None:
+                        retained.append(chunk)
+                    yield chunk
+
+            count = 0
+            try:
+                for entry in iter_xml_entries(source()):
+                    retained = None
+                    item = self._parse_entry(entry)
+                    if not item:
+                        continue
+                    yield item
+                    count += 1
+                    if limit and count >= limit:
+                        return
+                return
+            except (ET.ParseError, ValueError) as e:
+                # ValueError: 解析器不支持的编码等
+                if retained is None:
+                    print(f"[RSS] 流式解析中断 ({feed_url}): {e}，保留已解析的 {count} 条")
+                    return
+                head = b"".join(retained)
+
+        # 无法流式处理，读取全部内容后整体解析
+        raw = head + b"".join(chunk_iter)
+        content = None
+        for candidate in (declared_encoding, encoding, "utf-8"):
+            if not candidate:
+                continue
+            try:
+                content = raw.decode(candidate, errors="replace")
+                break
+            except LookupError:
+                continue
+        yield from itertools.islice(self.parse(content, feed_url), limit)
+
+    def _parse_streamed_json_item(self, item_data: Any) -> Optional[ParsedRSSItem]:
+        """解析流式读取的 JSON 条目（自动区分 Reportify 与 JSON Feed）"""
+        if not isinstance(item_data, dict):
+            return None
+        if "report" in item_data or "report_title" in item_data:
+            return self._parse_reportify_item(item_data)
+        return self._parse_json_feed_item(item_data)
+
     def _is_json_feed(self, content: str) -> bool:
         """
         检测内容是否为 JSON Feed 格式
@@ -0,0 +1,387 @@
+# coding=utf-8
+"""
+RSS 流式解析
+
+按块读取响应并逐条产出条目，不在内存中构建完整文档：
+- XML（RSS 2.0 / RSS 1.0 / Atom）：基于 xml.etree.ElementTree.XMLPullParser
+- JSON（JSON Feed / Reportify JSON）：定位顶层 items 数组后逐个解码元素
+
+产出的中间结构与 feedparser 条目 / JSON 条目字典一致，
+由 RSSParser 复用原有的条目解析逻辑转换为 ParsedRSSItem。
+"""
+
+import codecs
+import json
+import re
+import xml.etree.ElementTree as ET
+from html.entities import name2codepoint
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+# 常用命名空间 -> feedparser 风格的前缀
+_NAMESPACE_PREFIXES = {
+    "http://www.w3.org/2005/Atom": "",
+    "http://purl.org/rss/1.0/": "",
+    "http://purl.org/dc/elements/1.1/": "dc_",
+    "http://purl.org/rss/1.0/modules/content/": "content_",
+}
+
+# 条目元素（本地名）
+_ENTRY_TAGS = {"item", "entry"}
+
+# XML 预定义实体之外的 HTML 命名实体（如 &nbsp;），expat 会视为格式错误
+_HTML_ENTITY_RE = re.compile(rb"&([A-Za-z][A-Za-z0-9]{1,31});")
+_XML_ENTITIES = {b"amp", b"lt", b"gt", b"quot", b"apos"}
+# 跨块残留的未闭合实体最大长度
+_ENTITY_CARRY_LIMIT = 40
+
+
+def _local_name(tag: str) -> str:
+    """将 {namespace}tag 转换为 feedparser 风格的键名"""
+    if tag.startswith("{"):
+        namespace, _, name = tag[1:].partition("}")
+        prefix = _NAMESPACE_PREFIXES.get(namespace)
+        if prefix is None:
+            return ""
+        return prefix + name
+    return tag
+
+
+def _element_text(element: ET.Element) -> str:
+    """获取元素全部文本（含子元素，如 Atom type="xhtml" 内容）"""
+    return "".join(element.itertext()).strip()
+
+
+def _to_utc_struct(date_str: str):
+    """将 RFC 822 / ISO 8601 日期转换为 UTC time.struct_time（与 feedparser 一致）"""
+    dt = None
+    try:
+        dt = parsedate_to_datetime(date_str)
+    except (ValueError, TypeError, IndexError):
+        pass
+
+    if dt is None:
+        try:
+            dt = datetime.fromisoformat(date_str.strip().replace("Z", "+00:00"))
+        except (ValueError, TypeError):
+            return None
+
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return dt.timetuple()
+
+
+def _replace_entity(match: "re.Match") -> bytes:
+    name = match.group(1)
+    if name in _XML_ENTITIES:
+        return match.group(0)
+    codepoint = name2codepoint.get(name.decode("ascii"))
+    if codepoint is None:
+        return match.group(0)
+    return b"&#%d;" % codepoint
+
+
+def _normalize_html_entities(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """将 HTML 命名实体替换为数字字符引用（处理跨块边界的实体）"""
+    carry = b""
+    for chunk in chunks:
+        data = carry + chunk
+        carry = b""
+        amp = data.rfind(b"&")
+        if amp != -1 and b";" not in data[amp:] and len(data) - amp < _ENTITY_CARRY_LIMIT:
+            data, carry = data[:amp], data[amp:]
+        yield _HTML_ENTITY_RE.sub(_replace_entity, data)
+    if carry:
+        yield _HTML_ENTITY_RE.sub(_replace_entity, carry)
+
+
+def _build_xml_entry(element: ET.Element) -> Dict[str, Any]:
+    """将 item / entry 元素转换为 feedparser 风格的条目字典"""
+    entry: Dict[str, Any] = {}
+    links: List[Dict[str, str]] = []
+    authors: List[Dict[str, str]] = []
+
+    for child in element:
+        name = _local_name(child.tag)
+        if not name:
+            continue
+
+        if name == "link":
+            href = child.get("href")
+            if href:
+                # Atom: <link rel="alternate" href="..."/>
+                links.append({
+                    "href": href,
+                    "rel": child.get("rel", "alternate"),
+                    "type": child.get("type", ""),
+                })
+            elif child.text and child.text.strip():
+                entry.setdefault("link", child.text.strip())
+        elif name == "title":
+            entry["title"] = _element_text(child)
+        elif name in ("guid", "id"):
+            entry["id"] = _element_text(child)
+        elif name in ("pubDate", "published", "issued", "dc_date"):
+            entry.setdefault("published", _element_text(child))
+        elif name in ("updated", "modified"):
+            entry.setdefault("updated", _element_text(child))
+        elif name in ("description", "summary"):
+            entry.setdefault("summary", _element_text(child))
+        elif name in ("content", "content_encoded"):
+            entry.setdefault("content", [{"value": _element_text(child)}])
+        elif name == "author":
+            author_name = None
+            for sub in child:
+                if _local_name(sub.tag) == "name":
+                    author_name = _element_text(sub)
+                    break
+            if author_name:
+                authors.append({"name": author_name})
+            elif _element_text(child):
+                entry["author"] = _element_text(child)
+        elif name == "dc_creator":
+            entry.setdefault("dc_creator", _element_text(child))
+
+    if links:
+        entry["links"] = links
+        if "link" not in entry:
+            for link in links:
+                if link["rel"] == "alternate":
+                    entry["link"] = link["href"]
+                    break
+    if authors:
+        entry["authors"] = authors
+        if "author" not in entry:
+            entry["author"] = ", ".join(a["name"] for a in authors)
+
+    # 与 feedparser 一致：预先解析为 UTC struct_time
+    for key in ("published", "updated"):
+        if entry.get(key):
+            parsed = _to_utc_struct(entry[key])
+            if parsed:
+                entry[f"{key}_parsed"] = parsed
+
+    return entry
+
+
+def iter_xml_entries(chunks: Iterable[bytes]) -> Iterator[Dict[str, Any]]:
+    """
+    流式解析 XML 订阅源，逐条产出条目字典
+
+    每个条目解析完成后立即清理对应元素，保持内存占用平稳；
+    HTML 命名实体（如 &nbsp;）会先转换为数字字符引用。
+
+    Raises:
+        ET.ParseError: XML 格式错误
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack: List[ET.Element] = []
+    entry_depth = None
+
+    for chunk in _normalize_html_entities(chunks):
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if event == "start":
+                stack.append(element)
+                if entry_depth is None and _local_name(element.tag) in _ENTRY_TAGS:
+                    entry_depth = len(stack)
+                continue
+
+            # end 事件
+            is_entry = entry_depth is not None and len(stack) == entry_depth
+            stack.pop()
+            if is_entry:
+                yield _build_xml_entry(element)
+                entry_depth = None
+                # 从父元素中移除已处理的条目，保持内存平稳
+                element.clear()
+                if stack:
+                    stack[-1].remove(element)
+
+    parser.close()
+
+
+class JSONItemsStream:
+    """
+    流式提取 JSON 顶层 items 数组中的元素
+
+    只逐字符扫描 items 之前的顶层字段，进入 items 后使用
+    json.JSONDecoder.raw_decode 逐个解码元素，已消费的缓冲区随即丢弃。
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._buffer = ""
+        self._pos = 0
+        self._state = "seek"  # seek -> items -> done
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._last_string = None
+        self._current_key = None
+
+    @property
+    def done(self) -> bool:
+        return self._state == "done"
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """输入一块数据，返回本次解码出的完整元素"""
+        self._buffer += self._text_decoder.decode(chunk)
+        return self._drain()
+
+    def close(self) -> List[Any]:
+        """输入结束，校验 items 数组已完整"""
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        items = self._drain()
+        if self._state == "items":
+            raise ValueError("JSON items 数组不完整")
+        return items
+
+    def _drain(self) -> List[Any]:
+        items: List[Any] = []
+        if self._state == "seek":
+            self._scan_header()
+        if self._state == "items":
+            items = self._decode_items()
+        self._compact()
+        return items
+
+    def _scan_header(self) -> None:
+        """扫描顶层字段，直到遇到 items 数组起始"""
+        buffer = self._buffer
+        pos = self._pos
+        while pos < len(buffer):
+            char = buffer[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        try:
+                            self._last_string = json.loads(buffer[self._string_start:pos + 1])
+                        except ValueError:
+                            self._last_string = None
+                    self._string_start = None
+            elif char == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif char == ":" and self._depth == 1:
+                self._current_key = self._last_string
+            elif char == "," and self._depth == 1:
+                self._current_key = None
+            elif char in "{[":
+                if char == "[" and self._depth == 1 and self._current_key == "items":
+                    self._pos = pos + 1
+                    self._state = "items"
+                    return
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth <= 0:
+                    self._state = "done"
+                    self._pos = pos + 1
+                    return
+            pos += 1
+        self._pos = pos
+
+    def _decode_items(self) -> List[Any]:
+        """逐个解码 items 数组元素，数据不足时等待更多输入"""
+        items = []
+        buffer = self._buffer
+        pos = self._pos
+        while True:
+            while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] == ","):
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                pos += 1
+                self._state = "done"
+                break
+            try:
+                value, end = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # 元素尚未接收完整
+                break
+            items.append(value)
+            pos = end
+        self._pos = pos
+        return items
+
+    def _compact(self) -> None:
+        """丢弃已消费的缓冲区"""
+        keep_from = self._pos
+        if self._string_start is not None:
+            keep_from = min(keep_from, self._string_start)
+            self._string_start -= keep_from
+        if keep_from > 0:
+            self._buffer = self._buffer[keep_from:]
+            self._pos -= keep_from
+
+
+def iter_json_items(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    流式解析 JSON 订阅源，逐个产出顶层 items 数组元素
+
+    Raises:
+        ValueError: JSON 格式错误或 items 数组不完整
+    """
+    stream = JSONItemsStream()
+    for chunk in chunks:
+        for item in stream.feed(chunk):
+            yield item
+        if stream.done:
+            return
+    for item in stream.close():
+        yield item
+
+
+# XML 声明中的编码，如 <?xml version="1.0" encoding="gbk"?>
+_XML_ENCODING_RE = re.compile(rb"""^<\?xml[^>]*?\bencoding\s*=\s*["']([A-Za-z0-9._:-]+)["']""")
+
+# XMLPullParser（expat）可直接处理的编码；其他多字节编码（如 gbk、big5）会抛出 ValueError
+_STREAMABLE_ENCODINGS = {"utf-8", "ascii", "iso8859-1"}
+
+
+def sniff_xml_encoding(head: bytes) -> Optional[str]:
+    """
+    读取 XML 声明中的编码
+
+    Returns:
+        声明的编码名称（小写），未声明时返回 None
+    """
+    text = head.lstrip(codecs.BOM_UTF8).lstrip()
+    match = _XML_ENCODING_RE.match(text)
+    return match.group(1).decode("ascii").lower() if match else None
+
+
+def is_streamable_encoding(encoding: Optional[str]) -> bool:
+    """XML 声明的编码能否直接流式解析（未声明时按 UTF-8 处理）"""
+    if not encoding:
+        return True
+    try:
+        return codecs.lookup(encoding).name in _STREAMABLE_ENCODINGS
+    except LookupError:
+        return False
+
+
+def sniff_format(head: bytes) -> Optional[str]:
+    """
+    根据响应开头判断格式
+
+    Returns:
+        "json" / "xml"，无法判断时返回 None
+    """
+    text = head.lstrip(codecs.BOM_UTF8).lstrip()
+    if text.startswith(b"{"):
+        return "json"
+    if text.startswith(b"<"):
+        return "xml"
+    return None
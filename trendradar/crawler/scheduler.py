@@ -0,0 +1,130 @@
+# coding=utf-8
+"""
+自适应抓取调度模块
+
+根据各来源当天的内容变化频率决定本次运行是否抓取该来源：
+- 热榜：从 rank_history 统计新标题、排名变动、脱榜出现的抓取批次
+- RSS：从 rss_items.first_crawl_time 统计出现新条目的抓取批次
+
+变化频繁的来源（如微博热搜）每次运行都抓取，变化缓慢的来源按学习到的间隔降低抓取频率。
+部分抓取的结果照常合并写入当天的 SQLite。调度状态完全来自当天的数据库，无需额外存储。
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+
+def _time_to_minutes(time_str: str) -> Optional[int]:
+    """将抓取时间（HH-MM 或 HH:MM）转换为当天的分钟数"""
+    if not time_str:
+        return None
+    parts = time_str.replace(":", "-").split("-")
+    try:
+        return int(parts[0]) * 60 + int(parts[1])
+    except (ValueError, IndexError):
+        return None
+
+
+class AdaptiveScheduler:
+    """
+    按来源变化频率调度抓取
+
+    间隔估计：将内容变化视为泊松过程，若平均间隔 Δ 的抓取中有比例 p 观察到变化，
+    则变化速率 λ = -ln(1 - p) / Δ，抓取间隔取 1 / λ，并限制在 [min_interval, max_interval]。
+    """
+
+    # 定时任务存在抖动，距离到期不足该值（分钟）也视为到期
+    DUE_TOLERANCE_MINUTES = 5
+
+    def __init__(
+        self,
+        storage_manager,
+        min_interval: int = 30,
+        max_interval: int = 240,
+        min_samples: int = 4,
+    ):
+        """
+        初始化调度器
+
+        Args:
+            storage_manager: 存储管理器实例
+            min_interval: 最短抓取间隔（分钟）
+            max_interval: 最长抓取间隔（分钟）
+            min_samples: 当天成功抓取次数达到该值后才开始调整间隔
+        """
+        self.storage_manager = storage_manager
+        self.min_interval = max(1, int(min_interval))
+        self.max_interval = max(self.min_interval, int(max_interval))
+        self.min_samples = max(2, int(min_samples))
+
+    def compute_interval(self, stats: Optional[Dict]) -> int:
+        """
+        根据来源的变化统计计算抓取间隔
+
+        Args:
+            stats: get_source_change_stats 返回的单个来源统计
+
+        Returns:
+            抓取间隔（分钟）
+        """
+        if not stats or stats.get("crawls", 0) < self.min_samples:
+            return self.min_interval
+
+        first = _time_to_minutes(stats.get("first_time", ""))
+        last = _time_to_minutes(stats.get("last_time", ""))
+        gaps = stats["crawls"] - 1
+        if first is None or last is None or last <= first:
+            return self.min_interval
+
+        avg_gap = (last - first) / gaps
+        changes = stats.get("changes", 0)
+        if changes >= gaps:
+            return self.min_interval
+        if changes <= 0:
+            return self.max_interval
+
+        rate = -math.log(1 - changes / gaps) / avg_gap
+        interval = int(round(1 / rate))
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def select_due(
+        self,
+        source_ids: List[str],
+        crawl_time: str,
+        db_type: str = "news",
+    ) -> Tuple[List[str], Dict[str, int]]:
+        """
+        选出本次需要抓取的来源
+
+        当天尚未成功抓取过的来源、最近一次抓取失败的来源总是需要抓取。
+
+        Args:
+            source_ids: 配置的来源ID列表
+            crawl_time: 本次抓取时间（HH-MM 或 HH:MM）
+            db_type: 数据库类型（"news" 或 "rss"）
+
+        Returns:
+            (需要抓取的来源ID列表, {来源ID: 当前抓取间隔（分钟）})
+        """
+        stats = self.storage_manager.get_source_change_stats(db_type=db_type)
+        now = _time_to_minutes(crawl_time)
+
+        due = []
+        intervals = {}
+        for source_id in source_ids:
+            source_stats = stats.get(source_id)
+            interval = self.compute_interval(source_stats)
+            intervals[source_id] = interval
+
+            if not source_stats or source_stats.get("failed"):
+                due.append(source_id)
+                continue
+
+            last = _time_to_minutes(source_stats["last_time"])
+            if now is None or last is None or now < last:
+                due.append(source_id)
+                continue
+            if now - last + self.DUE_TOLERANCE_MINUTES >= interval:
+                due.append(source_id)
+
+        return due, intervals
@@ -5,10 +5,11 @@
 从研报API获取数据并转换为系统支持的格式
 """
 
-import requests
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 
+from trendradar.crawler.http_client import get_http_client
+
 
 def fetch_research_reports(
     keyword: str,
@@ -42,7 +43,7 @@ def fetch_research_reports(
         }
 
         try:
-            response = requests.get(base_url, params=params, timeout=10)
+            response = get_http_client().get(base_url, params=params, timeout=10)
             print(f"[研报API] 请求URL: {response.url}")
             print(f"[研报API] 响应状态: {response.status_code}")
             
@@ -14,9 +14,15 @@ from trendradar.storage.base import (
     NewsData,
     RSSItem,
     RSSData,
+    TitleRecord,
     convert_crawl_results_to_news_data,
     convert_news_data_to_results,
 )
+from trendradar.storage.connection import SQLiteConnectionManager, get_connection_manager
+from trendradar.storage.compact import compact_database, compact_rank_history, is_compact
+from trendradar.storage.archive import NewsArchive
+from trendradar.storage.delta_sync import DeltaSync
+from trendradar.storage.remote_cache import RemoteObjectCache
 from trendradar.storage.sqlite_mixin import SQLiteStorageMixin
 from trendradar.storage.local import LocalStorageBackend
 from trendradar.storage.manager import StorageManager, get_storage_manager
@@ -36,8 +42,22 @@ __all__ = [
     "NewsData",
     "RSSItem",
     "RSSData",
+    "TitleRecord",
     # Mixin
     "SQLiteStorageMixin",
+    # 连接管理
+    "SQLiteConnectionManager",
+    "get_connection_manager",
+    # 排名历史紧凑编码
+    "compact_database",
+    "compact_rank_history",
+    "is_compact",
+    # 跨天归档
+    "NewsArchive",
+    # 远程增量同步
+    "DeltaSync",
+    # 远程对象本地缓存
+    "RemoteObjectCache",
     # 转换函数
     "convert_crawl_results_to_news_data",
     "convert_news_data_to_results",
@@ -0,0 +1,327 @@
+# coding=utf-8
+"""
+热榜跨天归档
+
+每天一个 SQLite 文件（output/news/{date}.db）适合写入，但多天查询需要逐日打开、逐日解析。
+归档库（output/news/archive.db）把已结束的日期汇总到一个文件中：
+- 每条新闻一行，排名历史预先聚合为 JSON 数组，按 (date, platform_id) 建立索引
+- 一次查询即可读取任意日期范围
+- 记录每个日库归档时的文件签名，日库之后被修改（补抓、远程同步覆盖）时重新归档
+
+当天的日库仍在写入，不进入归档；由查询方决定哪些日期读归档、哪些日期读日库。
+"""
+
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from trendradar.storage.connection import WAL_SUFFIXES, get_connection_manager
+from trendradar.utils import fast_json
+
+
+ARCHIVE_FILENAME = "archive.db"
+
+_DATE_DB_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})\.db$")
+
+ARCHIVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archive_days (
+    date TEXT PRIMARY KEY,
+    signature TEXT NOT NULL,
+    item_count INTEGER DEFAULT 0,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS archive_platforms (
+    date TEXT NOT NULL,
+    platform_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (date, platform_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS archive_items (
+    date TEXT NOT NULL,
+    seq INTEGER NOT NULL,                -- 日库中 news_items.id，保持原有顺序
+    platform_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    url TEXT DEFAULT '',
+    mobile_url TEXT DEFAULT '',
+    ranks TEXT NOT NULL DEFAULT '[]',    -- 按抓取时间排列的排名历史（JSON 数组）
+    first_crawl_time TEXT NOT NULL,
+    last_crawl_time TEXT NOT NULL,
+    crawl_count INTEGER DEFAULT 1,
+    PRIMARY KEY (date, seq)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_archive_items_platform ON archive_items(date, platform_id);
+
+CREATE TABLE IF NOT EXISTS archive_crawl_times (
+    date TEXT NOT NULL,
+    crawl_time TEXT NOT NULL,
+    created_at TIMESTAMP,
+    PRIMARY KEY (date, crawl_time)
+) WITHOUT ROWID;
+"""
+
+
+def file_signature(db_path: Union[str, Path]) -> Optional[str]:
+    """
+    日库文件签名（大小 + 修改时间 + WAL 文件大小）
+
+    Returns:
+        文件不存在时返回 None
+    """
+    try:
+        stat = os.stat(db_path)
+    except FileNotFoundError:
+        return None
+    wal_size = 0
+    wal_path = f"{db_path}{WAL_SUFFIXES[0]}"
+    if os.path.exists(wal_path):
+        wal_size = os.path.getsize(wal_path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}:{wal_size}"
+
+
+def list_daily_databases(news_dir: Union[str, Path]) -> Dict[str, Path]:
+    """列出目录下的日库文件 {日期: 路径}"""
+    news_dir = Path(news_dir)
+    if not news_dir.exists():
+        return {}
+    result = {}
+    for db_file in news_dir.glob("*.db"):
+        match = _DATE_DB_RE.match(db_file.name)
+        if match:
+            result[match.group(1)] = db_file
+    return result
+
+
+class NewsArchive:
+    """
+    热榜归档库
+
+    写入（归档、清理）使用独立的写连接，用完即关；
+    查询使用连接管理器缓存的只读连接。
+    """
+
+    def __init__(self, archive_path: Union[str, Path]):
+        """
+        初始化归档库
+
+        Args:
+            archive_path: 归档库文件路径（通常为 output/news/archive.db）
+        """
+        self.archive_path = Path(archive_path)
+
+    @property
+    def exists(self) -> bool:
+        return self.archive_path.exists()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.archive_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = get_connection_manager().connect(self.archive_path)
+        conn.executescript(ARCHIVE_SCHEMA)
+        return conn
+
+    # ========================================
+    # 构建
+    # ========================================
+
+    def get_signatures(self) -> Dict[str, str]:
+        """获取已归档日期及其归档时的日库签名"""
+        if not self.exists:
+            return {}
+        conn = get_connection_manager().get_reader(self.archive_path)
+        try:
+            rows = conn.execute("SELECT date, signature FROM archive_days").fetchall()
+        except sqlite3.OperationalError:
+            return {}
+        return {row[0]: row[1] for row in rows}
+
+    def _archive_day(self, conn: sqlite3.Connection, date: str, db_path: Path, signature: str) -> int:
+        """在已打开的归档连接上归档单个日库，返回条目数"""
+        conn.execute("ATTACH DATABASE ? AS day", (str(db_path),))
+        try:
+            get_connection_manager().begin_write(conn, "[归档]")
+            try:
+                for table in ("archive_items", "archive_platforms", "archive_crawl_times"):
+                    conn.execute(f"DELETE FROM {table} WHERE date = ?", (date,))
+
+                conn.execute("""
+                    INSERT INTO archive_items
+                    (date, seq, platform_id, title, rank, url, mobile_url, ranks,
+                     first_crawl_time, last_crawl_time, crawl_count)
+                    SELECT ?, n.id, n.platform_id, n.title, n.rank, n.url, n.mobile_url,
+                           (SELECT json_group_array(h.rank) FROM (
+                                SELECT rank FROM day.rank_history
+                                WHERE news_item_id = n.id
+                                ORDER BY crawl_time, id
+                            ) h),
+                           n.first_crawl_time, n.last_crawl_time, n.crawl_count
+                    FROM day.news_items n
+                """, (date,))
+                item_count = conn.execute(
+                    "SELECT COUNT(*) FROM archive_items WHERE date = ?", (date,)
+                ).fetchone()[0]
+
+                conn.execute("""
+                    INSERT INTO archive_platforms (date, platform_id, name)
+                    SELECT ?, id, name FROM day.platforms
+                """, (date,))
+                conn.execute("""
+                    INSERT INTO archive_crawl_times (date, crawl_time, created_at)
+                    SELECT ?, crawl_time, created_at FROM day.crawl_records
+                """, (date,))
+                conn.execute("""
+                    INSERT INTO archive_days (date, signature, item_count, archived_at)
+                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(date) DO UPDATE SET
+                        signature = excluded.signature,
+                        item_count = excluded.item_count,
+                        archived_at = excluded.archived_at
+                """, (date, signature, item_count))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        finally:
+            conn.execute("DETACH DATABASE day")
+        return item_count
+
+    def sync(
+        self,
+        news_dir: Union[str, Path],
+        before_date: str,
+        dates: Optional[Iterable[str]] = None,
+    ) -> int:
+        """
+        归档已结束日期中尚未归档或已变化的日库
+
+        Args:
+            news_dir: 日库目录（output/news）
+            before_date: 只归档早于该日期（YYYY-MM-DD）的日库，即已结束的日期
+            dates: 只处理这些日期，None 表示目录下全部日库
+
+        Returns:
+            本次归档的日期数
+        """
+        daily = list_daily_databases(news_dir)
+        if dates is not None:
+            wanted = set(dates)
+            daily = {d: p for d, p in daily.items() if d in wanted}
+
+        archived = self.get_signatures()
+        pending = []
+        for date, db_path in sorted(daily.items()):
+            if date >= before_date:
+                continue
+            signature = file_signature(db_path)
+            if signature and archived.get(date) != signature:
+                pending.append((date, db_path, signature))
+        if not pending:
+            return 0
+
+        count = 0
+        conn = self._connect()
+        try:
+            for date, db_path, signature in pending:
+                try:
+                    items = self._archive_day(conn, date, db_path, signature)
+                    count += 1
+                    print(f"[归档] {date}: {items} 条新闻")
+                except sqlite3.Error as e:
+                    print(f"[归档] {date} 归档失败: {e}")
+        finally:
+            conn.close()
+        return count
+
+    def prune(self, before_date: str) -> int:
+        """
+        删除早于指定日期的归档数据（与日库保留天数保持一致）
+
+        Returns:
+            删除的日期数
+        """
+        if not self.exists:
+            return 0
+        conn = self._connect()
+        try:
+            get_connection_manager().begin_write(conn, "[归档]")
+            deleted = conn.execute(
+                "DELETE FROM archive_days WHERE date < ?", (before_date,)
+            ).rowcount
+            for table in ("archive_items", "archive_platforms", "archive_crawl_times"):
+                conn.execute(f"DELETE FROM {table} WHERE date < ?", (before_date,))
+            conn.commit()
+        finally:
+            conn.close()
+        return deleted
+
+    # ========================================
+    # 查询
+    # ========================================
+
+    def get_fresh_dates(self, news_dir: Union[str, Path], dates: Iterable[str]) -> List[str]:
+        """
+        筛选可以直接读归档的日期
+
+        已归档，且对应日库不存在或自归档后未变化的日期。
+        """
+        archived = self.get_signatures()
+        fresh = []
+        for date in dates:
+            signature = archived.get(date)
+            if signature is None:
+                continue
+            current = file_signature(Path(news_dir) / f"{date}.db")
+            if current is None or current == signature:
+                fresh.append(date)
+        return fresh
+
+    def iter_items(
+        self,
+        dates: List[str],
+        platform_ids: Optional[List[str]] = None,
+    ) -> Iterator[sqlite3.Row]:
+        """
+        一次查询读取多个日期的新闻（按日期、原有顺序排列）
+
+        Yields:
+            行：date, platform_id, platform_name, title, rank, url, mobile_url,
+            ranks（JSON 数组文本）, first_crawl_time, last_crawl_time, crawl_count
+        """
+        if not dates or not self.exists:
+            return
+        params: List = [fast_json.dumps(list(dates))]
+        platform_filter = ""
+        if platform_ids:
+            platform_filter = "AND i.platform_id IN (SELECT value FROM json_each(?))"
+            params.append(fast_json.dumps(list(platform_ids)))
+
+        conn = get_connection_manager().get_reader(self.archive_path)
+        yield from conn.execute(f"""
+            SELECT i.date, i.platform_id, p.name AS platform_name, i.title, i.rank,
+                   i.url, i.mobile_url, i.ranks,
+                   i.first_crawl_time, i.last_crawl_time, i.crawl_count
+            FROM archive_items i
+            LEFT JOIN archive_platforms p
+              ON p.date = i.date AND p.platform_id = i.platform_id
+            WHERE i.date IN (SELECT value FROM json_each(?))
+            {platform_filter}
+            ORDER BY i.date, i.seq
+        """, params)
+
+    def get_crawl_times(self, dates: List[str]) -> Dict[str, List[sqlite3.Row]]:
+        """读取多个日期的抓取记录 {日期: [(crawl_time, created_at), ...]}"""
+        result: Dict[str, List[sqlite3.Row]] = {}
+        if not dates or not self.exists:
+            return result
+        conn = get_connection_manager().get_reader(self.archive_path)
+        for row in conn.execute("""
+            SELECT date, crawl_time, created_at FROM archive_crawl_times
+            WHERE date IN (SELECT value FROM json_each(?))
+            ORDER BY date, crawl_time
+        """, (fast_json.dumps(list(dates)),)):
+            result.setdefault(row["date"], []).append(row)
+        return result
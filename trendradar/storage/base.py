@@ -6,8 +6,9 @@
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 
 
 @dataclass
@@ -67,6 +68,88 @@ class NewsItem:
         )
 
 
+# TitleRecord 的字典键（兼容原有 results / title_info 字典）到属性名的映射
+_TITLE_RECORD_FIELDS = {
+    "ranks": "ranks",
+    "url": "url",
+    "mobileUrl": "mobile_url",
+    "first_time": "first_time",
+    "last_time": "last_time",
+    "count": "count",
+    "rank_timeline": "rank_timeline",
+}
+
+
+class TitleRecord(Mapping):
+    """
+    标题记录（分析阶段使用的热榜标题数据）
+
+    当天数据按 {来源ID: {标题: TitleRecord}} 组织，results 与 title_info
+    共用同一批记录对象，不再为每个标题分别构建两份字典。
+    使用 __slots__ 存储，同时支持原有的只读字典式访问：
+
+        record.ranks == record["ranks"]
+        record.mobile_url == record.get("mobileUrl")
+    """
+
+    __slots__ = ("ranks", "url", "mobile_url", "first_time", "last_time", "count", "rank_timeline")
+
+    def __init__(
+        self,
+        ranks: Optional[List[int]] = None,
+        url: str = "",
+        mobile_url: str = "",
+        first_time: str = "",
+        last_time: str = "",
+        count: int = 1,
+        rank_timeline: Optional[List[Dict[str, Any]]] = None,
+    ):
+        self.ranks = ranks if ranks is not None else []
+        self.url = url
+        self.mobile_url = mobile_url
+        self.first_time = first_time
+        self.last_time = last_time
+        self.count = count
+        self.rank_timeline = rank_timeline if rank_timeline is not None else []
+
+    @classmethod
+    def from_news_item(cls, item: NewsItem) -> "TitleRecord":
+        """从 NewsItem 创建"""
+        return cls(
+            item.ranks,
+            item.url or "",
+            item.mobile_url or "",
+            item.first_time,
+            item.last_time,
+            item.count,
+            item.rank_timeline,
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        field_name = _TITLE_RECORD_FIELDS.get(key)
+        if field_name is None:
+            raise KeyError(key)
+        return getattr(self, field_name)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        field_name = _TITLE_RECORD_FIELDS.get(key)
+        if field_name is None:
+            return default
+        return getattr(self, field_name)
+
+    def __contains__(self, key: object) -> bool:
+        return key in _TITLE_RECORD_FIELDS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_TITLE_RECORD_FIELDS)
+
+    def __len__(self) -> int:
+        return len(_TITLE_RECORD_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"TitleRecord({dict(self)!r})"
+
+
 @dataclass
 class RSSItem:
     """RSS 条目数据模型"""
@@ -184,6 +267,7 @@ class NewsData:
     - items: 按来源ID分组的新闻条目
     - id_to_name: 来源ID到名称的映射
     - failed_ids: 失败的来源ID列表
+    - unchanged_ids: 响应与上次抓取完全相同的来源ID列表（存储层可走快速路径）
     """
 
     date: str                                   # 日期
@@ -191,6 +275,7 @@ class NewsData:
     items: Dict[str, List[NewsItem]]            # 按来源分组的新闻
     id_to_name: Dict[str, str] = field(default_factory=dict)   # ID到名称映射
     failed_ids: List[str] = field(default_factory=list)        # 失败的ID
+    unchanged_ids: List[str] = field(default_factory=list)     # 响应未变化的ID
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -320,18 +405,43 @@ class StorageBackend(ABC):
         pass
 
     @abstractmethod
-    def get_today_all_data(self, date: Optional[str] = None) -> Optional[NewsData]:
+    def get_today_all_data(
+        self, date: Optional[str] = None, include_timeline: bool = True
+    ) -> Optional[NewsData]:
         """
         获取指定日期的所有新闻数据
 
         Args:
             date: 日期字符串（YYYY-MM-DD），默认为今天
+            include_timeline: 是否构建 rank_timeline（不需要时可跳过）
 
         Returns:
             合并后的新闻数据，如果没有数据返回 None
         """
         pass
 
+    def iter_news_items(
+        self,
+        date: Optional[str] = None,
+        include_timeline: bool = True,
+        platform_ids: Optional[List[str]] = None,
+    ) -> Iterator[Tuple[str, str, List[NewsItem]]]:
+        """
+        按平台流式读取指定日期的新闻条目
+
+        默认实现基于 get_today_all_data，SQLite 后端会覆盖为逐平台流式读取。
+
+        Yields:
+            (platform_id, platform_name, 条目列表)
+        """
+        data = self.get_today_all_data(date, include_timeline=include_timeline)
+        if not data:
+            return
+        for platform_id, news_list in data.items.items():
+            if platform_ids is not None and platform_id not in platform_ids:
+                continue
+            yield platform_id, data.id_to_name.get(platform_id, platform_id), news_list
+
     @abstractmethod
     def get_latest_crawl_data(self, date: Optional[str] = None) -> Optional[NewsData]:
         """
@@ -406,6 +516,17 @@ class StorageBackend(ABC):
         """
         pass
 
+    def archive_closed_days(self) -> int:
+        """
+        将已结束日期的热榜日库汇总到跨天归档库
+
+        默认不归档，本地后端会覆盖。
+
+        Returns:
+            本次归档的日期数
+        """
+        return 0
+
     @abstractmethod
     def cleanup_old_data(self, retention_days: int) -> int:
         """
@@ -498,6 +619,7 @@ def convert_crawl_results_to_news_data(
     failed_ids: List[str],
     crawl_time: str,
     crawl_date: str,
+    unchanged_ids: Optional[List[str]] = None,
 ) -> NewsData:
     """
     将爬虫结果转换为 NewsData 格式
@@ -508,6 +630,7 @@ def convert_crawl_results_to_news_data(
         failed_ids: 失败的来源ID
         crawl_time: 抓取时间（HH:MM）
         crawl_date: 抓取日期（YYYY-MM-DD）
+        unchanged_ids: 响应与上次抓取完全相同的来源ID
 
     Returns:
         NewsData 对象
@@ -519,7 +642,7 @@ def convert_crawl_results_to_news_data(
         news_list = []
 
         for title, data in titles_data.items():
-            if isinstance(data, dict):
+            if isinstance(data, Mapping):
                 ranks = data.get("ranks", [])
                 url = data.get("url", "")
                 mobile_url = data.get("mobileUrl", "")
@@ -554,6 +677,7 @@ def convert_crawl_results_to_news_data(
         items=items,
         id_to_name=id_to_name,
         failed_ids=failed_ids,
+        unchanged_ids=[sid for sid in (unchanged_ids or []) if sid in items],
     )
 
 
@@ -565,29 +689,14 @@ def convert_news_data_to_results(data: NewsData) -> tuple:
         data: NewsData 对象
 
     Returns:
-        (results, id_to_name, title_info) 元组
+        (results, id_to_name, title_info) 元组，两者共用同一批 TitleRecord
     """
     results = {}
-    title_info = {}
 
     for source_id, news_list in data.items.items():
-        results[source_id] = {}
-        title_info[source_id] = {}
-
-        for item in news_list:
-            results[source_id][item.title] = {
-                "ranks": item.ranks,
-                "url": item.url,
-                "mobileUrl": item.mobile_url,
-            }
-
-            title_info[source_id][item.title] = {
-                "first_time": item.first_time,
-                "last_time": item.last_time,
-                "count": item.count,
-                "ranks": item.ranks,
-                "url": item.url,
-                "mobileUrl": item.mobile_url,
-            }
+        results[source_id] = {
+            item.title: TitleRecord.from_news_item(item) for item in news_list
+        }
 
+    title_info = {source_id: dict(records) for source_id, records in results.items()}
     return results, data.id_to_name, title_info
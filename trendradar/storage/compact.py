@@ -0,0 +1,153 @@
+# coding=utf-8
+"""
+排名历史紧凑编码
+
+默认的 rank_history 每条新闻每次抓取一行（TEXT 抓取时间 + 时间戳），
+每天约 48 次抓取 × 1500 条新闻 ≈ 7 万行，是热榜日库体积的主要来源。
+
+紧凑编码将每条新闻的排名序列打包为 rank_series 中的一行：
+- entries 为 JSON 整数数组，每个元素 = crawl_records.id × 1000 + 排名
+  （抓取时间以 crawl_records 的 ID 表示，排名限制在 0-999，0 表示脱榜）
+- rank_history 改为同名视图，展开后与原表列一致（id, news_item_id, rank, crawl_time, created_at），
+  现有查询（_get_today_all_data_impl、MCP 解析器、调度统计）无需修改
+- 视图上的 INSTEAD OF INSERT 触发器将写入追加到对应序列，写入逻辑同样无需修改
+
+视图中的 created_at 取自对应的 crawl_records 记录。
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import Optional, Union
+
+from trendradar.storage.connection import get_connection_manager
+
+
+# 每个序列元素 = crawl_record_id * RANK_BASE + rank
+RANK_BASE = 1000
+
+RANK_SERIES_TABLE = """
+CREATE TABLE IF NOT EXISTS rank_series (
+    news_item_id INTEGER PRIMARY KEY,
+    entries TEXT NOT NULL DEFAULT '[]',
+    FOREIGN KEY (news_item_id) REFERENCES news_items(id)
+)
+"""
+
+RANK_HISTORY_VIEW = f"""
+CREATE VIEW IF NOT EXISTS rank_history AS
+SELECT
+    s.news_item_id * {RANK_BASE} + e.key AS id,
+    s.news_item_id AS news_item_id,
+    e.value % {RANK_BASE} AS rank,
+    cr.crawl_time AS crawl_time,
+    cr.created_at AS created_at
+FROM rank_series s, json_each(s.entries) e
+JOIN crawl_records cr ON cr.id = e.value / {RANK_BASE}
+"""
+
+RANK_HISTORY_TRIGGER = f"""
+CREATE TRIGGER IF NOT EXISTS rank_history_insert
+INSTEAD OF INSERT ON rank_history
+BEGIN
+    INSERT INTO crawl_records (crawl_time, total_items, created_at)
+    SELECT NEW.crawl_time, 0, COALESCE(NEW.created_at, CURRENT_TIMESTAMP)
+    WHERE NOT EXISTS (SELECT 1 FROM crawl_records WHERE crawl_time = NEW.crawl_time);
+
+    INSERT INTO rank_series (news_item_id, entries)
+    SELECT NEW.news_item_id,
+           json_array(id * {RANK_BASE} + MIN(MAX(NEW.rank, 0), {RANK_BASE - 1}))
+    FROM crawl_records WHERE crawl_time = NEW.crawl_time
+    ON CONFLICT(news_item_id) DO UPDATE SET
+        entries = json_insert(entries, '$[#]', json_extract(excluded.entries, '$[0]'));
+END
+"""
+
+
+def _rank_history_type(conn: sqlite3.Connection) -> Optional[str]:
+    """rank_history 的对象类型（"table" / "view"），不存在时返回 None"""
+    row = conn.execute("""
+        SELECT type FROM sqlite_master WHERE name = 'rank_history'
+    """).fetchone()
+    return row[0] if row else None
+
+
+def is_compact(conn: sqlite3.Connection) -> bool:
+    """rank_history 是否已是紧凑编码（视图）"""
+    return _rank_history_type(conn) == "view"
+
+
+def compact_rank_history(
+    conn: sqlite3.Connection,
+    vacuum: bool = True,
+    log_prefix: str = "[存储]",
+) -> int:
+    """
+    将 rank_history 表迁移为紧凑编码
+
+    在一个事务内完成：补齐 crawl_records、按条目打包排名序列、删除原表、
+    创建同名视图和写入触发器；完成后可选执行 VACUUM 回收空间。
+    已是紧凑编码或不是热榜数据库时不做任何操作。
+
+    Args:
+        conn: 数据库连接（需已初始化表结构）
+        vacuum: 迁移后是否执行 VACUUM
+        log_prefix: 日志前缀
+
+    Returns:
+        迁移的排名记录数
+    """
+    if _rank_history_type(conn) != "table":
+        return 0
+
+    get_connection_manager().begin_write(conn, log_prefix)
+    try:
+        # 排名历史中出现、但没有抓取记录的时间（旧数据或写入中断）
+        conn.execute("""
+            INSERT INTO crawl_records (crawl_time, total_items, created_at)
+            SELECT crawl_time, 0, MIN(created_at) FROM rank_history
+            WHERE crawl_time NOT IN (SELECT crawl_time FROM crawl_records)
+            GROUP BY crawl_time
+        """)
+        conn.execute(RANK_SERIES_TABLE)
+        conn.execute(f"""
+            INSERT INTO rank_series (news_item_id, entries)
+            SELECT news_item_id, json_group_array(entry) FROM (
+                SELECT rh.news_item_id,
+                       cr.id * {RANK_BASE} + MIN(MAX(rh.rank, 0), {RANK_BASE - 1}) AS entry
+                FROM rank_history rh
+                JOIN crawl_records cr ON cr.crawl_time = rh.crawl_time
+                ORDER BY rh.news_item_id, rh.crawl_time, rh.id
+            )
+            GROUP BY news_item_id
+        """)
+        migrated = conn.execute("SELECT COUNT(*) FROM rank_history").fetchone()[0]
+        conn.execute("DROP INDEX IF EXISTS idx_rank_history_news")
+        conn.execute("DROP TABLE rank_history")
+        conn.execute(RANK_HISTORY_VIEW)
+        conn.execute(RANK_HISTORY_TRIGGER)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    if vacuum:
+        conn.execute("VACUUM")
+    return migrated
+
+
+def compact_database(db_path: Union[str, Path], log_prefix: str = "[存储]") -> int:
+    """
+    迁移单个热榜日库文件
+
+    Args:
+        db_path: 数据库文件路径
+        log_prefix: 日志前缀
+
+    Returns:
+        迁移的排名记录数（无需迁移时为 0）
+    """
+    conn = get_connection_manager().connect(db_path)
+    try:
+        return compact_rank_history(conn, log_prefix=log_prefix)
+    finally:
+        conn.close()
@@ -0,0 +1,243 @@
+# coding=utf-8
+"""
+SQLite 连接管理
+
+统一按日 SQLite 文件（output/{type}/{date}.db）的连接参数与复用：
+- 写连接：WAL 日志模式 + synchronous=NORMAL，读者不阻塞爬虫写入
+- 读连接：只读打开，按线程、按文件缓存，重复查询无需再次打开文件
+- 写事务以 BEGIN IMMEDIATE 开始，统计并报告等待写锁的耗时
+
+远程存储的临时数据库文件需要整体上传，不能使用 WAL（数据可能仍在 -wal 文件中），
+因此以 wal=False 打开，只应用其余参数。
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+
+# 连接级参数
+BUSY_TIMEOUT_MS = 5000
+CACHE_SIZE_KB = 16 * 1024
+MMAP_SIZE = 256 * 1024 * 1024
+# 等待写锁超过该值（毫秒）时输出日志
+LOCK_WAIT_LOG_MS = 100
+
+# WAL 模式下的附属文件
+WAL_SUFFIXES = ("-wal", "-shm")
+
+
+def apply_pragmas(conn: sqlite3.Connection, wal: bool = True, read_only: bool = False) -> None:
+    """
+    为连接设置统一的 PRAGMA
+
+    Args:
+        conn: 数据库连接
+        wal: 是否切换为 WAL 日志模式（仅写连接）
+        read_only: 是否为只读连接
+    """
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KB}")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    if read_only:
+        return
+    # journal_mode 会持久化在文件中，非 WAL 连接需显式切回回滚日志
+    conn.execute(f"PRAGMA journal_mode = {'WAL' if wal else 'DELETE'}")
+    conn.execute("PRAGMA synchronous = NORMAL")
+
+
+def remove_db_files(db_path: Union[str, Path]) -> None:
+    """删除数据库文件及其 WAL 附属文件"""
+    db_path = Path(db_path)
+    db_path.unlink()
+    for suffix in WAL_SUFFIXES:
+        sidecar = Path(f"{db_path}{suffix}")
+        if sidecar.exists():
+            sidecar.unlink()
+
+
+class SQLiteConnectionManager:
+    """
+    SQLite 连接管理器（线程安全）
+
+    写连接由各存储后端自行缓存（一个后端实例一个连接），这里只负责打开和设置参数；
+    读连接由管理器按 (线程, 文件) 缓存，文件被替换或删除后自动重新打开。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats = {
+            "opened": 0,
+            "reader_hits": 0,
+            "lock_waits": 0,
+            "lock_wait_ms": 0.0,
+            "max_lock_wait_ms": 0.0,
+        }
+
+    def _count(self, key: str, value: float = 1) -> None:
+        with self._lock:
+            self._stats[key] += value
+
+    def connect(
+        self,
+        db_path: Union[str, Path],
+        wal: bool = True,
+        check_same_thread: bool = True,
+    ) -> sqlite3.Connection:
+        """
+        打开写连接
+
+        Args:
+            db_path: 数据库文件路径
+            wal: 是否使用 WAL 日志模式
+            check_same_thread: 是否限制只能在创建线程中使用
+
+        Returns:
+            已设置 PRAGMA 的连接（row_factory 为 sqlite3.Row）
+        """
+        conn = sqlite3.connect(
+            str(db_path),
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=check_same_thread,
+        )
+        conn.row_factory = sqlite3.Row
+        apply_pragmas(conn, wal=wal)
+        self._count("opened")
+        return conn
+
+    def _reader_cache(self) -> Dict[str, Tuple[sqlite3.Connection, Tuple[int, int]]]:
+        cache = getattr(self._local, "readers", None)
+        if cache is None:
+            cache = {}
+            self._local.readers = cache
+        return cache
+
+    def get_reader(self, db_path: Union[str, Path]) -> sqlite3.Connection:
+        """
+        获取只读连接（当前线程内按文件缓存）
+
+        文件的 inode 变化（被同步覆盖、重建）时关闭旧连接并重新打开。
+
+        Args:
+            db_path: 数据库文件路径（必须已存在）
+
+        Returns:
+            只读连接（row_factory 为 sqlite3.Row）
+
+        Raises:
+            FileNotFoundError: 文件不存在
+        """
+        key = str(db_path)
+        cache = self._reader_cache()
+
+        try:
+            stat = os.stat(key)
+        except FileNotFoundError:
+            self._close_reader(cache, key)
+            raise
+        identity = (stat.st_dev, stat.st_ino)
+
+        cached = cache.get(key)
+        if cached and cached[1] == identity:
+            self._count("reader_hits")
+            return cached[0]
+        self._close_reader(cache, key)
+
+        uri = f"{Path(key).resolve().as_uri()}?mode=ro"
+        try:
+            conn = sqlite3.connect(uri, uri=True, timeout=BUSY_TIMEOUT_MS / 1000)
+            conn.execute("SELECT 1 FROM sqlite_master LIMIT 1")
+        except sqlite3.OperationalError:
+            # 只读打开 WAL 数据库需要 -shm 文件，目录不可写等情况下退回普通连接
+            conn = sqlite3.connect(key, timeout=BUSY_TIMEOUT_MS / 1000)
+        conn.row_factory = sqlite3.Row
+        apply_pragmas(conn, read_only=True)
+
+        cache[key] = (conn, identity)
+        self._count("opened")
+        return conn
+
+    @staticmethod
+    def _close_reader(cache: Dict, key: str) -> None:
+        cached = cache.pop(key, None)
+        if cached:
+            try:
+                cached[0].close()
+            except sqlite3.Error:
+                pass
+
+    def close_readers(self, db_path: Optional[Union[str, Path]] = None) -> None:
+        """
+        关闭当前线程缓存的只读连接
+
+        Args:
+            db_path: 只关闭指定文件的连接，None 表示全部
+        """
+        cache = self._reader_cache()
+        keys = [str(db_path)] if db_path is not None else list(cache)
+        for key in keys:
+            self._close_reader(cache, key)
+
+    def begin_write(self, conn: sqlite3.Connection, log_prefix: str = "[存储]") -> float:
+        """
+        以 BEGIN IMMEDIATE 开始写事务并统计等待写锁的时间
+
+        WAL 模式下读者不会阻塞写入，等待只可能来自其他写进程（如并行运行的爬虫）。
+        已处于事务中时不做任何操作。
+
+        Returns:
+            等待写锁的时间（毫秒）
+
+        Raises:
+            sqlite3.OperationalError: 超过 busy_timeout 仍未获得写锁
+        """
+        if conn.in_transaction:
+            return 0.0
+
+        start = time.perf_counter()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError:
+            wait_ms = (time.perf_counter() - start) * 1000
+            self._record_lock_wait(wait_ms)
+            print(f"{log_prefix} 等待数据库写锁超时（{wait_ms:.0f} ms）")
+            raise
+        wait_ms = (time.perf_counter() - start) * 1000
+
+        if wait_ms >= LOCK_WAIT_LOG_MS:
+            self._record_lock_wait(wait_ms)
+            print(f"{log_prefix} 等待数据库写锁 {wait_ms:.0f} ms")
+        return wait_ms
+
+    def _record_lock_wait(self, wait_ms: float) -> None:
+        with self._lock:
+            self._stats["lock_waits"] += 1
+            self._stats["lock_wait_ms"] += wait_ms
+            self._stats["max_lock_wait_ms"] = max(self._stats["max_lock_wait_ms"], wait_ms)
+
+    def get_stats(self) -> Dict:
+        """获取连接统计（打开次数、读连接复用次数、写锁等待）"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["lock_wait_ms"] = round(stats["lock_wait_ms"], 1)
+        stats["max_lock_wait_ms"] = round(stats["max_lock_wait_ms"], 1)
+        return stats
+
+
+_connection_manager: Optional[SQLiteConnectionManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_connection_manager() -> SQLiteConnectionManager:
+    """获取全局连接管理器实例"""
+    global _connection_manager
+    if _connection_manager is None:
+        with _manager_lock:
+            if _connection_manager is None:
+                _connection_manager = SQLiteConnectionManager()
+    return _connection_manager
@@ -0,0 +1,368 @@
+# coding=utf-8
+"""
+远程 SQLite 文件的增量同步
+
+远程仍然保存完整的 {type}/{date}.db 对象（拉取、MCP 同步等读取方无需改动），
+对象元数据中附带分块摘要清单（每块 part_size 字节）：
+
+- 上传：与远程对象的清单逐块比较，未变化的块用 UploadPartCopy 在服务端从旧对象复制，
+  只上传变化的块；文件整体未变化时跳过上传。按块从磁盘读取，内存占用不超过一个块。
+- 下载：本地已有旧版本文件时，未变化的块从本地复制，只按 Range 下载变化的块。
+
+SQLite 以页为单位修改文件，新增数据主要追加在文件末尾，文件越大节省越多。
+S3 分块上传要求除最后一块外每块至少 5 MiB，小于一个块的文件直接整体上传。
+远程对象在此期间被其他进程修改时（CopySourceIfMatch 不匹配）回退为完整上传。
+"""
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+try:
+    from botocore.exceptions import ClientError
+except ImportError:
+    ClientError = Exception
+
+
+# S3 分块上传的最小块大小
+MIN_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+# 对象元数据中保存清单的键（S3 用户元数据总大小上限 2 KB）
+MANIFEST_META_KEY = "trendradar-parts"
+MAX_MANIFEST_LENGTH = 1800
+# 并发传输的块数
+MAX_WORKERS = 4
+
+_DIGEST_SIZE = 12
+
+
+@dataclass
+class PartManifest:
+    """分块摘要清单"""
+
+    part_size: int
+    size: int
+    digests: List[str] = field(default_factory=list)
+
+    def encode(self) -> Optional[str]:
+        """编码为元数据字符串，超出元数据长度限制时返回 None"""
+        value = f"{self.part_size}:{self.size}:{','.join(self.digests)}"
+        if len(value) > MAX_MANIFEST_LENGTH:
+            return None
+        return value
+
+    @classmethod
+    def decode(cls, value: Optional[str]) -> Optional["PartManifest"]:
+        """从元数据字符串解析，格式不正确时返回 None"""
+        if not value:
+            return None
+        try:
+            part_size, size, digests = value.split(":", 2)
+            return cls(int(part_size), int(size), digests.split(",") if digests else [])
+        except ValueError:
+            return None
+
+    def matches(self, other: Optional["PartManifest"]) -> bool:
+        """两个清单描述的文件内容是否一致"""
+        return (
+            other is not None
+            and self.part_size == other.part_size
+            and self.size == other.size
+            and self.digests == other.digests
+        )
+
+
+@dataclass
+class RemoteState:
+    """远程对象的版本信息（ETag + 清单）"""
+
+    etag: str
+    manifest: Optional[PartManifest] = None
+
+
+def build_manifest(path: Union[str, Path], part_size: int = DEFAULT_PART_SIZE) -> PartManifest:
+    """逐块读取文件计算分块摘要"""
+    size = os.path.getsize(path)
+    digests = []
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(part_size)
+            if not chunk:
+                break
+            digests.append(hashlib.blake2b(chunk, digest_size=_DIGEST_SIZE).hexdigest())
+    return PartManifest(part_size, size, digests)
+
+
+def _read_part(path: Union[str, Path], index: int, part_size: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(index * part_size)
+        return f.read(part_size)
+
+
+class DeltaSync:
+    """
+    基于分块清单的 S3 增量同步（线程安全，boto3 client 可在线程间共享）
+    """
+
+    def __init__(self, s3_client, bucket_name: str, part_size: int = DEFAULT_PART_SIZE):
+        """
+        初始化增量同步
+
+        Args:
+            s3_client: boto3 S3 客户端
+            bucket_name: 存储桶名称
+            part_size: 分块大小（字节，不小于 5 MiB）
+        """
+        self.s3_client = s3_client
+        self.bucket_name = bucket_name
+        self.part_size = max(MIN_PART_SIZE, int(part_size))
+
+    @staticmethod
+    def state_from_response(response: Dict) -> RemoteState:
+        """从 head_object / get_object 响应中提取版本信息"""
+        metadata = response.get("Metadata") or {}
+        return RemoteState(
+            etag=response.get("ETag", ""),
+            manifest=PartManifest.decode(metadata.get(MANIFEST_META_KEY)),
+        )
+
+    # ========================================
+    # 上传
+    # ========================================
+
+    def upload(
+        self,
+        local_path: Union[str, Path],
+        key: str,
+        base: Optional[RemoteState] = None,
+        content_type: str = "application/x-sqlite3",
+    ) -> Optional[RemoteState]:
+        """
+        增量上传文件
+
+        Args:
+            local_path: 本地文件路径
+            key: 远程对象键
+            base: 远程对象当前的版本信息（下载或上次上传时记录），None 表示完整上传
+            content_type: 对象类型
+
+        Returns:
+            上传后的远程版本信息；文件未变化时返回 base
+
+        Raises:
+            ClientError 等: 上传失败
+        """
+        manifest = build_manifest(local_path, self.part_size)
+        base_manifest = base.manifest if base else None
+
+        if manifest.matches(base_manifest):
+            print(f"[远程存储] 文件未变化，跳过上传: {key}")
+            return base
+
+        metadata = {}
+        encoded = manifest.encode()
+        if encoded:
+            metadata[MANIFEST_META_KEY] = encoded
+
+        if manifest.size <= self.part_size:
+            # 单块：直接上传（显式 ContentLength，避免 chunked encoding）
+            body = _read_part(local_path, 0, self.part_size)
+            response = self.s3_client.put_object(
+                Bucket=self.bucket_name,
+                Key=key,
+                Body=body,
+                ContentLength=len(body),
+                ContentType=content_type,
+                Metadata=metadata,
+            )
+            print(f"[远程存储] 已上传: {key} ({manifest.size} bytes)")
+            return RemoteState(response.get("ETag", ""), manifest)
+
+        reusable = set()
+        if base and base_manifest and base_manifest.part_size == manifest.part_size:
+            for index, digest in enumerate(manifest.digests):
+                if index < len(base_manifest.digests) and base_manifest.digests[index] == digest:
+                    # 旧对象的最后一块可能较短，只有长度一致时摘要才会相同
+                    reusable.add(index)
+
+        try:
+            return self._multipart_upload(local_path, key, manifest, metadata, content_type, base, reusable)
+        except ClientError as e:
+            if not reusable:
+                raise
+            # 远程对象已被其他进程替换（CopySourceIfMatch 失败）等情况，回退为完整上传
+            print(f"[远程存储] 增量上传失败，改为完整上传: {e}")
+            return self._multipart_upload(local_path, key, manifest, metadata, content_type, None, set())
+
+    def _multipart_upload(
+        self,
+        local_path: Union[str, Path],
+        key: str,
+        manifest: PartManifest,
+        metadata: Dict[str, str],
+        content_type: str,
+        base: Optional[RemoteState],
+        reusable: set,
+    ) -> RemoteState:
+        """分块上传：可复用的块在服务端复制，其余块从磁盘读取上传"""
+        upload_id = self.s3_client.create_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=key,
+            ContentType=content_type,
+            Metadata=metadata,
+        )["UploadId"]
+
+        def transfer(index: int) -> Dict:
+            part_number = index + 1
+            if index in reusable:
+                start = index * manifest.part_size
+                end = min(start + manifest.part_size, manifest.size) - 1
+                response = self.s3_client.upload_part_copy(
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    CopySource={"Bucket": self.bucket_name, "Key": key},
+                    CopySourceRange=f"bytes={start}-{end}",
+                    CopySourceIfMatch=base.etag,
+                )
+                return {"PartNumber": part_number, "ETag": response["CopyPartResult"]["ETag"]}
+
+            body = _read_part(local_path, index, manifest.part_size)
+            response = self.s3_client.upload_part(
+                Bucket=self.bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=body,
+                ContentLength=len(body),
+            )
+            return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+        try:
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                parts = list(executor.map(transfer, range(len(manifest.digests))))
+            response = self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except Exception:
+            try:
+                self.s3_client.abort_multipart_upload(
+                    Bucket=self.bucket_name, Key=key, UploadId=upload_id
+                )
+            except Exception:
+                pass
+            raise
+
+        uploaded = len(manifest.digests) - len(reusable)
+        print(
+            f"[远程存储] 已分块上传: {key} ({manifest.size} bytes，"
+            f"上传 {uploaded} 块，服务端复制 {len(reusable)} 块)"
+        )
+        return RemoteState(response.get("ETag", ""), manifest)
+
+    # ========================================
+    # 下载
+    # ========================================
+
+    def download(
+        self,
+        key: str,
+        local_path: Union[str, Path],
+        remote: RemoteState,
+        base_path: Optional[Union[str, Path]] = None,
+    ) -> None:
+        """
+        增量下载文件
+
+        Args:
+            key: 远程对象键
+            local_path: 本地目标路径
+            remote: 远程对象版本信息（head_object 结果）
+            base_path: 本地旧版本文件，未变化的块从这里复制；None 表示完整下载
+
+        Raises:
+            ClientError 等: 下载失败
+        """
+        local_path = Path(local_path)
+        tmp_path = local_path.with_name(local_path.name + ".part")
+        manifest = remote.manifest
+
+        reusable = set()
+        if base_path and manifest and Path(base_path).exists():
+            base_manifest = build_manifest(base_path, manifest.part_size)
+            for index, digest in enumerate(manifest.digests):
+                if index < len(base_manifest.digests) and base_manifest.digests[index] == digest:
+                    reusable.add(index)
+
+        try:
+            if not reusable:
+                self._download_whole(key, tmp_path, remote)
+            else:
+                self._download_parts(key, tmp_path, remote, Path(base_path), reusable)
+            os.replace(tmp_path, local_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def _download_whole(self, key: str, tmp_path: Path, remote: RemoteState) -> None:
+        # 使用 get_object + iter_chunks，以正确处理腾讯云 COS 的 chunked transfer encoding
+        kwargs = {"Bucket": self.bucket_name, "Key": key}
+        if remote.etag:
+            kwargs["IfMatch"] = remote.etag
+        response = self.s3_client.get_object(**kwargs)
+        with open(tmp_path, "wb") as f:
+            for chunk in response["Body"].iter_chunks(chunk_size=1024 * 1024):
+                f.write(chunk)
+
+    def _download_parts(
+        self,
+        key: str,
+        tmp_path: Path,
+        remote: RemoteState,
+        base_path: Path,
+        reusable: set,
+    ) -> None:
+        manifest = remote.manifest
+        with open(tmp_path, "wb") as f:
+            f.truncate(manifest.size)
+
+        def fetch(index: int) -> None:
+            start = index * manifest.part_size
+            length = min(manifest.part_size, manifest.size - start)
+            if index in reusable:
+                with open(base_path, "rb") as src:
+                    src.seek(start)
+                    data = src.read(length)
+            else:
+                response = self.s3_client.get_object(
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    Range=f"bytes={start}-{start + length - 1}",
+                    IfMatch=remote.etag,
+                )
+                data = response["Body"].read()
+            with open(tmp_path, "r+b") as dst:
+                dst.seek(start)
+                dst.write(data)
+
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            list(executor.map(fetch, range(len(manifest.digests))))
+
+        if not manifest.matches(build_manifest(tmp_path, manifest.part_size)):
+            # 清单与对象内容不一致（例如对象被不支持元数据的工具覆盖），改为完整下载
+            print(f"[远程存储] 增量下载校验失败，改为完整下载: {key}")
+            self._download_whole(key, tmp_path, remote)
+            return
+
+        downloaded = len(manifest.digests) - len(reusable)
+        print(
+            f"[远程存储] 已增量下载: {key} ({manifest.size} bytes，"
+            f"下载 {downloaded} 块，本地复用 {len(reusable)} 块)"
+        )
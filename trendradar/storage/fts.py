@@ -0,0 +1,153 @@
+# coding=utf-8
+"""
+标题全文索引（SQLite FTS5）
+
+每个日库内建一张 FTS5 表，rowid 与条目表的 id 一致：
+- news_fts(title_tokens)：热榜标题
+- rss_fts(title_tokens, summary_tokens)：RSS 标题和摘要
+
+中文没有空格分词，FTS5 自带的 unicode61 分词器会把整段汉字当作一个词。
+这里在写入前自行切分：文本按非字母数字字符断开，每段切成重叠的二元组（字符 bigram），
+长度为 1 的段保留原字符；查询关键词以同样方式切分后作为短语查询，
+连续的二元组即对应原文中的连续子串。分词在 Python 中完成，读取方无需注册任何函数。
+
+索引只用于缩小候选范围，调用方仍以 `keyword.lower() in title.lower()` 校验，
+结果与逐条扫描一致；关键词无法使用索引（如单个字符）时返回 None，由调用方退回扫描。
+"""
+
+import sqlite3
+from typing import List, Optional, Sequence
+
+
+# FTS5 表定义（按数据库类型）
+FTS_TABLES = {
+    "news": ("news_fts", ("title_tokens",)),
+    "rss": ("rss_fts", ("title_tokens", "summary_tokens")),
+}
+
+# 注册在写连接上的分词函数名（保存路径以集合语句批量更新索引）
+TOKENS_FUNCTION = "fts_bigrams"
+
+
+def _detect_fts5() -> bool:
+    try:
+        conn = sqlite3.connect(":memory:")
+        try:
+            conn.execute("CREATE VIRTUAL TABLE probe USING fts5(content)")
+        finally:
+            conn.close()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+HAS_FTS5 = _detect_fts5()
+
+
+def _runs(text: str) -> List[str]:
+    """按非字母数字字符切分为若干段（小写）"""
+    runs = []
+    current = []
+    for char in text.lower():
+        if char.isalnum():
+            current.append(char)
+        elif current:
+            runs.append("".join(current))
+            current = []
+    if current:
+        runs.append("".join(current))
+    return runs
+
+
+def _bigrams(run: str) -> List[str]:
+    if len(run) < 2:
+        return [run]
+    return [run[i:i + 2] for i in range(len(run) - 1)]
+
+
+def bigram_tokens(text: Optional[str]) -> str:
+    """
+    将文本切分为以空格分隔的字符二元组（写入索引的内容）
+
+    Examples:
+        "华为 Mate70 发布" -> "华为 ma at te e7 70 发布"
+    """
+    if not text:
+        return ""
+    tokens = []
+    for run in _runs(text):
+        tokens.extend(_bigrams(run))
+    return " ".join(tokens)
+
+
+def build_match_query(keyword: str, columns: Optional[Sequence[str]] = None) -> Optional[str]:
+    """
+    将关键词转换为 FTS5 MATCH 查询
+
+    每个长度不小于 2 的段转换为一个二元组短语，多个短语之间为 AND。
+    长度为 1 的段在原文中可能位于更长的段内，无法用索引定位，不参与查询（由调用方校验）。
+
+    Args:
+        keyword: 搜索关键词
+        columns: 限定查询的列，None 表示所有列
+
+    Returns:
+        MATCH 查询字符串；关键词无法使用索引时返回 None
+    """
+    phrases = [
+        '"' + " ".join(_bigrams(run)) + '"'
+        for run in _runs(keyword)
+        if len(run) >= 2
+    ]
+    if not phrases:
+        return None
+    query = " AND ".join(phrases)
+    if columns:
+        return "{" + " ".join(columns) + "} : (" + query + ")"
+    return query
+
+
+def has_fts_index(conn: sqlite3.Connection, db_type: str = "news") -> bool:
+    """数据库中是否已有全文索引"""
+    table, _ = FTS_TABLES[db_type]
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    return row is not None
+
+
+def ensure_fts_index(conn: sqlite3.Connection, db_type: str = "news") -> bool:
+    """
+    在写连接上注册分词函数，并创建全文索引（已有数据时一并补建）
+
+    调用方负责提交事务。
+
+    Args:
+        conn: 写连接
+        db_type: 数据库类型 ("news" 或 "rss")
+
+    Returns:
+        索引是否可用（当前 SQLite 不支持 FTS5 时为 False）
+    """
+    if not HAS_FTS5:
+        return False
+    conn.create_function(TOKENS_FUNCTION, 1, bigram_tokens, deterministic=True)
+    if has_fts_index(conn, db_type):
+        return True
+
+    table, columns = FTS_TABLES[db_type]
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {table}
+        USING fts5({', '.join(columns)}, tokenize = 'unicode61 remove_diacritics 0')
+    """)
+    if db_type == "news":
+        conn.execute(f"""
+            INSERT INTO {table} (rowid, title_tokens)
+            SELECT id, {TOKENS_FUNCTION}(title) FROM news_items
+        """)
+    else:
+        conn.execute(f"""
+            INSERT INTO {table} (rowid, title_tokens, summary_tokens)
+            SELECT id, {TOKENS_FUNCTION}(title), {TOKENS_FUNCTION}(summary) FROM rss_items
+        """)
+    return True
@@ -11,9 +11,11 @@ import pytz
 import re
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
+from trendradar.storage.archive import ARCHIVE_FILENAME, NewsArchive
 from trendradar.storage.base import StorageBackend, NewsItem, NewsData, RSSItem, RSSData
+from trendradar.storage.connection import get_connection_manager, remove_db_files
 from trendradar.storage.sqlite_mixin import SQLiteStorageMixin
 from trendradar.utils.time import (
     DEFAULT_TIMEZONE,
@@ -39,6 +41,7 @@ class LocalStorageBackend(SQLiteStorageMixin, StorageBackend):
         enable_txt: bool = True,
         enable_html: bool = True,
         timezone: str = DEFAULT_TIMEZONE,
+        compact_rank_history: bool = False,
     ):
         """
         初始化本地存储后端
@@ -48,11 +51,13 @@ class LocalStorageBackend(SQLiteStorageMixin, StorageBackend):
             enable_txt: 是否启用 TXT 快照
             enable_html: 是否启用 HTML 报告
             timezone: 时区配置
+            compact_rank_history: 是否启用排名历史紧凑编码
         """
         self.data_dir = Path(data_dir)
         self.enable_txt = enable_txt
         self.enable_html = enable_html
         self.timezone = timezone
+        self.compact_rank_history = compact_rank_history
         self._db_connections: Dict[str, sqlite3.Connection] = {}
 
     @property
@@ -101,7 +106,7 @@ class LocalStorageBackend(SQLiteStorageMixin, StorageBackend):
 
     def _get_connection(self, date: Optional[str] = None, db_type: str = "news") -> sqlite3.Connection:
         """
-        获取数据库连接（带缓存）
+        获取数据库连接（带缓存，WAL 模式）
 
         Args:
             date: 日期字符串
@@ -113,8 +118,7 @@ class LocalStorageBackend(SQLiteStorageMixin, StorageBackend):
         db_path = str(self._get_db_path(date, db_type))
 
         if db_path not in self._db_connections:
-            conn = sqlite3.connect(db_path)
-            conn.row_factory = sqlite3.Row
+            conn = get_connection_manager().connect(db_path)
             self._init_tables(conn, db_type)
             self._db_connections[db_path] = conn
 
@@ -147,12 +151,26 @@ class LocalStorageBackend(SQLiteStorageMixin, StorageBackend):
 
         return success
 
-    def get_today_all_data(self, date: Optional[str] = None) -> Optional[NewsData]:
+    def get_today_all_data(
+        self, date: Optional[str] = None, include_timeline: bool = True
+    ) -> Optional[NewsData]:
         """获取指定日期的所有新闻数据（合并后）"""
         db_path = self._get_db_path(date)
         if not db_path.exists():
             return None
-        return self._get_today_all_data_impl(date)
+        return self._get_today_all_data_impl(date, include_timeline=include_timeline)
+
+    def iter_news_items(
+        self,
+        date: Optional[str] = None,
+        include_timeline: bool = True,
+        platform_ids: Optional[List[str]] = None,
+    ) -> Iterator[Tuple[str, str, List[NewsItem]]]:
+        """按平台流式读取指定日期的新闻条目"""
+        db_path = self._get_db_path(date)
+        if not db_path.exists():
+            return iter(())
+        return self._iter_news_items_impl(date, include_timeline, platform_ids)
 
     def get_latest_crawl_data(self, date: Optional[str] = None) -> Optional[NewsData]:
         """获取最新一次抓取的数据"""
@@ -179,6 +197,13 @@ class LocalStorageBackend(SQLiteStorageMixin, StorageBackend):
             return []
         return self._get_crawl_times_impl(date)
 
+    def get_source_change_stats(self, date: Optional[str] = None, db_type: str = "news") -> Dict[str, Dict]:
+        """获取各来源当天的抓取次数与内容变化次数"""
+        db_path = self._get_db_path(date, db_type=db_type)
+        if not db_path.exists():
+            return {}
+        return self._get_source_change_stats_impl(date, db_type)
+
     def has_pushed_today(self, date: Optional[str] = None) -> bool:
         """检查指定日期是否已推送过"""
         return self._has_pushed_today_impl(date)
@@ -358,6 +383,23 @@ class LocalStorageBackend(SQLiteStorageMixin, StorageBackend):
 
         self._db_connections.clear()
 
+    def archive_closed_days(self) -> int:
+        """
+        将已结束日期的热榜日库汇总到归档库（output/news/archive.db）
+
+        只处理尚未归档或归档后又被修改的日库，已是最新时只需检查文件签名。
+
+        Returns:
+            本次归档的日期数
+        """
+        news_dir = self.data_dir / "news"
+        try:
+            archive = NewsArchive(news_dir / ARCHIVE_FILENAME)
+            return archive.sync(news_dir, before_date=self._format_date_folder())
+        except Exception as e:
+            print(f"[本地存储] 归档失败: {e}")
+            return 0
+
     def cleanup_old_data(self, retention_days: int) -> int:
         """
         清理过期数据
@@ -419,9 +461,9 @@ class LocalStorageBackend(SQLiteStorageMixin, StorageBackend):
                             except Exception:
                                 pass
 
-                        # 删除文件
+                        # 删除文件（含 WAL 附属文件）
                         try:
-                            db_file.unlink()
+                            remove_db_files(db_file)
                             deleted_count += 1
                             print(f"[本地存储] 清理过期数据: {db_type}/{db_file.name}")
                         except Exception as e:
@@ -446,6 +488,11 @@ class LocalStorageBackend(SQLiteStorageMixin, StorageBackend):
                         except Exception as e:
                             print(f"[本地存储] 删除目录失败 {date_folder}: {e}")
 
+            # 归档库中同样删除过期日期（与日库按相同的日期判断）
+            archive = NewsArchive(self.data_dir / "news" / ARCHIVE_FILENAME)
+            if archive.exists:
+                archive.prune((cutoff_date + timedelta(days=1)).strftime("%Y-%m-%d"))
+
             if deleted_count > 0:
                 print(f"[本地存储] 共清理 {deleted_count} 个过期文件/目录")
 
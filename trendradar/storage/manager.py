@@ -6,7 +6,7 @@
 """
 
 import os
-from typing import Optional
+from typing import List, Optional
 
 from trendradar.storage.base import StorageBackend, NewsData, RSSData
 from trendradar.utils.time import DEFAULT_TIMEZONE
@@ -39,6 +39,8 @@ class StorageManager:
         pull_enabled: bool = False,
         pull_days: int = 0,
         timezone: str = DEFAULT_TIMEZONE,
+        compact_rank_history: bool = False,
+        archive_enabled: bool = False,
     ):
         """
         初始化存储管理器
@@ -54,6 +56,8 @@ class StorageManager:
             pull_enabled: 是否启用启动时自动拉取
             pull_days: 拉取最近 N 天的数据
             timezone: 时区配置
+            compact_rank_history: 是否启用排名历史紧凑编码
+            archive_enabled: 是否将已结束日期的日库汇总到跨天归档库
         """
         self.backend_type = backend_type
         self.data_dir = data_dir
@@ -65,6 +69,8 @@ class StorageManager:
         self.pull_enabled = pull_enabled
         self.pull_days = pull_days
         self.timezone = timezone
+        self.compact_rank_history = compact_rank_history
+        self.archive_enabled = archive_enabled
 
         self._backend: Optional[StorageBackend] = None
         self._remote_backend: Optional[StorageBackend] = None
@@ -138,6 +144,11 @@ class StorageManager:
                 enable_txt=self.enable_txt,
                 enable_html=self.enable_html,
                 timezone=self.timezone,
+                compact_rank_history=self.compact_rank_history,
+                delta_sync=self.remote_config.get("delta_sync", True),
+                part_size_mb=self.remote_config.get("part_size_mb", 8),
+                cache_dir=self.remote_config.get("cache_dir") or None,
+                cache_max_mb=self.remote_config.get("cache_max_mb", 512),
             )
         except ImportError as e:
             print(f"[存储管理器] 远程后端导入失败: {e}")
@@ -168,6 +179,7 @@ class StorageManager:
                     enable_txt=self.enable_txt,
                     enable_html=self.enable_html,
                     timezone=self.timezone,
+                    compact_rank_history=self.compact_rank_history,
                 )
                 print(f"[存储管理器] 使用本地存储后端 (数据目录: {self.data_dir})")
 
@@ -218,9 +230,20 @@ class StorageManager:
         """检测新增的 RSS 条目（增量模式）"""
         return self.get_backend().detect_new_rss_items(current_data)
 
-    def get_today_all_data(self, date: Optional[str] = None) -> Optional[NewsData]:
+    def get_today_all_data(
+        self, date: Optional[str] = None, include_timeline: bool = True
+    ) -> Optional[NewsData]:
         """获取当天所有数据"""
-        return self.get_backend().get_today_all_data(date)
+        return self.get_backend().get_today_all_data(date, include_timeline=include_timeline)
+
+    def iter_news_items(
+        self,
+        date: Optional[str] = None,
+        include_timeline: bool = True,
+        platform_ids: Optional[List[str]] = None,
+    ):
+        """按平台流式读取当天新闻条目，产出 (platform_id, platform_name, 条目列表)"""
+        return self.get_backend().iter_news_items(date, include_timeline, platform_ids)
 
     def get_latest_crawl_data(self, date: Optional[str] = None) -> Optional[NewsData]:
         """获取最新抓取数据"""
@@ -242,6 +265,10 @@ class StorageManager:
         """检查是否是当天第一次抓取"""
         return self.get_backend().is_first_crawl_today(date)
 
+    def get_source_change_stats(self, date: Optional[str] = None, db_type: str = "news") -> dict:
+        """获取各来源当天的抓取次数与内容变化次数"""
+        return self.get_backend().get_source_change_stats(date, db_type)
+
     def cleanup(self) -> None:
         """清理资源"""
         if self._backend:
@@ -271,6 +298,17 @@ class StorageManager:
 
         return total_deleted
 
+    def archive_closed_days(self) -> int:
+        """
+        将已结束日期的热榜日库汇总到跨天归档库（仅本地后端）
+
+        Returns:
+            本次归档的日期数
+        """
+        if not self.archive_enabled:
+            return 0
+        return self.get_backend().archive_closed_days()
+
     @property
     def backend_name(self) -> str:
         """获取当前后端名称"""
@@ -345,6 +383,8 @@ def get_storage_manager(
     pull_enabled: bool = False,
     pull_days: int = 0,
     timezone: str = DEFAULT_TIMEZONE,
+    compact_rank_history: bool = False,
+    archive_enabled: bool = False,
     force_new: bool = False,
 ) -> StorageManager:
     """
@@ -361,6 +401,8 @@ def get_storage_manager(
         pull_enabled: 是否启用启动时自动拉取
         pull_days: 拉取最近 N 天的数据
         timezone: 时区配置
+        compact_rank_history: 是否启用排名历史紧凑编码
+        archive_enabled: 是否启用跨天归档
         force_new: 是否强制创建新实例
 
     Returns:
@@ -380,6 +422,8 @@ def get_storage_manager(
             pull_enabled=pull_enabled,
             pull_days=pull_days,
             timezone=timezone,
+            compact_rank_history=compact_rank_history,
+            archive_enabled=archive_enabled,
         )
 
     return _storage_manager
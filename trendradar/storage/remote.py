@@ -12,10 +12,13 @@ import re
 import shutil
 import sys
 import tempfile
+import threading
+import time
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 try:
     import boto3
@@ -29,7 +32,11 @@ except ImportError:
     ClientError = Exception
 
 from trendradar.storage.base import StorageBackend, NewsItem, NewsData, RSSItem, RSSData
+from trendradar.storage.connection import get_connection_manager
+from trendradar.storage.delta_sync import DEFAULT_PART_SIZE, DeltaSync, RemoteState
+from trendradar.storage.remote_cache import DEFAULT_CACHE_MAX_MB, RemoteObjectCache
 from trendradar.storage.sqlite_mixin import SQLiteStorageMixin
+from trendradar.storage.transfer import MAX_TRANSFER_WORKERS, RemoteObject, download_resumable
 from trendradar.utils.time import (
     DEFAULT_TIMEZONE,
     get_configured_time,
@@ -38,6 +45,10 @@ from trendradar.utils.time import (
 )
 
 
+# 远程对象列表的缓存时间（秒），本进程上传或清理后立即失效
+LISTING_TTL_SECONDS = 300
+
+
 class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
     """
     远程云存储后端（S3 兼容协议）
@@ -62,6 +73,11 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
         enable_html: bool = True,
         temp_dir: Optional[str] = None,
         timezone: str = DEFAULT_TIMEZONE,
+        compact_rank_history: bool = False,
+        delta_sync: bool = True,
+        part_size_mb: int = DEFAULT_PART_SIZE // (1024 * 1024),
+        cache_dir: Optional[str] = None,
+        cache_max_mb: int = DEFAULT_CACHE_MAX_MB,
     ):
         """
         初始化远程存储后端
@@ -76,6 +92,11 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
             enable_html: 是否启用 HTML 报告
             temp_dir: 临时目录路径（默认使用系统临时目录）
             timezone: 时区配置
+            compact_rank_history: 是否启用排名历史紧凑编码（减小上传体积）
+            delta_sync: 是否启用增量同步（只上传变化的分块，见 delta_sync.py）
+            part_size_mb: 增量同步分块大小（MB，不小于 5）
+            cache_dir: 远程对象本地缓存目录（None 表示不缓存，见 remote_cache.py）
+            cache_max_mb: 本地缓存磁盘预算（MB）
         """
         if not HAS_BOTO3:
             raise ImportError("远程存储后端需要安装 boto3: pip install boto3")
@@ -86,6 +107,7 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
         self.enable_txt = enable_txt
         self.enable_html = enable_html
         self.timezone = timezone
+        self.compact_rank_history = compact_rank_history
 
         # 创建临时目录
         self.temp_dir = Path(temp_dir) if temp_dir else Path(tempfile.mkdtemp(prefix="trendradar_"))
@@ -119,6 +141,21 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
         self._downloaded_files: List[Path] = []
         self._db_connections: Dict[str, sqlite3.Connection] = {}
 
+        # 增量同步：记录每个远程对象下载/上传时的版本（ETag + 分块清单）
+        self._delta_sync = DeltaSync(
+            self.s3_client, bucket_name, part_size=part_size_mb * 1024 * 1024
+        ) if delta_sync else None
+        self._remote_states: Dict[str, RemoteState] = {}
+
+        # 本地缓存：远程对象未变化时直接复制缓存副本，跳过下载
+        self._cache = RemoteObjectCache(
+            cache_dir, cache_max_mb * 1024 * 1024
+        ) if cache_dir else None
+
+        # 远程对象列表缓存 {db_type: (列举时间, {日期: RemoteObject})}
+        self._listings: Dict[str, Tuple[float, Dict[str, RemoteObject]]] = {}
+        self._listings_lock = threading.Lock()
+
         print(f"[远程存储] 初始化完成，存储桶: {bucket_name}，签名版本: {signature_version}")
 
     @property
@@ -200,6 +237,106 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
             print(f"[远程存储] 检查对象存在性异常 ({r2_key}): {e}")
             return False
 
+    def _head_object(self, r2_key: str) -> Optional[Dict]:
+        """
+        获取远程对象元信息
+
+        Returns:
+            head_object 响应，对象不存在时返回 None
+        """
+        try:
+            return self.s3_client.head_object(Bucket=self.bucket_name, Key=r2_key)
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "")
+            if error_code not in ("404", "NoSuchKey", "Not Found"):
+                print(f"[远程存储] 获取对象信息失败 ({r2_key}): {e}")
+            return None
+        except Exception as e:
+            print(f"[远程存储] 获取对象信息异常 ({r2_key}): {e}")
+            return None
+
+    def _download_object(
+        self,
+        remote: RemoteObject,
+        local_path: Path,
+        head: Optional[Dict] = None,
+    ) -> RemoteState:
+        """
+        下载远程对象到本地路径（优先使用本地缓存）
+
+        缓存中有相同 ETag 和大小的副本时直接复制；启用增量同步且缓存中有旧副本时，
+        以旧副本为基准只下载变化的分块；否则可续传地完整下载。下载完成后写入缓存。
+
+        Args:
+            remote: 远程对象（列举或 HEAD 得到的键、大小、ETag）
+            local_path: 本地目标路径
+            head: head_object 响应（包含增量同步清单），None 时按需获取
+
+        Returns:
+            远程对象版本信息
+
+        Raises:
+            ClientError 等: 下载失败
+        """
+        r2_key = remote.key
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if self._cache:
+            cached = self._cache.lookup(r2_key, remote.etag, remote.size)
+            if cached:
+                self._cache.copy_to(cached, local_path)
+                state = DeltaSync.state_from_response(head) if head else RemoteState(remote.etag)
+                self._remote_states[r2_key] = state
+                print(f"[远程存储] 命中本地缓存，跳过下载: {r2_key}")
+                return state
+
+        base_path = self._cache.latest(r2_key) if self._cache and self._delta_sync else None
+        if base_path:
+            if head is None:
+                head = self._head_object(r2_key)
+            if head is None:
+                raise FileNotFoundError(f"远程对象不存在: {r2_key}")
+            state = DeltaSync.state_from_response(head)
+            self._delta_sync.download(r2_key, local_path, state, base_path=base_path)
+        else:
+            state = DeltaSync.state_from_response(head) if head else RemoteState(remote.etag)
+            resumed = download_resumable(self.s3_client, self.bucket_name, remote, local_path)
+            if resumed:
+                print(f"[远程存储] 续传: {r2_key}（已有 {resumed} bytes）")
+
+        self._remote_states[r2_key] = state
+        self._store_in_cache(r2_key, local_path, state)
+        return state
+
+    def _store_in_cache(self, r2_key: str, local_path: Path, state: Optional[RemoteState]) -> None:
+        """将与远程对象一致的本地文件写入缓存（缓存失败不影响主流程）"""
+        if not self._cache or state is None or not state.etag:
+            return
+        try:
+            self._cache.store(r2_key, state.etag, local_path.stat().st_size, local_path)
+        except Exception as e:
+            print(f"[远程存储] 写入本地缓存失败 ({r2_key}): {e}")
+
+    def fetch_object(self, remote_key: str, local_path: Path) -> bool:
+        """
+        下载远程对象到指定路径（经过本地缓存）
+
+        Args:
+            remote_key: 远程对象键，如 "news/2025-12-28.db"
+            local_path: 本地目标路径
+
+        Returns:
+            是否成功；远程对象不存在时返回 False
+
+        Raises:
+            ClientError 等: 下载失败
+        """
+        head = self._head_object(remote_key)
+        if head is None:
+            return False
+        self._download_object(RemoteObject.from_head(remote_key, head), Path(local_path), head)
+        return True
+
     def _download_sqlite(self, date: Optional[str] = None, db_type: str = "news") -> Optional[Path]:
         """
         从远程存储下载当天的 SQLite 文件到本地临时目录
@@ -220,6 +357,16 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
         # 确保目录存在
         local_path.parent.mkdir(parents=True, exist_ok=True)
 
+        if self._delta_sync or self._cache:
+            head = self._head_object(r2_key)
+            if head is None:
+                print(f"[远程存储] 文件不存在，将创建新数据库: {r2_key}")
+                return None
+            self._download_object(RemoteObject.from_head(r2_key, head), local_path, head)
+            self._downloaded_files.append(local_path)
+            print(f"[远程存储] 已下载: {r2_key} -> {local_path}")
+            return local_path
+
         # 先检查文件是否存在
         if not self._check_object_exists(r2_key):
             print(f"[远程存储] 文件不存在，将创建新数据库: {r2_key}")
@@ -266,6 +413,20 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
             print(f"[远程存储] 本地文件不存在，无法上传: {local_path}")
             return False
 
+        if self._delta_sync:
+            try:
+                state = self._delta_sync.upload(local_path, r2_key, self._remote_states.get(r2_key))
+            except Exception as e:
+                print(f"[远程存储] 上传失败: {e}")
+                return False
+            if state is None or not state.etag:
+                print(f"[远程存储] 上传验证失败: 未返回 ETag")
+                return False
+            self._remote_states[r2_key] = state
+            self._store_in_cache(r2_key, local_path, state)
+            self._invalidate_listing(db_type)
+            return True
+
         try:
             # 获取本地文件大小
             local_size = local_path.stat().st_size
@@ -278,7 +439,7 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
                 file_content = f.read()
 
             # 使用 put_object 并明确设置 ContentLength，确保不使用 chunked encoding
-            self.s3_client.put_object(
+            response = self.s3_client.put_object(
                 Bucket=self.bucket_name,
                 Key=r2_key,
                 Body=file_content,
@@ -290,6 +451,8 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
             # 验证上传成功
             if self._check_object_exists(r2_key):
                 print(f"[远程存储] 上传验证成功: {r2_key}")
+                self._store_in_cache(r2_key, local_path, RemoteState(response.get("ETag", "")))
+                self._invalidate_listing(db_type)
                 return True
             else:
                 print(f"[远程存储] 上传验证失败: 文件未在远程存储中找到")
@@ -321,8 +484,8 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
             if not local_path.exists():
                 self._download_sqlite(date, db_type)
 
-            conn = sqlite3.connect(db_path)
-            conn.row_factory = sqlite3.Row
+            # 数据库文件需要整体上传，不使用 WAL
+            conn = get_connection_manager().connect(db_path, wal=False)
             self._init_tables(conn, db_type)
             self._db_connections[db_path] = conn
 
@@ -378,9 +541,20 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
             print(f"[远程存储] 上传远程存储失败")
             return False
 
-    def get_today_all_data(self, date: Optional[str] = None) -> Optional[NewsData]:
+    def get_today_all_data(
+        self, date: Optional[str] = None, include_timeline: bool = True
+    ) -> Optional[NewsData]:
         """获取指定日期的所有新闻数据（合并后）"""
-        return self._get_today_all_data_impl(date)
+        return self._get_today_all_data_impl(date, include_timeline=include_timeline)
+
+    def iter_news_items(
+        self,
+        date: Optional[str] = None,
+        include_timeline: bool = True,
+        platform_ids: Optional[List[str]] = None,
+    ) -> Iterator[Tuple[str, str, List[NewsItem]]]:
+        """按平台流式读取指定日期的新闻条目"""
+        return self._iter_news_items_impl(date, include_timeline, platform_ids)
 
     def get_latest_crawl_data(self, date: Optional[str] = None) -> Optional[NewsData]:
         """获取最新一次抓取的数据"""
@@ -394,6 +568,10 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
         """检查是否是当天第一次抓取"""
         return self._is_first_crawl_today_impl(date)
 
+    def get_source_change_stats(self, date: Optional[str] = None, db_type: str = "news") -> Dict[str, Dict]:
+        """获取各来源当天的抓取次数与内容变化次数"""
+        return self._get_source_change_stats_impl(date, db_type)
+
     def has_pushed_today(self, date: Optional[str] = None) -> bool:
         """检查指定日期是否已推送过"""
         return self._has_pushed_today_impl(date)
@@ -708,6 +886,7 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
                         print(f"[远程存储] 批量删除失败: {e}")
 
                 deleted_count = len(deleted_dates)
+                self._invalidate_listing("news")
                 for date_str in sorted(deleted_dates):
                     print(f"[远程存储] 清理过期数据: news/{date_str}.db")
 
@@ -734,6 +913,113 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
     # 远程特有功能：数据拉取和列表
     # ========================================
 
+    def list_remote_objects(self, db_type: str = "news", refresh: bool = False) -> Dict[str, RemoteObject]:
+        """
+        列出远程存储中某类数据库的所有日期文件（结果缓存 LISTING_TTL_SECONDS 秒）
+
+        Args:
+            db_type: 数据库类型 ("news" 或 "rss")
+            refresh: 是否忽略缓存重新列举
+
+        Returns:
+            {日期: RemoteObject}
+
+        Raises:
+            ClientError 等: 列举失败
+        """
+        with self._listings_lock:
+            cached = self._listings.get(db_type)
+            if cached and not refresh and time.monotonic() - cached[0] < LISTING_TTL_SECONDS:
+                return cached[1]
+
+        objects: Dict[str, RemoteObject] = {}
+        pattern = re.compile(rf"{re.escape(db_type)}/(\d{{4}}-\d{{2}}-\d{{2}})\.db$")
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=f"{db_type}/"):
+            for entry in page.get('Contents', []):
+                date_match = pattern.match(entry['Key'])
+                if date_match:
+                    objects[date_match.group(1)] = RemoteObject.from_listing(entry)
+
+        with self._listings_lock:
+            self._listings[db_type] = (time.monotonic(), objects)
+        return objects
+
+    def _invalidate_listing(self, db_type: str) -> None:
+        """远程对象发生变化后使列表缓存失效"""
+        with self._listings_lock:
+            self._listings.pop(db_type, None)
+
+    def pull_dates(
+        self,
+        dates: List[str],
+        local_data_dir: str = "output",
+        db_types: Tuple[str, ...] = ("news", "rss"),
+        max_workers: int = MAX_TRANSFER_WORKERS,
+    ) -> Dict[str, List[Dict]]:
+        """
+        并发拉取指定日期的数据库到本地（output/{db_type}/{date}.db）
+
+        每类数据库只列举一次远程对象；本地已存在的文件跳过；
+        其余文件经过本地缓存并发下载，中断的下载在下次拉取时续传。
+
+        Args:
+            dates: 日期列表（YYYY-MM-DD）
+            local_data_dir: 本地数据目录
+            db_types: 拉取的数据库类型
+            max_workers: 最大并发下载数
+
+        Returns:
+            {
+                "pulled": [{"type", "date"}, ...],   # 本次下载（或从缓存复制）
+                "skipped": [{"type", "date"}, ...],  # 本地已存在
+                "missing": [{"type", "date"}, ...],  # 远程不存在
+                "failed": [{"type", "date", "error"}, ...],
+            }
+        """
+        result: Dict[str, List[Dict]] = {"pulled": [], "skipped": [], "missing": [], "failed": []}
+        tasks = []
+
+        for db_type in db_types:
+            try:
+                remote_objects = self.list_remote_objects(db_type)
+            except Exception as e:
+                print(f"[远程存储] 列出远程 {db_type} 数据失败: {e}")
+                for date_str in dates:
+                    result["failed"].append({"type": db_type, "date": date_str, "error": str(e)})
+                continue
+
+            type_dir = Path(local_data_dir) / db_type
+            for date_str in dates:
+                entry = {"type": db_type, "date": date_str}
+                local_db_path = type_dir / f"{date_str}.db"
+                if local_db_path.exists():
+                    result["skipped"].append(entry)
+                elif date_str not in remote_objects:
+                    result["missing"].append(entry)
+                else:
+                    tasks.append((entry, remote_objects[date_str], local_db_path))
+
+        def pull(task) -> Optional[str]:
+            _, remote, local_db_path = task
+            try:
+                self._download_object(remote, local_db_path)
+                return None
+            except Exception as e:
+                return str(e)
+
+        if tasks:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                for (entry, remote, local_db_path), error in zip(tasks, executor.map(pull, tasks)):
+                    if error is None:
+                        result["pulled"].append(entry)
+                        print(f"[远程存储] 已拉取: {remote.key} -> {local_db_path}")
+                    else:
+                        result["failed"].append({**entry, "error": error})
+                        print(f"[远程存储] 拉取失败 ({remote.key}): {error}")
+
+        return result
+
     def pull_recent_days(self, days: int, local_data_dir: str = "output") -> int:
         """
         从远程拉取最近 N 天的数据到本地
@@ -748,76 +1034,31 @@ class RemoteStorageBackend(SQLiteStorageMixin, StorageBackend):
         if days <= 0:
             return 0
 
-        local_dir = Path(local_data_dir)
-        local_dir.mkdir(parents=True, exist_ok=True)
-
-        pulled_count = 0
         now = self._get_configured_time()
+        dates = [(now - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
 
         print(f"[远程存储] 开始拉取最近 {days} 天的数据...")
+        result = self.pull_dates(dates, local_data_dir)
 
-        for i in range(days):
-            date = now - timedelta(days=i)
-            date_str = date.strftime("%Y-%m-%d")
-
-            # 本地目标路径
-            local_date_dir = local_dir / date_str
-            local_db_path = local_date_dir / "news.db"
-
-            # 如果本地已存在，跳过
-            if local_db_path.exists():
-                print(f"[远程存储] 跳过（本地已存在）: {date_str}")
-                continue
-
-            # 远程对象键
-            remote_key = f"news/{date_str}.db"
-
-            # 检查远程是否存在
-            if not self._check_object_exists(remote_key):
-                print(f"[远程存储] 跳过（远程不存在）: {date_str}")
-                continue
-
-            # 下载（使用 get_object + iter_chunks 处理 chunked encoding）
-            try:
-                local_date_dir.mkdir(parents=True, exist_ok=True)
-                response = self.s3_client.get_object(Bucket=self.bucket_name, Key=remote_key)
-                with open(local_db_path, 'wb') as f:
-                    for chunk in response['Body'].iter_chunks(chunk_size=1024*1024):
-                        f.write(chunk)
-                print(f"[远程存储] 已拉取: {remote_key} -> {local_db_path}")
-                pulled_count += 1
-            except Exception as e:
-                print(f"[远程存储] 拉取失败 ({date_str}): {e}")
+        for entry in result["skipped"]:
+            print(f"[远程存储] 跳过（本地已存在）: {entry['type']}/{entry['date']}")
 
+        pulled_count = len(result["pulled"])
         print(f"[远程存储] 拉取完成，共下载 {pulled_count} 个数据库文件")
         return pulled_count
 
-    def list_remote_dates(self) -> List[str]:
+    def list_remote_dates(self, db_type: str = "news") -> List[str]:
         """
         列出远程存储中所有可用的日期
 
+        Args:
+            db_type: 数据库类型 ("news" 或 "rss")
+
         Returns:
             日期字符串列表（YYYY-MM-DD 格式）
         """
-        dates = []
-
         try:
-            paginator = self.s3_client.get_paginator('list_objects_v2')
-            pages = paginator.paginate(Bucket=self.bucket_name, Prefix="news/")
-
-            for page in pages:
-                if 'Contents' not in page:
-                    continue
-
-                for obj in page['Contents']:
-                    key = obj['Key']
-                    # 解析日期
-                    date_match = re.match(r'news/(\d{4}-\d{2}-\d{2})\.db$', key)
-                    if date_match:
-                        dates.append(date_match.group(1))
-
-            return sorted(dates, reverse=True)
-
+            return sorted(self.list_remote_objects(db_type), reverse=True)
         except Exception as e:
             print(f"[远程存储] 列出远程日期失败: {e}")
             return []
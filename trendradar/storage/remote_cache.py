@@ -0,0 +1,235 @@
+# coding=utf-8
+"""
+远程对象本地缓存
+
+远程存储模式下每次运行都要下载当天的 SQLite 文件，即使它就是同一个运行环境
+半小时前上传的那一份。缓存按内容寻址保存远程对象的副本：
+- 副本文件名由 (ETag, 大小) 计算，远程对象的 HEAD 结果与缓存一致时直接复制副本，跳过下载
+- 上传成功后同样写入缓存（此时的 ETag 即下次运行 HEAD 得到的 ETag）
+- 远程对象已变化时，同一键的旧副本可作为增量下载的基准文件（见 delta_sync.py）
+- 按最近使用时间（LRU）淘汰，总大小不超过磁盘预算
+
+索引保存在缓存目录下的 index.db，副本保存在 objects/ 子目录。
+远程后端运行数据库、拉取历史数据（pull_recent_days、MCP sync_from_remote）共用同一缓存。
+"""
+
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+
+DEFAULT_CACHE_MAX_MB = 512
+
+INDEX_FILENAME = "index.db"
+OBJECTS_DIRNAME = "objects"
+
+
+def object_name(etag: str, size: int) -> str:
+    """根据 ETag 和大小计算副本文件名"""
+    return hashlib.blake2b(f"{etag}:{size}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+class RemoteObjectCache:
+    """
+    远程对象本地缓存（SQLite 索引，线程安全）
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], max_bytes: int = DEFAULT_CACHE_MAX_MB * 1024 * 1024):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 缓存目录
+            max_bytes: 磁盘预算（字节），副本总大小超过时按 LRU 淘汰
+        """
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / OBJECTS_DIRNAME
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max(0, int(max_bytes))
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.cache_dir / INDEX_FILENAME), timeout=5, check_same_thread=False
+        )
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                etag TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_cache_entries_name ON cache_entries(name)
+        """)
+        self._conn.commit()
+
+    def _object_path(self, name: str) -> Path:
+        return self.objects_dir / name
+
+    def lookup(self, key: str, etag: str, size: int) -> Optional[Path]:
+        """
+        查找与远程对象版本一致的副本
+
+        Args:
+            key: 远程对象键
+            etag: 远程对象 ETag（head_object 结果）
+            size: 远程对象大小
+
+        Returns:
+            副本路径，未命中时返回 None
+        """
+        if not etag:
+            return None
+        name = object_name(etag, size)
+        path = self._object_path(name)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT name FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if not row or row[0] != name:
+                return None
+            try:
+                valid = path.stat().st_size == size
+            except FileNotFoundError:
+                valid = False
+            if not valid:
+                # 副本丢失或不完整（被手动清理、写入中断），移除索引
+                self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE cache_entries SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+        return path
+
+    def latest(self, key: str) -> Optional[Path]:
+        """
+        获取指定键最近缓存的副本（不论版本），用作增量下载的基准文件
+
+        Returns:
+            副本路径，不存在时返回 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT name FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+        if not row:
+            return None
+        path = self._object_path(row[0])
+        return path if path.exists() else None
+
+    def store(self, key: str, etag: str, size: int, src_path: Union[str, Path]) -> Optional[Path]:
+        """
+        将本地文件保存为远程对象的副本
+
+        Args:
+            key: 远程对象键
+            etag: 远程对象 ETag
+            size: 远程对象大小（应与 src_path 文件大小一致）
+            src_path: 与远程对象内容一致的本地文件
+
+        Returns:
+            副本路径；ETag 为空、大小不一致或超出磁盘预算时返回 None
+        """
+        src_path = Path(src_path)
+        if not etag or not src_path.exists() or src_path.stat().st_size != size:
+            return None
+        if size > self.max_bytes:
+            return None
+
+        name = object_name(etag, size)
+        path = self._object_path(name)
+        if not path.exists() or path.stat().st_size != size:
+            tmp_path = path.with_name(f"{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                shutil.copyfile(src_path, tmp_path)
+                os.replace(tmp_path, path)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT name FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute("""
+                INSERT INTO cache_entries (key, name, etag, size, last_used)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    name = excluded.name,
+                    etag = excluded.etag,
+                    size = excluded.size,
+                    last_used = excluded.last_used
+            """, (key, name, etag, size, time.time()))
+            self._conn.commit()
+            if old and old[0] != name:
+                self._remove_unreferenced(old[0])
+            self._evict(keep=key)
+        return path
+
+    def _remove_unreferenced(self, name: str) -> None:
+        """删除不再被任何键引用的副本（需持有锁）"""
+        row = self._conn.execute(
+            "SELECT 1 FROM cache_entries WHERE name = ? LIMIT 1", (name,)
+        ).fetchone()
+        if row:
+            return
+        path = self._object_path(name)
+        if path.exists():
+            path.unlink()
+
+    def _evict(self, keep: str) -> None:
+        """按 LRU 淘汰，直到副本总大小不超过预算（需持有锁；不淘汰刚写入的键）"""
+        rows = self._conn.execute("""
+            SELECT key, name, size FROM cache_entries ORDER BY last_used
+        """).fetchall()
+        sizes = {}
+        for _, name, size in rows:
+            sizes[name] = size
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+
+        for key, name, _ in rows:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            still_used = self._conn.execute(
+                "SELECT 1 FROM cache_entries WHERE name = ? LIMIT 1", (name,)
+            ).fetchone()
+            if not still_used:
+                total -= sizes.get(name, 0)
+                path = self._object_path(name)
+                if path.exists():
+                    path.unlink()
+            print(f"[远程缓存] 淘汰: {key}")
+        self._conn.commit()
+
+    def copy_to(self, cached_path: Union[str, Path], local_path: Union[str, Path]) -> None:
+        """
+        将副本复制到目标路径（先写临时文件再替换，目标文件之后可自由修改）
+        """
+        local_path = Path(local_path)
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = local_path.with_name(local_path.name + ".part")
+        try:
+            shutil.copyfile(cached_path, tmp_path)
+            os.replace(tmp_path, local_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def close(self) -> None:
+        """关闭索引连接"""
+        with self._lock:
+            self._conn.close()
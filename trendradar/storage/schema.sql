@@ -46,6 +46,7 @@ CREATE TABLE IF NOT EXISTS title_changes (
 -- ============================================
 -- 排名历史表
 -- 记录每次抓取时的排名变化
+-- 启用紧凑编码（storage.compact_rank_history）后替换为同名视图，见 compact.py
 -- ============================================
 CREATE TABLE IF NOT EXISTS rank_history (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -117,5 +118,5 @@ CREATE UNIQUE INDEX IF NOT EXISTS idx_news_url_platform
 -- 抓取状态索引
 CREATE INDEX IF NOT EXISTS idx_crawl_status_record ON crawl_source_status(crawl_record_id);
 
--- 排名历史索引
-CREATE INDEX IF NOT EXISTS idx_rank_history_news ON rank_history(news_item_id);
+-- 排名历史索引（idx_rank_history_news）在 _init_tables 中创建：
+-- 紧凑编码下 rank_history 为视图，不能建立索引
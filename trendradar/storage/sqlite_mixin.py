@@ -9,9 +9,12 @@ import sqlite3
 from abc import abstractmethod
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from trendradar.storage.base import NewsItem, NewsData, RSSItem, RSSData
+from trendradar.storage.compact import compact_rank_history, is_compact
+from trendradar.storage.connection import get_connection_manager
+from trendradar.storage.fts import TOKENS_FUNCTION, ensure_fts_index
 from trendradar.utils.url import normalize_url
 
 
@@ -24,8 +27,16 @@ class SQLiteStorageMixin:
     - _get_configured_time() -> datetime
     - _format_date_folder(date) -> str
     - _format_time_filename() -> str
+
+    子类可设置 compact_rank_history 属性，启用排名历史紧凑编码
     """
 
+    # 是否将热榜数据库的 rank_history 迁移为紧凑编码
+    compact_rank_history: bool = False
+
+    # 当前 SQLite 是否支持并已建立标题全文索引（由 _init_tables 设置）
+    _fts_enabled: bool = False
+
     # ========================================
     # 抽象方法 - 子类必须实现
     # ========================================
@@ -85,6 +96,20 @@ class SQLiteStorageMixin:
         else:
             raise FileNotFoundError(f"Schema file not found: {schema_path}")
 
+        if db_type == "news":
+            if self.compact_rank_history:
+                migrated = compact_rank_history(conn)
+                if migrated:
+                    print(f"[存储] 排名历史已迁移为紧凑编码: {migrated} 条")
+            elif not is_compact(conn):
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_rank_history_news
+                    ON rank_history(news_item_id)
+                """)
+
+        # 标题全文索引（旧数据库首次打开时补建）
+        self._fts_enabled = ensure_fts_index(conn, db_type)
+
         conn.commit()
 
     # ========================================
@@ -95,6 +120,9 @@ class SQLiteStorageMixin:
         """
         保存新闻数据到 SQLite（核心实现）
 
+        本次抓取先写入临时暂存表，再以集合操作批量完成新增/更新（UPSERT）、
+        标题变化检测、排名历史和脱榜检测，语句数量不随条目数增长。
+
         Args:
             data: 新闻数据
             log_prefix: 日志前缀
@@ -102,8 +130,10 @@ class SQLiteStorageMixin:
         Returns:
             (success, new_count, updated_count, title_changed_count, off_list_count)
         """
+        conn = None
         try:
             conn = self._get_connection(data.date)
+            get_connection_manager().begin_write(conn, log_prefix)
             cursor = conn.cursor()
 
             # 获取配置时区的当前时间
@@ -123,153 +153,157 @@ class SQLiteStorageMixin:
             new_count = 0
             updated_count = 0
             title_changed_count = 0
-            success_sources = []
-
-            for source_id, news_list in data.items.items():
-                success_sources.append(source_id)
-
-                for item in news_list:
-                    try:
-                        # 标准化 URL（去除动态参数，如微博的 band_rank）
-                        normalized_url = normalize_url(item.url, source_id) if item.url else ""
-
-                        # 检查是否已存在（通过标准化 URL + platform_id）
-                        if normalized_url:
-                            cursor.execute("""
-                                SELECT id, title FROM news_items
-                                WHERE url = ? AND platform_id = ?
-                            """, (normalized_url, source_id))
-                            existing = cursor.fetchone()
+            success_sources = list(data.items.keys())
+            # 各平台上一次成功抓取的时间（分源调度时各平台抓取批次不同）
+            prev_times = self._get_prev_success_times(cursor, data.crawl_time)
+
+            # 响应未变化的平台：整体刷新上次的榜单（无需暂存和脱榜检测）
+            refreshed_sources = set()
+            for source_id in data.unchanged_ids:
+                if source_id not in data.items or not prev_times.get(source_id):
+                    continue
+                refreshed = self._refresh_unchanged_source(
+                    cursor, source_id, data.items[source_id],
+                    prev_times[source_id], data.crawl_time, now_str
+                )
+                if refreshed is not None:
+                    updated_count += refreshed
+                    refreshed_sources.add(source_id)
+
+            # 其余平台：暂存本次抓取后以集合操作批量写入
+            max_occurrence = self._stage_news_items(cursor, data, refreshed_sources)
+
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM title_changes")
+            max_change_id_before = cursor.fetchone()[0]
+
+            # 记录插入前的最大 ID，用于定位本次插入的 URL 为空的条目
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM news_items")
+            max_id_before = cursor.fetchone()[0]
+
+            # 按轮次写入：同一轮内每个平台的 URL 互不重复，本次抓取中重复出现的 URL
+            # 在后续轮次中作为更新处理（与逐条保存的结果一致）
+            for occurrence in range(max_occurrence + 1):
+                # 标题变化检测（同一 URL 下标题不同）
+                cursor.execute("""
+                    INSERT INTO title_changes
+                    (news_item_id, old_title, new_title, changed_at)
+                    SELECT n.id, n.title, s.title, ?
+                    FROM temp.news_stage s
+                    JOIN news_items n ON n.url = s.url AND n.platform_id = s.platform_id
+                    WHERE s.occurrence = ? AND s.url != '' AND n.title != s.title
+                    ORDER BY s.seq
+                """, (now_str, occurrence))
+                title_changed_count += cursor.rowcount
 
-                            if existing:
-                                # 已存在，更新记录
-                                existing_id, existing_title = existing
-
-                                # 检查标题是否变化
-                                if existing_title != item.title:
-                                    # 记录标题变更
-                                    cursor.execute("""
-                                        INSERT INTO title_changes
-                                        (news_item_id, old_title, new_title, changed_at)
-                                        VALUES (?, ?, ?, ?)
-                                    """, (existing_id, existing_title, item.title, now_str))
-                                    title_changed_count += 1
-
-                                # 记录排名历史
-                                cursor.execute("""
-                                    INSERT INTO rank_history
-                                    (news_item_id, rank, crawl_time, created_at)
-                                    VALUES (?, ?, ?, ?)
-                                """, (existing_id, item.rank, data.crawl_time, now_str))
+                cursor.execute("""
+                    SELECT
+                        COUNT(*),
+                        SUM(CASE WHEN s.url != '' AND EXISTS (
+                            SELECT 1 FROM news_items n
+                            WHERE n.url = s.url AND n.platform_id = s.platform_id
+                        ) THEN 1 ELSE 0 END)
+                    FROM temp.news_stage s
+                    WHERE s.occurrence = ?
+                """, (occurrence,))
+                staged_count, existing_count = cursor.fetchone()
+                existing_count = existing_count or 0
+                updated_count += existing_count
+                new_count += staged_count - existing_count
+
+                # 新增或更新（以标准化 URL + platform_id 去重，URL 为空的条目不参与唯一索引，总是插入）
+                cursor.execute("""
+                    INSERT INTO news_items
+                    (title, platform_id, rank, url, mobile_url,
+                     first_crawl_time, last_crawl_time, crawl_count,
+                     created_at, updated_at)
+                    SELECT title, platform_id, rank, url, mobile_url, ?, ?, 1, ?, ?
+                    FROM temp.news_stage
+                    WHERE occurrence = ?
+                    ORDER BY seq
+                    ON CONFLICT(url, platform_id) WHERE url != '' DO UPDATE SET
+                        title = excluded.title,
+                        rank = excluded.rank,
+                        mobile_url = excluded.mobile_url,
+                        last_crawl_time = excluded.last_crawl_time,
+                        crawl_count = crawl_count + 1,
+                        updated_at = excluded.updated_at
+                """, (data.crawl_time, data.crawl_time, now_str, now_str, occurrence))
 
-                                # 更新现有记录
-                                cursor.execute("""
-                                    UPDATE news_items SET
-                                        title = ?,
-                                        rank = ?,
-                                        mobile_url = ?,
-                                        last_crawl_time = ?,
-                                        crawl_count = crawl_count + 1,
-                                        updated_at = ?
-                                    WHERE id = ?
-                                """, (item.title, item.rank, item.mobile_url,
-                                      data.crawl_time, now_str, existing_id))
-                                updated_count += 1
-                            else:
-                                # 不存在，插入新记录（存储标准化后的 URL）
-                                cursor.execute("""
-                                    INSERT INTO news_items
-                                    (title, platform_id, rank, url, mobile_url,
-                                     first_crawl_time, last_crawl_time, crawl_count,
-                                     created_at, updated_at)
-                                    VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?, ?)
-                                """, (item.title, source_id, item.rank, normalized_url,
-                                      item.mobile_url, data.crawl_time, data.crawl_time,
-                                      now_str, now_str))
-                                new_id = cursor.lastrowid
-                                # 记录初始排名
-                                cursor.execute("""
-                                    INSERT INTO rank_history
-                                    (news_item_id, rank, crawl_time, created_at)
-                                    VALUES (?, ?, ?, ?)
-                                """, (new_id, item.rank, data.crawl_time, now_str))
-                                new_count += 1
-                        else:
-                            # URL 为空的情况，直接插入（不做去重）
-                            cursor.execute("""
-                                INSERT INTO news_items
-                                (title, platform_id, rank, url, mobile_url,
-                                 first_crawl_time, last_crawl_time, crawl_count,
-                                 created_at, updated_at)
-                                VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?, ?)
-                            """, (item.title, source_id, item.rank, "",
-                                  item.mobile_url, data.crawl_time, data.crawl_time,
-                                  now_str, now_str))
-                            new_id = cursor.lastrowid
-                            # 记录初始排名
-                            cursor.execute("""
-                                INSERT INTO rank_history
-                                (news_item_id, rank, crawl_time, created_at)
-                                VALUES (?, ?, ?, ?)
-                            """, (new_id, item.rank, data.crawl_time, now_str))
-                            new_count += 1
+                # 记录排名历史
+                cursor.execute("""
+                    INSERT INTO rank_history
+                    (news_item_id, rank, crawl_time, created_at)
+                    SELECT n.id, s.rank, ?, ?
+                    FROM temp.news_stage s
+                    JOIN news_items n ON n.url = s.url AND n.platform_id = s.platform_id
+                    WHERE s.occurrence = ? AND s.url != ''
+                    ORDER BY s.seq
+                """, (data.crawl_time, now_str, occurrence))
 
-                    except sqlite3.Error as e:
-                        print(f"{log_prefix} 保存新闻条目失败 [{item.title[:30]}...]: {e}")
+            cursor.execute("""
+                INSERT INTO rank_history
+                (news_item_id, rank, crawl_time, created_at)
+                SELECT id, rank, ?, ?
+                FROM news_items
+                WHERE id > ? AND url = ''
+                ORDER BY id
+            """, (data.crawl_time, now_str, max_id_before))
+
+            # 全文索引：只更新本次新增和标题变化的条目
+            if self._fts_enabled:
+                cursor.execute(f"""
+                    INSERT OR REPLACE INTO news_fts (rowid, title_tokens)
+                    SELECT id, {TOKENS_FUNCTION}(title) FROM news_items
+                    WHERE id > ? OR id IN (
+                        SELECT news_item_id FROM title_changes WHERE id > ?
+                    )
+                """, (max_id_before, max_change_id_before))
 
             total_items = new_count + updated_count
 
             # ========================================
             # 脱榜检测：检测上次在榜但这次不在榜的新闻
             # ========================================
-            off_list_count = 0
-
-            # 获取上一次抓取时间
+            # 本次在榜的条目 last_crawl_time 已更新为本次时间，
+            # 因此仍停留在该平台上次抓取时间的条目即为"第一次脱榜"（rank=0 表示脱榜）
+            off_list_sources = [
+                (source_id, prev_times[source_id])
+                for source_id in success_sources
+                if prev_times.get(source_id) and source_id not in refreshed_sources
+            ]
+            cursor.execute("DELETE FROM temp.news_prev_crawl")
+            cursor.executemany("""
+                INSERT INTO temp.news_prev_crawl (platform_id, crawl_time)
+                VALUES (?, ?)
+            """, off_list_sources)
+            # 先单独计数：紧凑编码下 rank_history 为视图，经触发器写入时 rowcount 恒为 0
             cursor.execute("""
-                SELECT crawl_time FROM crawl_records
-                WHERE crawl_time < ?
-                ORDER BY crawl_time DESC
-                LIMIT 1
-            """, (data.crawl_time,))
-            prev_record = cursor.fetchone()
-
-            if prev_record:
-                prev_crawl_time = prev_record[0]
-
-                # 对于每个成功抓取的平台，检测脱榜
-                for source_id in success_sources:
-                    # 获取当前抓取中该平台的所有标准化 URL
-                    current_urls = set()
-                    for item in data.items.get(source_id, []):
-                        normalized_url = normalize_url(item.url, source_id) if item.url else ""
-                        if normalized_url:
-                            current_urls.add(normalized_url)
-
-                    # 查询上次在榜（last_crawl_time = prev_crawl_time）但这次不在榜的新闻
-                    # 这些新闻是"第一次脱榜"，需要记录
-                    cursor.execute("""
-                        SELECT id, url FROM news_items
-                        WHERE platform_id = ?
-                          AND last_crawl_time = ?
-                          AND url != ''
-                    """, (source_id, prev_crawl_time))
-
-                    for row in cursor.fetchall():
-                        news_id, url = row[0], row[1]
-                        if url not in current_urls:
-                            # 插入脱榜记录（rank=0 表示脱榜）
-                            cursor.execute("""
-                                INSERT INTO rank_history
-                                (news_item_id, rank, crawl_time, created_at)
-                                VALUES (?, 0, ?, ?)
-                            """, (news_id, data.crawl_time, now_str))
-                            off_list_count += 1
-
-            # 记录抓取信息
+                SELECT COUNT(*)
+                FROM news_items n
+                JOIN temp.news_prev_crawl p
+                  ON n.platform_id = p.platform_id AND n.last_crawl_time = p.crawl_time
+                WHERE n.url != ''
+            """)
+            off_list_count = cursor.fetchone()[0]
+            if off_list_count:
+                cursor.execute("""
+                    INSERT INTO rank_history
+                    (news_item_id, rank, crawl_time, created_at)
+                    SELECT n.id, 0, ?, ?
+                    FROM news_items n
+                    JOIN temp.news_prev_crawl p
+                      ON n.platform_id = p.platform_id AND n.last_crawl_time = p.crawl_time
+                    WHERE n.url != ''
+                """, (data.crawl_time, now_str))
+
+            # 记录抓取信息（保留已有记录的 ID，排名历史紧凑编码以该 ID 引用抓取时间）
             cursor.execute("""
-                INSERT OR REPLACE INTO crawl_records
+                INSERT INTO crawl_records
                 (crawl_time, total_items, created_at)
                 VALUES (?, ?, ?)
+                ON CONFLICT(crawl_time) DO UPDATE SET
+                    total_items = excluded.total_items,
+                    created_at = excluded.created_at
             """, (data.crawl_time, total_items, now_str))
 
             # 获取刚插入的 crawl_record 的 ID
@@ -308,107 +342,280 @@ class SQLiteStorageMixin:
 
         except Exception as e:
             print(f"{log_prefix} 保存失败: {e}")
+            if conn is not None:
+                try:
+                    conn.rollback()
+                except sqlite3.Error:
+                    pass
             return False, 0, 0, 0, 0
 
-    def _get_today_all_data_impl(self, date: Optional[str] = None) -> Optional[NewsData]:
+    def _get_prev_success_times(self, cursor: sqlite3.Cursor, crawl_time: str) -> Dict[str, str]:
+        """获取各平台在指定时间之前最近一次成功抓取的时间"""
+        cursor.execute("""
+            SELECT css.platform_id, MAX(cr.crawl_time)
+            FROM crawl_source_status css
+            JOIN crawl_records cr ON css.crawl_record_id = cr.id
+            WHERE css.status = 'success'
+              AND cr.crawl_time < ?
+            GROUP BY css.platform_id
+        """, (crawl_time,))
+        return {row[0]: row[1] for row in cursor.fetchall() if row[1]}
+
+    def _stage_news_items(
+        self,
+        cursor: sqlite3.Cursor,
+        data: NewsData,
+        skip_sources: set,
+    ) -> int:
         """
-        获取指定日期的所有新闻数据（合并后）
+        将本次抓取的条目写入临时暂存表 temp.news_stage
+
+        URL 已标准化。同一平台同一 URL 在本次抓取中重复出现时全部保留，
+        按出现次序记为第 0、1、2… 轮（occurrence），由调用方逐轮写入，
+        与逐条保存时后出现的条目作为更新处理的行为一致。
 
         Args:
-            date: 日期字符串，默认为今天
+            cursor: 数据库游标
+            data: 新闻数据
+            skip_sources: 不需要暂存的平台（已走快速路径）
 
         Returns:
-            合并后的新闻数据
+            最大轮次（没有重复 URL 时为 0）
         """
-        try:
-            conn = self._get_connection(date)
-            cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS news_stage (
+                seq INTEGER PRIMARY KEY,
+                platform_id TEXT NOT NULL,
+                title TEXT NOT NULL,
+                rank INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                mobile_url TEXT,
+                occurrence INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        cursor.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS news_prev_crawl (
+                platform_id TEXT PRIMARY KEY,
+                crawl_time TEXT NOT NULL
+            )
+        """)
+        cursor.execute("DELETE FROM temp.news_stage")
+
+        rows = []
+        occurrences: Dict[tuple, int] = {}
+        max_occurrence = 0
+        for source_id, news_list in data.items.items():
+            if source_id in skip_sources:
+                continue
+            for item in news_list:
+                # 标准化 URL（去除动态参数，如微博的 band_rank）
+                normalized_url = normalize_url(item.url, source_id) if item.url else ""
+                occurrence = 0
+                if normalized_url:
+                    key = (source_id, normalized_url)
+                    occurrence = occurrences.get(key, -1) + 1
+                    occurrences[key] = occurrence
+                    max_occurrence = max(max_occurrence, occurrence)
+                rows.append((
+                    source_id, item.title, item.rank, normalized_url, item.mobile_url, occurrence
+                ))
 
-            # 获取所有新闻数据（包含 id 用于查询排名历史）
-            cursor.execute("""
-                SELECT n.id, n.title, n.platform_id, p.name as platform_name,
-                       n.rank, n.url, n.mobile_url,
-                       n.first_crawl_time, n.last_crawl_time, n.crawl_count
-                FROM news_items n
-                LEFT JOIN platforms p ON n.platform_id = p.id
-                ORDER BY n.platform_id, n.last_crawl_time
-            """)
+        cursor.executemany("""
+            INSERT INTO temp.news_stage (platform_id, title, rank, url, mobile_url, occurrence)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, rows)
+        return max_occurrence
+
+    def _refresh_unchanged_source(
+        self,
+        cursor: sqlite3.Cursor,
+        source_id: str,
+        news_list: List[NewsItem],
+        prev_crawl_time: str,
+        crawl_time: str,
+        now_str: str,
+    ) -> Optional[int]:
+        """
+        平台响应与上次相同时，整体刷新上次的榜单
 
-            rows = cursor.fetchall()
-            if not rows:
-                return None
+        先用一次查询确认上次在榜的记录与本次条目逐一对应（URL、标题、排名均相同），
+        再批量更新 news_items 并批量写入 rank_history，代替逐条查询和更新。
 
-            # 收集所有 news_item_id
-            news_ids = [row[0] for row in rows]
+        Returns:
+            刷新的条目数；与上次榜单不一致时返回 None（由调用方走逐条保存）
+        """
+        current = {}
+        for item in news_list:
+            if not item.url:
+                return None
+            current[normalize_url(item.url, source_id)] = (item.title, item.rank)
+        if len(current) != len(news_list):
+            return None
 
-            # 批量查询排名历史（同时获取时间和排名）
-            # 过滤逻辑：只保留 last_crawl_time 之前的脱榜记录（rank=0）
-            # 这样可以避免显示新闻永久脱榜后的无意义记录
-            rank_history_map: Dict[int, List[int]] = {}
-            rank_timeline_map: Dict[int, List[Dict[str, Any]]] = {}
-            if news_ids:
-                placeholders = ",".join("?" * len(news_ids))
-                cursor.execute(f"""
-                    SELECT rh.news_item_id, rh.rank, rh.crawl_time
-                    FROM rank_history rh
-                    JOIN news_items ni ON rh.news_item_id = ni.id
-                    WHERE rh.news_item_id IN ({placeholders})
-                      AND NOT (rh.rank = 0 AND rh.crawl_time > ni.last_crawl_time)
-                    ORDER BY rh.news_item_id, rh.crawl_time
-                """, news_ids)
-                for rh_row in cursor.fetchall():
-                    news_id, rank, crawl_time = rh_row[0], rh_row[1], rh_row[2]
+        cursor.execute("""
+            SELECT id, url, title, rank FROM news_items
+            WHERE platform_id = ?
+              AND last_crawl_time = ?
+              AND url != ''
+        """, (source_id, prev_crawl_time))
+        rows = cursor.fetchall()
+        previous = {row[1]: (row[2], row[3]) for row in rows}
+        if previous != current:
+            return None
 
-                    # 构建 ranks 列表（去重，排除脱榜记录 rank=0）
-                    if news_id not in rank_history_map:
-                        rank_history_map[news_id] = []
-                    if rank != 0 and rank not in rank_history_map[news_id]:
-                        rank_history_map[news_id].append(rank)
+        cursor.execute("""
+            UPDATE news_items SET
+                last_crawl_time = ?,
+                crawl_count = crawl_count + 1,
+                updated_at = ?
+            WHERE platform_id = ?
+              AND last_crawl_time = ?
+              AND url != ''
+        """, (crawl_time, now_str, source_id, prev_crawl_time))
+
+        cursor.executemany("""
+            INSERT INTO rank_history
+            (news_item_id, rank, crawl_time, created_at)
+            VALUES (?, ?, ?, ?)
+        """, [(row[0], row[3], crawl_time, now_str) for row in rows])
+
+        return len(rows)
+
+    def _iter_news_items_impl(
+        self,
+        date: Optional[str] = None,
+        include_timeline: bool = True,
+        platform_ids: Optional[List[str]] = None,
+    ) -> Iterator[tuple[str, str, List[NewsItem]]]:
+        """
+        按平台流式读取指定日期的新闻条目（含排名历史）
 
-                    # 构建 rank_timeline 列表（完整时间线，包含脱榜）
-                    if news_id not in rank_timeline_map:
-                        rank_timeline_map[news_id] = []
-                    # 提取时间部分（HH:MM）
-                    time_part = crawl_time.split()[1][:5] if ' ' in crawl_time else crawl_time[:5]
-                    rank_timeline_map[news_id].append({
-                        "time": time_part,
-                        "rank": rank if rank != 0 else None  # 0 转为 None 表示脱榜
-                    })
+        news_items 与 rank_history 在一次有序查询中关联，逐行构建条目，
+        每处理完一个平台即产出该平台的条目列表，无需 IN (...) 参数列表。
+        排名历史只保留 last_crawl_time 之前的脱榜记录（rank=0），
+        避免显示新闻永久脱榜后的无意义记录。
 
-            # 按 platform_id 分组
-            items: Dict[str, List[NewsItem]] = {}
-            id_to_name: Dict[str, str] = {}
-            crawl_date = self._format_date_folder(date)
+        Args:
+            date: 日期字符串，默认为今天
+            include_timeline: 是否构建 rank_timeline（不需要时可跳过以节省内存）
+            platform_ids: 只读取指定平台，None 表示全部
 
-            for row in rows:
-                news_id = row[0]
+        Yields:
+            (platform_id, platform_name, 条目列表)
+        """
+        conn = self._get_connection(date)
+        cursor = conn.cursor()
+
+        platform_filter = ""
+        params: List[Any] = []
+        if platform_ids is not None:
+            if not platform_ids:
+                return
+            platform_filter = f"WHERE n.platform_id IN ({','.join('?' * len(platform_ids))})"
+            params = list(platform_ids)
+
+        cursor.execute(f"""
+            SELECT n.id, n.title, n.platform_id, p.name as platform_name,
+                   n.rank, n.url, n.mobile_url,
+                   n.first_crawl_time, n.last_crawl_time, n.crawl_count,
+                   rh.rank, rh.crawl_time
+            FROM news_items n
+            LEFT JOIN platforms p ON n.platform_id = p.id
+            LEFT JOIN rank_history rh
+              ON rh.news_item_id = n.id
+             AND NOT (rh.rank = 0 AND rh.crawl_time > n.last_crawl_time)
+            {platform_filter}
+            ORDER BY n.platform_id, n.last_crawl_time, n.id, rh.crawl_time
+        """, params)
+
+        current_platform = None
+        current_name = ""
+        news_list: List[NewsItem] = []
+        item: Optional[NewsItem] = None
+        item_id = None
+
+        for row in cursor:
+            news_id = row[0]
+            if news_id != item_id:
                 platform_id = row[2]
-                title = row[1]
-                platform_name = row[3] or platform_id
-
-                id_to_name[platform_id] = platform_name
-
-                if platform_id not in items:
-                    items[platform_id] = []
-
-                # 获取排名历史，如果没有则使用当前排名
-                ranks = rank_history_map.get(news_id, [row[4]])
-                rank_timeline = rank_timeline_map.get(news_id, [])
-
-                items[platform_id].append(NewsItem(
-                    title=title,
+                if platform_id != current_platform:
+                    if current_platform is not None:
+                        yield current_platform, current_name, news_list
+                    current_platform = platform_id
+                    current_name = row[3] or platform_id
+                    news_list = []
+
+                item_id = news_id
+                item = NewsItem(
+                    title=row[1],
                     source_id=platform_id,
-                    source_name=platform_name,
+                    source_name=current_name,
                     rank=row[4],
                     url=row[5] or "",
                     mobile_url=row[6] or "",
                     crawl_time=row[8],  # last_crawl_time
-                    ranks=ranks,
+                    ranks=[],
                     first_time=row[7],  # first_crawl_time
                     last_time=row[8],   # last_crawl_time
                     count=row[9],       # crawl_count
-                    rank_timeline=rank_timeline,
-                ))
+                )
+                news_list.append(item)
+
+                if row[10] is None:
+                    # 没有排名历史，使用当前排名
+                    item.ranks = [row[4]]
+                    continue
+
+            rank, crawl_time = row[10], row[11]
+
+            # 构建 ranks 列表（去重，排除脱榜记录 rank=0）
+            if rank != 0 and rank not in item.ranks:
+                item.ranks.append(rank)
+
+            # 构建 rank_timeline 列表（完整时间线，包含脱榜）
+            if include_timeline:
+                # 提取时间部分（HH:MM）
+                time_part = crawl_time.split()[1][:5] if ' ' in crawl_time else crawl_time[:5]
+                item.rank_timeline.append({
+                    "time": time_part,
+                    "rank": rank if rank != 0 else None  # 0 转为 None 表示脱榜
+                })
+
+        if current_platform is not None:
+            yield current_platform, current_name, news_list
+
+    def _get_today_all_data_impl(
+        self,
+        date: Optional[str] = None,
+        include_timeline: bool = True,
+    ) -> Optional[NewsData]:
+        """
+        获取指定日期的所有新闻数据（合并后）
+
+        Args:
+            date: 日期字符串，默认为今天
+            include_timeline: 是否构建 rank_timeline
+
+        Returns:
+            合并后的新闻数据
+        """
+        try:
+            conn = self._get_connection(date)
+            cursor = conn.cursor()
+
+            # 按 platform_id 分组
+            items: Dict[str, List[NewsItem]] = {}
+            id_to_name: Dict[str, str] = {}
+            crawl_date = self._format_date_folder(date)
+
+            for platform_id, platform_name, news_list in self._iter_news_items_impl(
+                date, include_timeline=include_timeline
+            ):
+                id_to_name[platform_id] = platform_name
+                items[platform_id] = news_list
+
+            if not items:
+                return None
 
             final_items = items
 
@@ -443,10 +650,51 @@ class SQLiteStorageMixin:
             print(f"[存储] 读取数据失败: {e}")
             return None
 
+    def _get_source_latest_times(
+        self, cursor: sqlite3.Cursor, db_type: str = "news"
+    ) -> tuple[Dict[str, str], List[str]]:
+        """
+        获取各来源最近一次成功抓取的时间
+
+        Args:
+            cursor: 数据库游标
+            db_type: 数据库类型（"news" 或 "rss"）
+
+        Returns:
+            ({来源ID: 最近成功抓取时间}, 最近一次抓取失败的来源ID列表)
+        """
+        if db_type == "rss":
+            cursor.execute("""
+                SELECT cs.feed_id, cs.status, cr.crawl_time
+                FROM rss_crawl_status cs
+                JOIN rss_crawl_records cr ON cs.crawl_record_id = cr.id
+                ORDER BY cr.crawl_time
+            """)
+        else:
+            cursor.execute("""
+                SELECT css.platform_id, css.status, cr.crawl_time
+                FROM crawl_source_status css
+                JOIN crawl_records cr ON css.crawl_record_id = cr.id
+                ORDER BY cr.crawl_time
+            """)
+
+        source_times: Dict[str, str] = {}
+        latest_status: Dict[str, str] = {}
+        for source_id, status, crawl_time in cursor.fetchall():
+            latest_status[source_id] = status
+            if status == "success":
+                source_times[source_id] = crawl_time
+
+        failed_ids = [sid for sid, status in latest_status.items() if status == "failed"]
+        return source_times, failed_ids
+
     def _get_latest_crawl_data_impl(self, date: Optional[str] = None) -> Optional[NewsData]:
         """
         获取最新一次抓取的数据
 
+        每个平台取其最近一次成功抓取的榜单（分源调度时各平台抓取批次不同），
+        最近一次抓取失败的平台计入 failed_ids。
+
         Args:
             date: 日期字符串，默认为今天
 
@@ -470,17 +718,27 @@ class SQLiteStorageMixin:
 
             latest_time = time_row[0]
 
-            # 获取该时间的新闻数据（包含 id 用于查询排名历史）
-            cursor.execute("""
+            # 各平台最近一次成功抓取的时间
+            source_times, failed_ids = self._get_source_latest_times(cursor, "news")
+            if not source_times:
+                return None
+
+            # 获取各平台最新榜单的新闻数据（包含 id 用于查询排名历史）
+            crawl_times = sorted(set(source_times.values()))
+            placeholders = ",".join("?" * len(crawl_times))
+            cursor.execute(f"""
                 SELECT n.id, n.title, n.platform_id, p.name as platform_name,
                        n.rank, n.url, n.mobile_url,
                        n.first_crawl_time, n.last_crawl_time, n.crawl_count
                 FROM news_items n
                 LEFT JOIN platforms p ON n.platform_id = p.id
-                WHERE n.last_crawl_time = ?
-            """, (latest_time,))
+                WHERE n.last_crawl_time IN ({placeholders})
+            """, crawl_times)
 
-            rows = cursor.fetchall()
+            rows = [
+                row for row in cursor.fetchall()
+                if source_times.get(row[2]) == row[8]
+            ]
             if not rows:
                 return None
 
@@ -553,16 +811,6 @@ class SQLiteStorageMixin:
                     rank_timeline=rank_timeline,
                 ))
 
-            # 获取失败的来源（针对最新一次抓取）
-            cursor.execute("""
-                SELECT css.platform_id
-                FROM crawl_source_status css
-                JOIN crawl_records cr ON css.crawl_record_id = cr.id
-                WHERE cr.crawl_time = ? AND css.status = 'failed'
-            """, (latest_time,))
-
-            failed_ids = [row[0] for row in cursor.fetchall()]
-
             return NewsData(
                 date=crawl_date,
                 crawl_time=latest_time,
@@ -582,6 +830,10 @@ class SQLiteStorageMixin:
         该方法比较当前抓取数据与历史数据，找出新增的标题。
         关键逻辑：只有在历史批次中从未出现过的标题才算新增。
 
+        只查询本次抓取的 (platform_id, title) 是否在之前的批次中出现过
+        （first_crawl_time < 当前时间），借助标题索引逐条定位，
+        开销只与本次抓取的条目数相关，不随当天累计数据增长。
+
         Args:
             current_data: 当前抓取的数据
 
@@ -589,41 +841,60 @@ class SQLiteStorageMixin:
             新增的标题数据 {source_id: {title: NewsItem}}
         """
         try:
-            # 获取历史数据
-            historical_data = self._get_today_all_data_impl(current_data.date)
+            conn = self._get_connection(current_data.date)
+            cursor = conn.cursor()
+            current_time = current_data.crawl_time
 
-            if not historical_data:
+            cursor.execute("SELECT EXISTS(SELECT 1 FROM news_items)")
+            if not cursor.fetchone()[0]:
                 # 没有历史数据，所有都是新的
                 new_titles = {}
                 for source_id, news_list in current_data.items.items():
                     new_titles[source_id] = {item.title: item for item in news_list}
                 return new_titles
 
-            # 获取当前批次时间
-            current_time = current_data.crawl_time
-
             # 收集历史标题（first_time < current_time 的标题）
             # 这样可以正确处理同一标题因 URL 变化而产生多条记录的情况
-            historical_titles: Dict[str, set] = {}
-            for source_id, news_list in historical_data.items.items():
-                historical_titles[source_id] = set()
-                for item in news_list:
-                    first_time = getattr(item, 'first_time', item.crawl_time)
-                    if first_time < current_time:
-                        historical_titles[source_id].add(item.title)
-
-            # 检查是否有历史数据
-            has_historical_data = any(len(titles) > 0 for titles in historical_titles.values())
-            if not has_historical_data:
+            cursor.execute("""
+                SELECT EXISTS(SELECT 1 FROM news_items WHERE first_crawl_time < ?)
+            """, (current_time,))
+            if not cursor.fetchone()[0]:
                 # 第一次抓取，没有"新增"概念
                 return {}
 
+            cursor.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS title_probe (
+                    platform_id TEXT NOT NULL,
+                    title TEXT NOT NULL
+                )
+            """)
+            cursor.execute("DELETE FROM temp.title_probe")
+            cursor.executemany("""
+                INSERT INTO temp.title_probe (platform_id, title) VALUES (?, ?)
+            """, [
+                (source_id, item.title)
+                for source_id, news_list in current_data.items.items()
+                for item in news_list
+            ])
+            cursor.execute("""
+                SELECT DISTINCT p.platform_id, p.title
+                FROM temp.title_probe p
+                WHERE EXISTS (
+                    SELECT 1 FROM news_items n
+                    WHERE n.title = p.title
+                      AND n.platform_id = p.platform_id
+                      AND n.first_crawl_time < ?
+                )
+            """, (current_time,))
+            seen = {(row[0], row[1]) for row in cursor.fetchall()}
+            cursor.execute("DELETE FROM temp.title_probe")
+            conn.commit()
+
             # 检测新增
             new_titles = {}
             for source_id, news_list in current_data.items.items():
-                hist_set = historical_titles.get(source_id, set())
                 for item in news_list:
-                    if item.title not in hist_set:
+                    if (source_id, item.title) not in seen:
                         if source_id not in new_titles:
                             new_titles[source_id] = {}
                         new_titles[source_id][item.title] = item
@@ -688,6 +959,90 @@ class SQLiteStorageMixin:
             print(f"[存储] 获取抓取时间列表失败: {e}")
             return []
 
+    def _get_source_change_stats_impl(
+        self, date: Optional[str] = None, db_type: str = "news"
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        获取各来源当天的抓取次数与内容变化次数（供自适应调度学习变化频率）
+
+        - 热榜：某次成功抓取中出现新标题、排名变动或脱榜（来自 rank_history），记为一次变化
+        - RSS：某次成功抓取中出现新条目（rss_items.first_crawl_time），记为一次变化
+        当天首次抓取不计入变化。
+
+        Args:
+            date: 日期字符串，默认为今天
+            db_type: 数据库类型（"news" 或 "rss"）
+
+        Returns:
+            {来源ID: {"crawls": 成功抓取次数, "changes": 变化次数,
+                      "first_time": 首次成功抓取时间, "last_time": 最近成功抓取时间,
+                      "failed": 最近一次抓取是否失败（仅失败时存在）}}
+        """
+        try:
+            conn = self._get_connection(date, db_type=db_type)
+            cursor = conn.cursor()
+
+            if db_type == "rss":
+                cursor.execute("""
+                    SELECT cs.feed_id, COUNT(*), MIN(cr.crawl_time), MAX(cr.crawl_time)
+                    FROM rss_crawl_status cs
+                    JOIN rss_crawl_records cr ON cs.crawl_record_id = cr.id
+                    WHERE cs.status = 'success'
+                    GROUP BY cs.feed_id
+                """)
+            else:
+                cursor.execute("""
+                    SELECT css.platform_id, COUNT(*), MIN(cr.crawl_time), MAX(cr.crawl_time)
+                    FROM crawl_source_status css
+                    JOIN crawl_records cr ON css.crawl_record_id = cr.id
+                    WHERE css.status = 'success'
+                    GROUP BY css.platform_id
+                """)
+
+            stats: Dict[str, Dict[str, Any]] = {}
+            for source_id, crawls, first_time, last_time in cursor.fetchall():
+                stats[source_id] = {
+                    "crawls": crawls,
+                    "changes": 0,
+                    "first_time": first_time,
+                    "last_time": last_time,
+                }
+
+            if db_type == "rss":
+                cursor.execute("""
+                    SELECT DISTINCT feed_id, first_crawl_time FROM rss_items
+                """)
+            else:
+                # 新标题（无上一条记录）、排名变动、脱榜（rank=0）均视为变化
+                cursor.execute("""
+                    SELECT DISTINCT platform_id, crawl_time FROM (
+                        SELECT n.platform_id, rh.crawl_time, rh.rank,
+                               LAG(rh.rank) OVER (
+                                   PARTITION BY rh.news_item_id ORDER BY rh.crawl_time
+                               ) AS prev_rank
+                        FROM rank_history rh
+                        JOIN news_items n ON rh.news_item_id = n.id
+                    )
+                    WHERE prev_rank IS NULL OR rank != prev_rank
+                """)
+
+            for source_id, crawl_time in cursor.fetchall():
+                source_stats = stats.get(source_id)
+                if source_stats and crawl_time != source_stats["first_time"]:
+                    source_stats["changes"] += 1
+
+            # 最近一次抓取失败的来源
+            _, failed_ids = self._get_source_latest_times(cursor, db_type)
+            for source_id in failed_ids:
+                if source_id in stats:
+                    stats[source_id]["failed"] = True
+
+            return stats
+
+        except Exception as e:
+            print(f"[存储] 获取来源变化统计失败: {e}")
+            return {}
+
     # ========================================
     # 推送记录
     # ========================================
@@ -941,8 +1296,10 @@ class SQLiteStorageMixin:
         Returns:
             (success, new_count, updated_count)
         """
+        conn = None
         try:
             conn = self._get_connection(data.date, db_type="rss")
+            get_connection_manager().begin_write(conn, log_prefix)
             cursor = conn.cursor()
 
             now_str = self._get_configured_time().strftime("%Y-%m-%d %H:%M:%S")
@@ -1030,6 +1387,14 @@ class SQLiteStorageMixin:
 
             total_items = new_count + updated_count
 
+            # 全文索引：更新本次写入的条目（标题、摘要可能变化）
+            if self._fts_enabled:
+                cursor.execute(f"""
+                    INSERT OR REPLACE INTO rss_fts (rowid, title_tokens, summary_tokens)
+                    SELECT id, {TOKENS_FUNCTION}(title), {TOKENS_FUNCTION}(summary)
+                    FROM rss_items WHERE updated_at = ?
+                """, (now_str,))
+
             # 记录抓取信息
             cursor.execute("""
                 INSERT OR REPLACE INTO rss_crawl_records
@@ -1072,6 +1437,11 @@ class SQLiteStorageMixin:
 
         except Exception as e:
             print(f"{log_prefix} 保存 RSS 数据失败: {e}")
+            if conn is not None:
+                try:
+                    conn.rollback()
+                except sqlite3.Error:
+                    pass
             return False, 0, 0
 
     def _get_rss_data_impl(self, date: Optional[str] = None) -> Optional[RSSData]:
@@ -1220,6 +1590,8 @@ class SQLiteStorageMixin:
         """
         获取最新一次抓取的 RSS 数据（当前榜单模式）
 
+        每个源取其最近一次成功抓取的条目，最近一次抓取失败的源计入 failed_ids。
+
         Args:
             date: 日期字符串（YYYY-MM-DD），默认为今天
 
@@ -1243,18 +1615,28 @@ class SQLiteStorageMixin:
 
             latest_time = time_row[0]
 
-            # 获取该时间的 RSS 数据
-            cursor.execute("""
+            # 各源最近一次成功抓取的时间
+            source_times, failed_ids = self._get_source_latest_times(cursor, "rss")
+            if not source_times:
+                return None
+
+            # 获取各源最新一次抓取的 RSS 数据
+            crawl_times = sorted(set(source_times.values()))
+            placeholders = ",".join("?" * len(crawl_times))
+            cursor.execute(f"""
                 SELECT i.id, i.title, i.feed_id, f.name as feed_name,
                        i.url, i.published_at, i.summary, i.author,
                        i.first_crawl_time, i.last_crawl_time, i.crawl_count
                 FROM rss_items i
                 LEFT JOIN rss_feeds f ON i.feed_id = f.id
-                WHERE i.last_crawl_time = ?
+                WHERE i.last_crawl_time IN ({placeholders})
                 ORDER BY i.published_at DESC
-            """, (latest_time,))
+            """, crawl_times)
 
-            rows = cursor.fetchall()
+            rows = [
+                row for row in cursor.fetchall()
+                if source_times.get(row[2]) == row[9]
+            ]
             if not rows:
                 return None
 
@@ -1285,16 +1667,6 @@ class SQLiteStorageMixin:
                     count=row[10],
                 ))
 
-            # 获取失败的源（针对最新一次抓取）
-            cursor.execute("""
-                SELECT cs.feed_id
-                FROM rss_crawl_status cs
-                JOIN rss_crawl_records cr ON cs.crawl_record_id = cr.id
-                WHERE cr.crawl_time = ? AND cs.status = 'failed'
-            """, (latest_time,))
-
-            failed_ids = [row[0] for row in cursor.fetchall()]
-
             return RSSData(
                 date=crawl_date,
                 crawl_time=latest_time,
@@ -0,0 +1,120 @@
+# coding=utf-8
+"""
+远程对象批量传输
+
+拉取多天数据（pull_recent_days、MCP sync_from_remote）时：
+- 一次列举（list_objects_v2）即可得到每个对象的大小和 ETag，无需逐个 HEAD
+- 多个对象并发下载，并发数有上限
+- 下载先写入以 ETag 命名的 .part 文件，中断后再次拉取时按 Range 续传；
+  远程对象已变化（ETag 不同）时丢弃旧的部分文件
+"""
+
+import glob
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Union
+
+try:
+    from botocore.exceptions import ClientError
+except ImportError:
+    ClientError = Exception
+
+
+# 并发下载的对象数
+MAX_TRANSFER_WORKERS = 8
+
+
+@dataclass
+class RemoteObject:
+    """远程对象（列举或 HEAD 结果）"""
+
+    key: str
+    size: int
+    etag: str = ""
+
+    @classmethod
+    def from_head(cls, key: str, response: dict) -> "RemoteObject":
+        """从 head_object 响应构造"""
+        return cls(key, int(response.get("ContentLength", 0)), response.get("ETag", ""))
+
+    @classmethod
+    def from_listing(cls, entry: dict) -> "RemoteObject":
+        """从 list_objects_v2 的 Contents 条目构造"""
+        return cls(entry["Key"], int(entry.get("Size", 0)), entry.get("ETag", ""))
+
+
+def partial_path(local_path: Union[str, Path], etag: str) -> Path:
+    """远程对象某个版本对应的部分下载文件路径"""
+    local_path = Path(local_path)
+    tag = hashlib.blake2b(etag.encode("utf-8"), digest_size=6).hexdigest()
+    return local_path.with_name(f"{local_path.name}.{tag}.part")
+
+
+def download_resumable(
+    s3_client,
+    bucket_name: str,
+    obj: RemoteObject,
+    local_path: Union[str, Path],
+) -> int:
+    """
+    可续传地下载远程对象
+
+    已有同一版本的部分文件时从其末尾继续下载（Range + IfMatch），
+    完成并校验大小后替换到目标路径。下载中断时保留部分文件供下次续传。
+
+    Args:
+        s3_client: boto3 S3 客户端
+        bucket_name: 存储桶名称
+        obj: 远程对象（需包含大小和 ETag）
+        local_path: 本地目标路径
+
+    Returns:
+        续传时跳过的字节数（0 表示完整下载）
+
+    Raises:
+        ClientError 等: 下载失败
+        IOError: 下载完成后大小与远程对象不一致
+    """
+    local_path = Path(local_path)
+    local_path.parent.mkdir(parents=True, exist_ok=True)
+    part_path = partial_path(local_path, obj.etag)
+
+    # 远程对象其他版本遗留的部分文件无法续传
+    for stale in local_path.parent.glob(f"{glob.escape(local_path.name)}.*.part"):
+        if stale != part_path:
+            stale.unlink()
+
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    if offset > obj.size or not obj.etag:
+        part_path.unlink(missing_ok=True)
+        offset = 0
+
+    if offset < obj.size or not part_path.exists():
+        # 使用 get_object + iter_chunks，以正确处理腾讯云 COS 的 chunked transfer encoding
+        kwargs = {"Bucket": bucket_name, "Key": obj.key}
+        if obj.etag:
+            kwargs["IfMatch"] = obj.etag
+        if offset:
+            kwargs["Range"] = f"bytes={offset}-"
+        try:
+            response = s3_client.get_object(**kwargs)
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "")
+            if error_code in ("412", "PreconditionFailed"):
+                # 列举之后远程对象已被替换，部分文件作废
+                part_path.unlink(missing_ok=True)
+            raise
+        with open(part_path, "ab") as f:
+            for chunk in response["Body"].iter_chunks(chunk_size=1024 * 1024):
+                f.write(chunk)
+
+    actual_size = part_path.stat().st_size
+    if actual_size != obj.size:
+        if actual_size > obj.size:
+            part_path.unlink()
+        raise IOError(f"下载大小不一致: {obj.key} ({actual_size} / {obj.size} bytes)")
+
+    os.replace(part_path, local_path)
+    return offset
@@ -0,0 +1,35 @@
+# coding=utf-8
+"""
+JSON 编解码
+
+安装了 orjson 时使用 orjson（解码速度约为标准库的数倍），否则回退到标准库 json。
+两种实现的输入输出保持一致：loads 接受 str / bytes，dumps 返回 str。
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+    orjson = None
+
+
+# 解码失败时抛出的异常类型（orjson.JSONDecodeError 是 ValueError 的子类）
+JSONDecodeError = ValueError
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """解码 JSON"""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """编码 JSON（保留非 ASCII 字符）"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False)